@@ -0,0 +1,46 @@
+"""Added composite unique and reverse indexes to association tables.
+
+Revision ID: 8f3b2c61d4a7
+Revises: 2139a98a7e5e
+Create Date: 2026-10-17 09:12:31.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b2c61d4a7'
+down_revision: Union[str, None] = '2139a98a7e5e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Association table, leading column of the unique pair and trailing column that also gets a reverse index.
+_ASSOCIATIONS = (
+    ('pass_event', 'pass_id', 'event_id'),
+    ('team_user', 'team_id', 'user_id'),
+    ('team_event', 'team_id', 'event_id'),
+    ('user_event', 'user_id', 'event_id'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, first_column, second_column in _ASSOCIATIONS:
+        # Keep a single row of every duplicated pair so that the unique index can be built.
+        op.execute(
+            f'DELETE FROM {table} WHERE id NOT IN '
+            f'(SELECT MIN(id) FROM {table} GROUP BY {first_column}, {second_column})'
+        )
+
+        op.create_index(
+            f'ix_{table}_{first_column}_{second_column}', table, [first_column, second_column], unique=True
+        )
+        op.create_index(f'ix_{table}_{second_column}', table, [second_column])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, first_column, second_column in _ASSOCIATIONS:
+        op.drop_index(f'ix_{table}_{second_column}', table_name=table)
+        op.drop_index(f'ix_{table}_{first_column}_{second_column}', table_name=table)
@@ -0,0 +1,34 @@
+"""Added indexes to filtered lookup columns.
+
+Revision ID: c41e7a9d05b2
+Revises: 8f3b2c61d4a7
+Create Date: 2026-10-17 10:03:54.217630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9d05b2'
+down_revision: Union[str, None] = '8f3b2c61d4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_event_organizer_id'), 'event', ['organizer_id'], unique=False)
+    op.create_index(op.f('ix_support_ticket_category'), 'support_ticket', ['category'], unique=False)
+    op.create_index(op.f('ix_support_ticket_email_address'), 'support_ticket', ['email_address'], unique=False)
+    op.create_index(op.f('ix_team_host_id'), 'team', ['host_id'], unique=False)
+    op.create_index(op.f('ix_user_phone_number'), 'user', ['phone_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_phone_number'), table_name='user')
+    op.drop_index(op.f('ix_team_host_id'), table_name='team')
+    op.drop_index(op.f('ix_support_ticket_email_address'), table_name='support_ticket')
+    op.drop_index(op.f('ix_support_ticket_category'), table_name='support_ticket')
+    op.drop_index(op.f('ix_event_organizer_id'), table_name='event')
@@ -0,0 +1,92 @@
+"""
+Benchmark lookup and delete latency on a 1M-row user_event table without and with the composite unique and reverse
+association indexes.
+
+Run from the repository root:
+
+    python benchmarks/association_indexes.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ROWS = 1_000_000
+USERS = 100_000
+EVENTS = 200
+SAMPLES = 50
+
+
+def _time(function, *args) -> float:
+    """Time a single call of the function in milliseconds."""
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def _measure(session_local, label: str):
+    """Print the median latency of the user_event lookups and deletes used by the routers."""
+    from db import associations
+
+    db = session_local()
+    user_lookups = [_time(associations.read_user_events_db, f'u{i * 997 % USERS}', db) for i in range(SAMPLES)]
+    event_lookups = [_time(associations.read_event_users_db, f'e{i % EVENTS}', db) for i in range(SAMPLES)]
+    deletes = [
+        _time(associations.delete_user_event_db, f'u{i * 991 % USERS}', f'e{(i * 991 % USERS) % EVENTS}', db)
+        for i in range(SAMPLES)
+    ]
+    db.close()
+
+    print(
+        f'{label:>15}: by user {statistics.median(user_lookups):8.3f} ms, '
+        f'by event {statistics.median(event_lookups):8.3f} ms, delete pair {statistics.median(deletes):8.3f} ms'
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = f'sqlite:///{directory}/benchmark.db'
+        os.environ['ASYNC_DATABASE_URL'] = ''
+
+        import sqlalchemy
+        from db import core
+        from db.core import DBUserEvent
+
+        indexes = [index for index in DBUserEvent.__table__.indexes if index.name != 'ix_user_event_id']
+
+        with core._engine.begin() as connection:
+            for index in indexes:
+                index.drop(connection)
+
+            # Each user registers for ROWS / USERS distinct events.
+            per_user = ROWS // USERS
+            rows = (
+                {
+                    'id': f'r{n}', 'user_id': f'u{n // per_user}',
+                    'event_id': f'e{(n // per_user + n % per_user) % EVENTS}'
+                }
+                for n in range(ROWS)
+            )
+
+            batch = []
+            for row in rows:
+                batch.append(row)
+
+                if len(batch) == 50_000:
+                    connection.execute(sqlalchemy.insert(DBUserEvent), batch)
+                    batch = []
+
+        _measure(core._session_local, 'without indexes')
+
+        with core._engine.begin() as connection:
+            for index in indexes:
+                index.create(connection)
+
+        _measure(core._session_local, 'with indexes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark POST /event/{event_id}/check-in/{user_id} with `GATES` gates scanning attendees concurrently, half of whom
+hold a pass for the event, with every scan written to the DB on its own versus in batches by the check-in log. Each
+statement sleeps for a simulated network round trip so that the SQLite file DB behaves like a remote PostgreSQL server,
+and the number of statements per scan is reported alongside the latency.
+
+Run from the repository root:
+
+    python benchmarks/check_in.py
+"""
+import asyncio
+import os
+import contextlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+GATES = 20
+USERS = 5000
+ROUND_TRIP_SECONDS = 0.001
+EVENT_ID = 'benchmark-event'
+PASS_IDS = ('benchmark-pass', 'other-pass')
+TOKEN = 'benchmark-token'
+
+
+def _seed():
+    """Seed an event that one of two passes grants access to, and `USERS` users alternating between the passes."""
+    import sqlalchemy
+    from db import core
+    from db.core import DBEvent, DBPass, DBPassEvent, DBUser, EventType
+
+    users = [
+        {
+            'id': f'u{i}', 'first_name': 'First', 'last_name': 'Last', 'email_address': f'u{i}@example.com',
+            'phone_number': None, 'mahe_registration_number': None, 'pass_id': PASS_IDS[i % 2]
+        }
+        for i in range(USERS)
+    ]
+
+    db = core._session_local()
+    db.execute(sqlalchemy.insert(DBEvent).values(id=EVENT_ID, name='Concert', type=EventType.CULTURAL))
+    db.execute(sqlalchemy.insert(DBPass).values([{'id': pass_id, 'name': pass_id, 'cost': 0} for pass_id in PASS_IDS]))
+    db.execute(sqlalchemy.insert(DBPassEvent).values(pass_id=PASS_IDS[0], event_id=EVENT_ID))
+    db.execute(sqlalchemy.insert(DBUser).values(users))
+    db.commit()
+    db.close()
+
+
+async def _gate(http, user_ids: list[str], latencies: list[float], statuses: list[int]):
+    """Scan attendees until none are left, recording the latency and status of each scan."""
+    while user_ids:
+        user_id = user_ids.pop()
+
+        start = time.perf_counter()
+        response = await http.post(
+            f'/event/{EVENT_ID}/check-in/{user_id}', headers={'Authorization': f'Bearer {TOKEN}'}
+        )
+
+        latencies.append(time.perf_counter() - start)
+        statuses.append(response.status_code)
+
+
+async def _run() -> str:
+    """Run the benchmark against the in-process app and summarize the results."""
+    import httpx
+    import sqlalchemy
+    import main
+    from db import access_index, admission, check_in, core
+
+    with core._session_local() as db:
+        access_index.load(db)
+        admission.load(db)
+
+    statements = []
+    sqlalchemy.event.listen(
+        core._engine, 'before_cursor_execute',
+        lambda *_: (statements.append(None), time.sleep(ROUND_TRIP_SECONDS))
+    )
+
+    latencies: list[float] = []
+    statuses: list[int] = []
+    user_ids = [f'u{i}' for i in range(USERS)]
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as http:
+        start = time.perf_counter()
+        check_in.start(contextlib.contextmanager(core.get_db))
+        await asyncio.gather(*(_gate(http, user_ids, latencies, statuses) for _ in range(GATES)))
+        check_in.stop()
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    failed = sum(1 for status in statuses if status != 200)
+
+    return (
+        f'{os.getenv("CHECK_IN_FLUSH_ROWS"):>3} rows per flush: {len(statuses) / elapsed:7.1f} scans/s, '
+        f'p50 {quantiles[49] * 1000:6.1f} ms, p99 {quantiles[98] * 1000:6.1f} ms, '
+        f'{len(statements) / len(statuses):.2f} statements per scan, {failed} failed'
+    )
+
+
+def main():
+    if os.getenv('CHECK_IN_FLUSH_ROWS'):
+        _seed()
+        print(asyncio.run(_run()))
+        return
+
+    print(f'{GATES} gates')
+
+    for flush_rows in (1, 500):
+        with tempfile.TemporaryDirectory() as directory:
+            environment = os.environ | {
+                'DATABASE_URL': f'sqlite:///{directory}/benchmark.db', 'ASYNC_DATABASE_URL': '',
+                'BEARER_TOKEN': TOKEN, 'CHECK_IN_FLUSH_ROWS': str(flush_rows)
+            }
+            subprocess.run([sys.executable, __file__], env=environment, check=True)
+
+
+if __name__ == '__main__':
+    main()
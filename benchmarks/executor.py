@@ -0,0 +1,110 @@
+"""
+Benchmark the p99 latency of GET /event/{event_id}/teams/users under 500 concurrent clients with the DB functions run
+inline on the event loop versus on the bounded DB thread pool. Each statement sleeps for a simulated network round trip
+so that the SQLite file DB behaves like a remote PostgreSQL server.
+
+Run from the repository root:
+
+    python benchmarks/executor.py
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+CLIENTS = 500
+REQUESTS_PER_CLIENT = 1
+ROUND_TRIP_SECONDS = 0.001
+TEAMS = 10
+USERS_PER_TEAM = 4
+EVENT_ID = 'benchmark-event'
+TOKEN = 'benchmark-token'
+
+
+def _seed():
+    """Seed an event with `TEAMS` teams of `USERS_PER_TEAM` users each."""
+    import sqlalchemy
+    from db import core
+    from db.core import DBEvent, DBTeam, DBTeamEvent, DBTeamUser, DBUser, EventType
+
+    users = [
+        {
+            'id': f'u{i}', 'first_name': 'First', 'last_name': 'Last', 'email_address': f'u{i}@example.com',
+            'phone_number': None, 'mahe_registration_number': None, 'pass_id': None
+        }
+        for i in range(TEAMS * USERS_PER_TEAM)
+    ]
+    teams = [{'id': f't{i}', 'name': f'Team {i}', 'host_id': f'u{i * USERS_PER_TEAM}'} for i in range(TEAMS)]
+    team_users = [
+        {'team_id': f't{i // USERS_PER_TEAM}', 'user_id': f'u{i}'} for i in range(TEAMS * USERS_PER_TEAM)
+    ]
+    team_events = [{'team_id': f't{i}', 'event_id': EVENT_ID} for i in range(TEAMS)]
+
+    db = core._session_local()
+    db.execute(sqlalchemy.insert(DBEvent).values(id=EVENT_ID, name='Hackathon', type=EventType.HACKATHON))
+    db.execute(sqlalchemy.insert(DBUser).values(users))
+    db.execute(sqlalchemy.insert(DBTeam).values(teams))
+    db.execute(sqlalchemy.insert(DBTeamUser).values(team_users))
+    db.execute(sqlalchemy.insert(DBTeamEvent).values(team_events))
+    db.commit()
+    db.close()
+
+
+async def _client(http, path: str, latencies: list[float], statuses: list[int]):
+    """Issue `REQUESTS_PER_CLIENT` sequential requests, recording the latency and status of each."""
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        response = await http.get(path, headers={'Authorization': f'Bearer {TOKEN}'})
+
+        latencies.append(time.perf_counter() - start)
+        statuses.append(response.status_code)
+
+
+async def _run() -> str:
+    """Run the benchmark against the in-process app and summarize the results."""
+    import httpx
+    import sqlalchemy
+    import main
+    from db import core
+
+    sqlalchemy.event.listen(core._engine, 'before_cursor_execute', lambda *_: time.sleep(ROUND_TRIP_SECONDS))
+
+    latencies: list[float] = []
+    statuses: list[int] = []
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as http:
+        path = f'/event/{EVENT_ID}/teams/users'
+        await asyncio.gather(*(_client(http, path, latencies, statuses) for _ in range(CLIENTS)))
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    rejected = sum(1 for status in statuses if status == 503)
+
+    return (
+        f'{os.getenv("DB_EXECUTION_MODE"):>6}: p50 {quantiles[49] * 1000:8.1f} ms, p99 {quantiles[98] * 1000:8.1f} ms, '
+        f'{rejected} of {len(statuses)} requests rejected with 503'
+    )
+
+
+def main():
+    if os.getenv('DB_EXECUTION_MODE'):
+        _seed()
+        print(asyncio.run(_run()))
+        return
+
+    for mode in ('inline', 'thread'):
+        with tempfile.TemporaryDirectory() as directory:
+            environment = os.environ | {
+                'DATABASE_URL': f'sqlite:///{directory}/benchmark.db', 'ASYNC_DATABASE_URL': '',
+                'BEARER_TOKEN': TOKEN, 'DB_EXECUTION_MODE': mode
+            }
+            subprocess.run([sys.executable, __file__], env=environment, check=True)
+
+
+if __name__ == '__main__':
+    main()
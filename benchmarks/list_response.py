@@ -0,0 +1,102 @@
+"""
+Benchmark the CPU time that GET /event/ spends per request on a cache hit, serving a page of `EVENTS` events as cached
+models that are validated against the response model and serialized on every request, versus as the cached JSON body
+and its gzipped copy.
+
+Run from the repository root:
+
+    python benchmarks/list_response.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+EVENTS = 1000
+REQUESTS = 500
+TOKEN = 'benchmark-token'
+
+
+def _seed():
+    """Seed `EVENTS` events."""
+    import sqlalchemy
+    from db import core
+    from db.core import DBEvent, EventType
+
+    events = [
+        {
+            'id': f'e{i:04}', 'name': f'Event {i}', 'description': 'A competition between the best bands on campus.',
+            'type': EventType.CULTURAL, 'team_members': 5, 'venue': 'Mega Auditorium'
+        }
+        for i in range(EVENTS)
+    ]
+
+    db = core._session_local()
+    db.execute(sqlalchemy.insert(DBEvent).values(events))
+    db.commit()
+    db.close()
+
+
+def _add_model_route():
+    """Add the previous implementation of GET /event/, which caches the page's models rather than its body."""
+    from fastapi import Depends
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    import main
+    import router as router_core
+    from db import cache, core, event
+    from db.event import Event
+
+    @main.app.get('/benchmark/event/', response_model=router_core.Page[Event])
+    async def read_all_events(db: AsyncSession = Depends(core.get_async_db)) -> router_core.Page[Event]:
+        async def load() -> tuple[list[Event], None]:
+            db_events, next_cursor = await event.read_page_db_async(EVENTS, None, db)
+            return [Event.model_validate(db_item) for db_item in db_events], next_cursor
+
+        events, next_cursor = await cache.catalog.get_or_load_async(('benchmark-event-page',), load)
+        return router_core.Page[Event](items=events, next_cursor=next_cursor)
+
+
+async def _measure(http, path: str, encoding: str) -> str:
+    """Warm the cache, then time `REQUESTS` requests for a path in CPU milliseconds per request."""
+    headers = {'Authorization': f'Bearer {TOKEN}', 'Accept-Encoding': encoding}
+    response = await http.get(path, params={'limit': EVENTS}, headers=headers)
+    size = len(response.content) if encoding == 'identity' else int(response.headers['Content-Length'])
+
+    start = time.process_time()
+
+    for _ in range(REQUESTS):
+        await http.get(path, params={'limit': EVENTS}, headers=headers)
+
+    elapsed = time.process_time() - start
+    return f'{path:<18} {encoding:<8}: {elapsed / REQUESTS * 1000:6.2f} ms CPU per request, {size:7} byte body'
+
+
+async def _run():
+    import httpx
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as http:
+        print(await _measure(http, '/benchmark/event/', 'identity'))
+        print(await _measure(http, '/event/', 'identity'))
+        print(await _measure(http, '/event/', 'gzip'))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = f'sqlite:///{directory}/benchmark.db'
+        os.environ['ASYNC_DATABASE_URL'] = ''
+        os.environ['BEARER_TOKEN'] = TOKEN
+
+        _seed()
+        _add_model_route()
+        print(f'{EVENTS} events per page, {REQUESTS} requests')
+        asyncio.run(_run())
+
+
+if __name__ == '__main__':
+    main()
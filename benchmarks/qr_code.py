@@ -0,0 +1,107 @@
+"""
+Benchmark the throughput of GET /user/{user_id}/qr_code for uncached QR codes with PNG encoding done on the event loop
+versus on the render worker pool with one process per core. Every request is for a different user, so every request
+renders.
+
+Run from the repository root:
+
+    python benchmarks/qr_code.py
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+CLIENTS = 64
+USERS = 2000
+SCALE = 10
+TOKEN = 'benchmark-token'
+
+
+def _seed():
+    """Seed `USERS` users without passes."""
+    import sqlalchemy
+    from db import core
+    from db.core import DBUser
+
+    users = [
+        {
+            'id': f'u{i}', 'first_name': 'First', 'last_name': 'Last', 'email_address': f'u{i}@example.com',
+            'phone_number': None, 'mahe_registration_number': None, 'pass_id': None
+        }
+        for i in range(USERS)
+    ]
+
+    db = core._session_local()
+    db.execute(sqlalchemy.insert(DBUser).values(users))
+    db.commit()
+    db.close()
+
+
+async def _client(http, user_ids: list[str], latencies: list[float], statuses: list[int]):
+    """Request QR codes for users until none are left, recording the latency and status of each request."""
+    while user_ids:
+        user_id = user_ids.pop()
+
+        start = time.perf_counter()
+        response = await http.get(
+            f'/user/{user_id}/qr_code?scale={SCALE}', headers={'Authorization': f'Bearer {TOKEN}'}
+        )
+
+        latencies.append(time.perf_counter() - start)
+        statuses.append(response.status_code)
+
+
+async def _run() -> str:
+    """Run the benchmark against the in-process app and summarize the results."""
+    import httpx
+    import main
+    from db import qr_code
+
+    # Start the workers before timing so that spawning them is not counted.
+    await qr_code.render_png_async('warm-up')
+
+    latencies: list[float] = []
+    statuses: list[int] = []
+    user_ids = [f'u{i}' for i in range(USERS)]
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(http, user_ids, latencies, statuses) for _ in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+    qr_code.shutdown()
+    quantiles = statistics.quantiles(latencies, n=100)
+    failed = sum(1 for status in statuses if status != 200)
+
+    return (
+        f'{os.getenv("QR_CODE_WORKERS"):>2} workers: {len(statuses) / elapsed:7.1f} requests/s, '
+        f'p50 {quantiles[49] * 1000:7.1f} ms, p99 {quantiles[98] * 1000:7.1f} ms, {failed} failed'
+    )
+
+
+def main():
+    if os.getenv('QR_CODE_WORKERS'):
+        _seed()
+        print(asyncio.run(_run()))
+        return
+
+    print(f'{os.cpu_count()} cores')
+
+    for workers in (0, os.cpu_count() or 1):
+        with tempfile.TemporaryDirectory() as directory:
+            environment = os.environ | {
+                'DATABASE_URL': f'sqlite:///{directory}/benchmark.db', 'ASYNC_DATABASE_URL': '',
+                'BEARER_TOKEN': TOKEN, 'QR_CODE_WORKERS': str(workers), 'QR_CODE_RENDER_TIMEOUT': '60'
+            }
+            subprocess.run([sys.executable, __file__], env=environment, check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark reading `USERS` users via their primary keys into models, by loading ORM instances into the session's
+identity map and validating them, versus selecting their columns with SQLAlchemy Core and constructing the models
+directly with `user.read_models_by_ids_db`.
+
+Run from the repository root:
+
+    python benchmarks/read_by_ids.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+USERS = 100_000
+ROUNDS = 3
+
+
+def _seed():
+    """Seed `USERS` users."""
+    import sqlalchemy
+    from db import core
+    from db.core import DBUser
+
+    users = [
+        {
+            'id': f'u{i}', 'first_name': 'First', 'last_name': 'Last', 'email_address': f'u{i}@example.com',
+            'phone_number': '9999999999', 'mahe_registration_number': i, 'pass_id': None
+        }
+        for i in range(USERS)
+    ]
+
+    db = core._session_local()
+    db.execute(sqlalchemy.insert(DBUser), users)
+    db.commit()
+    db.close()
+
+
+def _measure(label: str, read, user_ids: list[str]):
+    """Time the fastest of `ROUNDS` reads of every user, each in a new session, and report users per second."""
+    from db import core
+
+    timings = []
+
+    for _ in range(ROUNDS):
+        with core._session_local() as db:
+            start = time.perf_counter()
+            users = read(user_ids, db)
+            timings.append(time.perf_counter() - start)
+
+        assert len(users) == USERS
+
+    print(f'{label:<22}: {min(timings) * 1000:7.1f} ms, {USERS / min(timings):9.0f} users/s')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = f'sqlite:///{directory}/benchmark.db'
+        os.environ['ASYNC_DATABASE_URL'] = ''
+
+        from db import user
+        from db.user import User
+
+        _seed()
+        user_ids = [f'u{i}' for i in range(USERS)]
+
+        print(f'{USERS} users')
+        _measure(
+            'ORM instances', lambda ids, db: [User.model_validate(db_user) for db_user in user.read_by_ids_db(ids, db)],
+            user_ids
+        )
+        _measure('Core rows', user.read_models_by_ids_db, user_ids)
+
+
+if __name__ == '__main__':
+    main()
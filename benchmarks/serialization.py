@@ -0,0 +1,112 @@
+"""
+Benchmark the CPU time spent turning `ROWS` DB instances into a JSON list body for each of the five routers' models:
+validating them into models in the route, then letting FastAPI validate the returned list against the response model
+again and encode it with the standard library, versus validating them once with a TypeAdapter and serializing them
+straight to bytes with `router.model_response`.
+
+Run from the repository root:
+
+    python benchmarks/serialization.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ROWS = 10_000
+ROUNDS = 5
+
+
+def _create_db_items() -> dict[str, tuple[type, list]]:
+    """Create `ROWS` transient DB instances per router, keyed by router name along with the route's model."""
+    from db.core import DBEvent, DBPass, DBSupportTicket, DBTeam, DBUser, EventType, SupportTicketCategory
+    from db.event import Event
+    from db.pass_ import Pass
+    from db.support_ticket import SupportTicket
+    from db.team import Team
+    from db.user import User
+
+    now = datetime(2025, 1, 1, 12, 0, 0)
+
+    return {
+        'event': (Event, [
+            DBEvent(
+                id=f'e{i}', name=f'Event {i}', description='A competition between the best bands on campus.',
+                type=EventType.CULTURAL, team_members=5, start=now, venue='Mega Auditorium', organizer_id=f'u{i}'
+            )
+            for i in range(ROWS)
+        ]),
+        'pass': (Pass, [
+            DBPass(id=f'p{i}', name=f'Pass {i}', description='Access to every sports event.', cost=Decimal('299.00'))
+            for i in range(ROWS)
+        ]),
+        'support_ticket': (SupportTicket, [
+            DBSupportTicket(
+                id=f's{i}', name='Name', description='Cannot find my pass.', category=SupportTicketCategory.PASSES,
+                timestamp=now, solved=False, college_name='MIT', email_address=f's{i}@example.com',
+                phone_number='9999999999', solved_email_address=None, comment=None
+            )
+            for i in range(ROWS)
+        ]),
+        'team': (Team, [DBTeam(id=f't{i}', name=f'Team {i}', host_id=f'u{i}') for i in range(ROWS)]),
+        'user': (User, [
+            DBUser(
+                id=f'u{i}', first_name='First', last_name='Last', email_address=f'u{i}@example.com',
+                phone_number='9999999999', mahe_registration_number=i, pass_id=f'p{i}'
+            )
+            for i in range(ROWS)
+        ]),
+    }
+
+
+async def _serialize_twice(model, db_items: list) -> bytes:
+    """Serialize the way routes returning `list[Model]` did, including FastAPI's handling of the return value."""
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from starlette.responses import JSONResponse
+
+    field = create_model_field('Response', list[model], mode='serialization')
+    content = await serialize_response(field=field, response_content=[model.model_validate(item) for item in db_items])
+    return JSONResponse(content).body
+
+
+def _time(function) -> float:
+    """Time the fastest of `ROUNDS` calls of the function in CPU milliseconds."""
+    timings = []
+
+    for _ in range(ROUNDS):
+        start = time.process_time()
+        function()
+        timings.append(time.process_time() - start)
+
+    return min(timings) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = f'sqlite:///{directory}/benchmark.db'
+        os.environ['ASYNC_DATABASE_URL'] = ''
+
+        import router as router_core
+
+        print(f'{ROWS} rows per list')
+
+        for name, (model, db_items) in _create_db_items().items():
+            body = router_core.model_response(db_items, list[model]).body
+            assert asyncio.run(_serialize_twice(model, db_items)) == body, f'{name} bodies differ'
+
+            twice = _time(lambda: asyncio.run(_serialize_twice(model, db_items)))
+            once = _time(lambda: router_core.model_response(db_items, list[model]))
+            print(
+                f'{name:<15}: {twice:6.1f} ms validated twice, {once:6.1f} ms with model_response, '
+                f'{twice / once:.1f}x faster'
+            )
+
+
+if __name__ == '__main__':
+    main()
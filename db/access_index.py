@@ -0,0 +1,206 @@
+"""In-memory index of the events each pass grants access to, used to check event eligibility without the DB."""
+import hashlib
+import os
+import threading
+import time
+from typing import Optional
+
+import dotenv
+import sqlalchemy
+from sqlalchemy.orm import Session
+
+from db.core import DBPassEvent
+
+dotenv.load_dotenv()
+
+TTL_SECONDS = float(os.getenv('ACCESS_INDEX_TTL', 60))
+
+_pass_events: dict[str, frozenset[str]] = {}
+_event_passes: dict[str, frozenset[str]] = {}
+_expires_at: Optional[float] = None
+_generation = 0
+_version = ''
+_lock = threading.Lock()
+_load_lock = threading.Lock()
+
+
+def _build(pairs: list[tuple[str, str]]) -> tuple[dict[str, frozenset[str]], dict[str, frozenset[str]]]:
+    """
+    Build both directions of the index from pass-event pairs.
+
+    :param pairs: Pass and event ID of every pass-event association.
+    :type pairs: list[tuple[str, str]]
+
+    :return: Event IDs per pass ID and pass IDs per event ID.
+    :rtype: tuple[dict[str, frozenset[str]], dict[str, frozenset[str]]]
+    """
+    pass_events: dict[str, set[str]] = {}
+    event_passes: dict[str, set[str]] = {}
+
+    for pass_id, event_id in pairs:
+        pass_events.setdefault(pass_id, set()).add(event_id)
+        event_passes.setdefault(event_id, set()).add(pass_id)
+
+    return (
+        {pass_id: frozenset(event_ids) for pass_id, event_ids in pass_events.items()},
+        {event_id: frozenset(pass_ids) for event_id, pass_ids in event_passes.items()}
+    )
+
+
+def _digest(pass_events: dict[str, frozenset[str]]) -> str:
+    """
+    Digest the contents of the index, so that every process holding the same associations agrees on its version.
+
+    :param pass_events: Event IDs per pass ID.
+    :type pass_events: dict[str, frozenset[str]]
+
+    :return: Hex digest of every pass-event pair.
+    :rtype: str
+    """
+    pairs = sorted(f'{pass_id}:{event_id}' for pass_id, event_ids in pass_events.items() for event_id in event_ids)
+    return hashlib.sha256('\n'.join(pairs).encode()).hexdigest()[:16]
+
+
+def load(session: Session):
+    """
+    Load the index from every pass-event association in the DB, replacing its current contents.
+
+    :param session: Current DB session.
+    :type session: Session
+    """
+    global _pass_events, _event_passes, _expires_at, _generation, _version
+
+    generation = _generation
+    pairs = [tuple(row) for row in session.execute(sqlalchemy.select(DBPassEvent.pass_id, DBPassEvent.event_id))]
+    pass_events, event_passes = _build(pairs)
+    version = _digest(pass_events)
+
+    with _lock:
+        _pass_events, _event_passes, _version = pass_events, event_passes, version
+        # A change committed while the associations were being read may be missing, so load again on the next use.
+        _expires_at = time.monotonic() + TTL_SECONDS if _generation == generation else 0
+        _generation += 1
+
+
+def _ensure_loaded(session: Session):
+    """
+    Load the index if it has never been loaded, was invalidated or has outlived its TTL, which bounds how long writes
+    made by other processes go unnoticed.
+
+    Only one thread loads the index at a time. While it does, the others keep using an index that has merely outlived
+    its TTL, and wait for one that was never loaded, was invalidated or may have missed a change made during its load.
+
+    :param session: Current DB session.
+    :type session: Session
+    """
+    if _expires_at is not None and _expires_at > time.monotonic():
+        return
+
+    if not _load_lock.acquire(blocking=not _expires_at):
+        return
+
+    try:
+        if _expires_at is None or _expires_at <= time.monotonic():
+            load(session)
+
+    finally:
+        _load_lock.release()
+
+
+def read_event_passes(event_id: str, session: Session) -> frozenset[str]:
+    """
+    Read the passes that grant access to an event.
+
+    :param event_id: ID of the event whose passes are to be read.
+    :type event_id: str
+    :param session: Current DB session, used only if the index has to be loaded.
+    :type session: Session
+
+    :return: Pass IDs; empty if the event does not require a pass.
+    :rtype: frozenset[str]
+    """
+    _ensure_loaded(session)
+    return _event_passes.get(event_id, frozenset())
+
+
+def can_access(pass_id: Optional[str], event_id: str, session: Session) -> bool:
+    """
+    Check whether a pass grants access to an event. Events that no pass is associated with are open to everyone.
+
+    :param pass_id: ID of the pass to check, or None for no pass.
+    :type pass_id: Optional[str]
+    :param event_id: ID of the event to check against.
+    :type event_id: str
+    :param session: Current DB session, used only if the index has to be loaded.
+    :type session: Session
+
+    :return: True if the pass grants access to the event, else False.
+    :rtype: bool
+    """
+    event_passes = read_event_passes(event_id, session)
+    return len(event_passes) == 0 or pass_id in event_passes
+
+
+def read_version(session: Session) -> str:
+    """
+    Read the version of the index, a digest of its contents that changes whenever a pass-event association does.
+
+    :param session: Current DB session, used only if the index has to be loaded.
+    :type session: Session
+
+    :return: Index version.
+    :rtype: str
+    """
+    _ensure_loaded(session)
+    return _version
+
+
+def add(pass_id: str, event_id: str):
+    """
+    Add a pass-event association to the index once it has been committed to the DB.
+
+    :param pass_id: ID of the associated pass.
+    :type pass_id: str
+    :param event_id: ID of the associated event.
+    :type event_id: str
+    """
+    global _generation, _version
+
+    with _lock:
+        if _expires_at is None:
+            return
+
+        _pass_events[pass_id] = _pass_events.get(pass_id, frozenset()) | {event_id}
+        _event_passes[event_id] = _event_passes.get(event_id, frozenset()) | {pass_id}
+        _version = _digest(_pass_events)
+        _generation += 1
+
+
+def remove(pass_id: str, event_id: str):
+    """
+    Remove a pass-event association from the index once its deletion has been committed to the DB.
+
+    :param pass_id: ID of the disassociated pass.
+    :type pass_id: str
+    :param event_id: ID of the disassociated event.
+    :type event_id: str
+    """
+    global _generation, _version
+
+    with _lock:
+        if _expires_at is None:
+            return
+
+        _pass_events[pass_id] = _pass_events.get(pass_id, frozenset()) - {event_id}
+        _event_passes[event_id] = _event_passes.get(event_id, frozenset()) - {pass_id}
+        _version = _digest(_pass_events)
+        _generation += 1
+
+
+def invalidate():
+    """Mark the index as stale so that it is reloaded on its next use, after a delete that cascaded to associations."""
+    global _expires_at, _generation
+
+    with _lock:
+        _expires_at = None
+        _generation += 1
@@ -0,0 +1,164 @@
+"""In-memory index of every user's pass and every event, used to admit attendees at the gates without the DB."""
+import os
+import threading
+import time
+from typing import Optional
+
+import dotenv
+import sqlalchemy
+from sqlalchemy.orm import Session
+
+from db import bloom
+from db.core import DBEvent, DBNotFoundError, DBUser
+
+dotenv.load_dotenv()
+
+TTL_SECONDS = float(os.getenv('ADMISSION_INDEX_TTL', 300))
+
+_user_passes: dict[str, Optional[str]] = {}
+_event_ids: set[str] = set()
+_expires_at: Optional[float] = None
+_generation = 0
+_lock = threading.Lock()
+_load_lock = threading.Lock()
+
+
+def load(session: Session):
+    """
+    Load the index from every user and event in the DB, replacing its current contents.
+
+    :param session: Current DB session.
+    :type session: Session
+    """
+    global _user_passes, _event_ids, _expires_at, _generation
+
+    generation = _generation
+    user_passes = {row.id: row.pass_id for row in session.execute(sqlalchemy.select(DBUser.id, DBUser.pass_id))}
+    event_ids = set(session.scalars(sqlalchemy.select(DBEvent.id)))
+
+    with _lock:
+        _user_passes, _event_ids = user_passes, event_ids
+        # A change made while the DB was being read may be missing, so load again on the next use.
+        _expires_at = time.monotonic() + TTL_SECONDS if _generation == generation else 0
+        _generation += 1
+
+
+def _ensure_loaded(session: Session):
+    """
+    Load the index if it has never been loaded, was invalidated or has outlived its TTL, which bounds how long passes
+    changed or users deleted by other processes go unnoticed.
+
+    Only one thread loads the index at a time. While it does, the others keep using an index that has merely outlived
+    its TTL, and wait for one that was never loaded, was invalidated or may have missed a change made during its load.
+
+    :param session: Current DB session.
+    :type session: Session
+    """
+    if _expires_at is not None and _expires_at > time.monotonic():
+        return
+
+    if not _load_lock.acquire(blocking=not _expires_at):
+        return
+
+    try:
+        if _expires_at is None or _expires_at <= time.monotonic():
+            load(session)
+
+    finally:
+        _load_lock.release()
+
+
+def read_user_pass(user_id: str, session: Session) -> Optional[str]:
+    """
+    Read a user's pass from the index, falling back to the DB for users created since it was loaded.
+
+    :param user_id: ID of the user whose pass is to be read.
+    :type user_id: str
+    :param session: Current DB session, used only if the index has to be loaded or does not have the user.
+    :type session: Session
+
+    :return: User pass primary key, if the user has a pass, else None.
+    :rtype: Optional[str]
+
+    :raise DBNotFoundError: User does not exist.
+    """
+    _ensure_loaded(session)
+
+    if user_id in _user_passes:
+        return _user_passes[user_id]
+
+    if not bloom.users.might_exist(user_id, session):
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
+    db_user = session.execute(sqlalchemy.select(DBUser.pass_id).where(DBUser.id == user_id)).one_or_none()
+
+    if db_user is None:
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
+    set_user_pass(user_id, db_user.pass_id)
+    return db_user.pass_id
+
+
+def validate_event(event_id: str, session: Session):
+    """
+    Validate that an event exists with the index, falling back to the DB for events created since it was loaded.
+
+    :param event_id: ID of the event to be validated.
+    :type event_id: str
+    :param session: Current DB session, used only if the index has to be loaded or does not have the event.
+    :type session: Session
+
+    :raise DBNotFoundError: Event does not exist.
+    """
+    _ensure_loaded(session)
+
+    if event_id in _event_ids:
+        return
+
+    if not bloom.events.might_exist(event_id, session):
+        raise DBNotFoundError(f'Event with ID {event_id} not found.')
+
+    if session.scalar(sqlalchemy.select(DBEvent.id).where(DBEvent.id == event_id)) is None:
+        raise DBNotFoundError(f'Event with ID {event_id} not found.')
+
+    with _lock:
+        _event_ids.add(event_id)
+
+
+def set_user_pass(user_id: str, pass_id: Optional[str]):
+    """
+    Record a user's pass in the index once it has been committed to the DB.
+
+    :param user_id: ID of the user.
+    :type user_id: str
+    :param pass_id: ID of the user's pass, or None for no pass.
+    :type pass_id: Optional[str]
+    """
+    global _generation
+
+    with _lock:
+        _user_passes[user_id] = pass_id
+        _generation += 1
+
+
+def remove_event(event_id: str):
+    """
+    Remove an event from the index once its deletion has been committed to the DB.
+
+    :param event_id: ID of the deleted event.
+    :type event_id: str
+    """
+    global _generation
+
+    with _lock:
+        _event_ids.discard(event_id)
+        _generation += 1
+
+
+def invalidate():
+    """Mark the index as stale so that it is reloaded on its next use, after a delete that cascaded to users."""
+    global _expires_at, _generation
+
+    with _lock:
+        _expires_at = None
+        _generation += 1
@@ -2,8 +2,11 @@
 from typing import Optional, Sequence
 
 import sqlalchemy
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from db import access_index, cache, versions
 from db.core import (
     DBPassEvent, DBTeamUser, DBTeamEvent, DBTeam, DBNotFoundError, DBUser, DBValidationError, DBUserEvent
 )
@@ -25,7 +28,7 @@ def _validate_user_for_event(user_id: str, event_id: str, session: Session) -> b
 
     :raise DBNotFoundError: User does not have a pass.
     """
-    event_passes = read_event_passes_db(event_id, session)
+    event_passes = access_index.read_event_passes(event_id, session)
     if len(event_passes) == 0:
         return True
 
@@ -38,9 +41,42 @@ def _validate_user_for_event(user_id: str, event_id: str, session: Session) -> b
     return user_pass_id in event_passes
 
 
+def _read_ineligible_team_event(user_id: str, team_id: str, session: Session) -> Optional[str]:
+    """
+    Read the first event that a team is registered for that the user cannot access with their pass, reading the team's
+    events and the user's pass in a single query and checking them against the access index.
+
+    :param user_id: ID of the user to be validated.
+    :type user_id: str
+    :param team_id: ID of the team whose events the user is validated against.
+    :type team_id: str
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: ID of the first event the user is not eligible for, if any, else None.
+    :rtype: Optional[str]
+
+    :raise DBNotFoundError: User does not have a pass.
+    """
+    user_pass_id = sqlalchemy.select(DBUser.pass_id).where(DBUser.id == user_id).scalar_subquery()
+    query = sqlalchemy.select(DBTeamEvent.event_id, user_pass_id).where(DBTeamEvent.team_id == team_id)
+
+    for event_id, user_pass_id in session.execute(query):
+        if access_index.can_access(user_pass_id, event_id, session):
+            continue
+
+        if user_pass_id is None:
+            raise DBNotFoundError(f'User with ID {user_id} does not have a pass.')
+
+        return event_id
+
+    return None
+
+
 def _validate_team_users_for_event(team_id: str, event_id: str, host_only_access: bool, session: Session) -> bool:
     """
-    Validate whether a team can access the event with their pass(es).
+    Validate whether a team can access the event with their pass(es) in at most two queries, regardless of the number
+    of team members.
 
     :param team_id: ID of the team to be validated.
     :type team_id: str
@@ -56,40 +92,52 @@ def _validate_team_users_for_event(team_id: str, event_id: str, host_only_access
 
     :raise DBNotFoundError: Team does not have a host or members do not have a pass.
     """
-    query = sqlalchemy.select(DBTeam.host_id).where(DBTeam.id == team_id)
-    host_id = session.scalar(query)
+    event_pass_ids = access_index.read_event_passes(event_id, session)
 
-    if host_id is None:
+    query = (
+        sqlalchemy.select(DBTeam.host_id, DBUser.pass_id)
+        .outerjoin(DBUser, DBUser.id == DBTeam.host_id)
+        .where(DBTeam.id == team_id)
+    )
+    host = session.execute(query).one_or_none()
+
+    if host is None or host.host_id is None:
         raise DBNotFoundError(f'Team with ID {team_id} does not have a host.')
 
-    event_passes = read_event_passes_db(event_id, session)
-    if len(event_passes) == 0:
-        return True
+    host_id, host_pass_id = host
 
-    query = sqlalchemy.select(DBUser.pass_id).where(DBUser.id == host_id)
-    host_pass_id = session.scalar(query)
+    if len(event_pass_ids) == 0:
+        return True
 
     if host_pass_id is None:
         raise DBNotFoundError(f'Host with ID {host_id} of team with ID {team_id} does not have a pass.')
 
-    host_pass_valid = host_pass_id in event_passes
-
     if host_only_access:
-        return host_pass_valid
+        return host_pass_id in event_pass_ids
 
-    team_member_ids = read_team_users_db(team_id, session)
+    # Only the first member that either has no pass or has a pass that is not valid for the event is needed. Members
+    # without a pass come first, so that the outcome does not depend on the order the rows happen to be read in.
+    query = (
+        sqlalchemy.select(DBTeamUser.user_id, DBUser.pass_id)
+        .outerjoin(DBUser, DBUser.id == DBTeamUser.user_id)
+        .where(
+            DBTeamUser.team_id == team_id,
+            sqlalchemy.or_(DBUser.pass_id.is_(None), DBUser.pass_id.not_in(sorted(event_pass_ids)))
+        )
+        .order_by(DBUser.pass_id.is_(None).desc(), DBTeamUser.id)
+        .limit(1)
+    )
+    offending_member = session.execute(query).one_or_none()
 
-    for team_member_id in team_member_ids:
-        query = sqlalchemy.select(DBUser.pass_id).where(DBUser.id == team_member_id)
-        team_member_pass_id = session.scalar(query)
+    if offending_member is None:
+        return True
 
-        if team_member_pass_id is None:
-            raise DBNotFoundError(f'Member with ID {team_member_id} of team with ID {team_id} does not have a pass.')
+    team_member_id, team_member_pass_id = offending_member
 
-        if team_member_pass_id not in event_passes:
-            return False
+    if team_member_pass_id is None:
+        raise DBNotFoundError(f'Member with ID {team_member_id} of team with ID {team_id} does not have a pass.')
 
-    return True
+    return False
 
 
 # noinspection DuplicatedCode
@@ -109,6 +157,22 @@ def read_pass_events_db(pass_id: str, session: Session) -> Sequence[str]:
     return session.scalars(query).all()
 
 
+async def read_pass_events_db_async(pass_id: str, session: AsyncSession) -> Sequence[str]:
+    """
+    Read a pass' events from the DB via its primary key without blocking the event loop.
+
+    :param pass_id: ID of the pass whose events are to be read.
+    :type pass_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: DB event IDs.
+    :rtype: Sequence[str]
+    """
+    query = sqlalchemy.select(DBPassEvent.event_id).where(DBPassEvent.pass_id == pass_id)
+    return (await session.scalars(query)).all()
+
+
 def read_event_passes_db(event_id: str, session: Session) -> Sequence[str]:
     """
     Read an event's passes from the DB via its primary key.
@@ -138,10 +202,25 @@ def create_pass_event_db(pass_id: str, event_id: str, session: Session) -> str:
 
     :return: New pass-event association ID.
     :rtype: str
+
+    :raise DBValidationError: Pass and event are already associated.
     """
     query = sqlalchemy.insert(DBPassEvent).values(pass_id=pass_id, event_id=event_id).returning(DBPassEvent.id)
-    new_id = session.scalar(query)
-    session.commit()
+
+    try:
+        new_id = session.scalar(query)
+        session.commit()
+
+    except IntegrityError:
+        session.rollback()
+        raise DBValidationError(
+            f'Pass with ID {pass_id} cannot be associated with event with ID {event_id} because they are already '
+            'associated or do not exist.'
+        )
+
+    versions.bump(DBPassEvent.__tablename__)
+    access_index.add(pass_id, event_id)
+    cache.catalog.clear()
 
     return new_id
 
@@ -169,6 +248,12 @@ def delete_pass_event_db(pass_id: str, event_id: str, session: Session) -> str:
 
     deleted_id = session.scalar(query)
     session.commit()
+    versions.bump(DBPassEvent.__tablename__)
+
+    if deleted_id is not None:
+        access_index.remove(pass_id, event_id)
+
+    cache.catalog.clear()
 
     return deleted_id
 
@@ -222,21 +307,31 @@ def create_team_user_db(team_id: str, user_id: str, validate: bool, session: Ses
     :rtype: str
 
     :raise DBNotFoundError: User does not have a pass.
-    :raise DBValidationError: User is not eligible to join the team.
+    :raise DBValidationError: User is not eligible to join the team or is already a member.
     """
     if validate:
-        event_ids = read_team_events_db(team_id, session)
+        event_id = _read_ineligible_team_event(user_id, team_id, session)
 
-        for event_id in event_ids:
-            if not _validate_user_for_event(user_id, event_id, session):
-                raise DBValidationError(
-                    f'User with ID {user_id} cannot be added to team with ID {team_id} because they are not eligible '
-                    f'for event with ID {event_id}.'
-                )
+        if event_id is not None:
+            raise DBValidationError(
+                f'User with ID {user_id} cannot be added to team with ID {team_id} because they are not eligible '
+                f'for event with ID {event_id}.'
+            )
 
     query = sqlalchemy.insert(DBTeamUser).values(team_id=team_id, user_id=user_id).returning(DBTeamUser.id)
-    new_id = session.scalar(query)
-    session.commit()
+
+    try:
+        new_id = session.scalar(query)
+        session.commit()
+
+    except IntegrityError:
+        session.rollback()
+        raise DBValidationError(
+            f'Team with ID {team_id} cannot be associated with user with ID {user_id} because they are already '
+            'associated or do not exist.'
+        )
+
+    versions.bump(DBTeamUser.__tablename__)
 
     return new_id
 
@@ -264,10 +359,41 @@ def delete_team_user_db(team_id: str, user_id: str, session: Session) -> str:
 
     deleted_id = session.scalar(query)
     session.commit()
+    versions.bump(DBTeamUser.__tablename__)
 
     return deleted_id
 
 
+def read_event_teams_users_db(event_id: str, session: Session) -> dict[str, list[DBUser]]:
+    """
+    Read the members of every team registered for an event from the DB via the event's primary key, using a single
+    joined query regardless of the number of teams.
+
+    :param event_id: ID of the event whose registered teams' members are to be read.
+    :type event_id: str
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: DB user instances keyed by DB team ID; teams without members map to an empty list.
+    :rtype: dict[str, list[DBUser]]
+    """
+    query = (
+        sqlalchemy.select(DBTeamEvent.team_id, DBUser)
+        .outerjoin(DBTeamUser, DBTeamUser.team_id == DBTeamEvent.team_id)
+        .outerjoin(DBUser, DBUser.id == DBTeamUser.user_id)
+        .where(DBTeamEvent.event_id == event_id)
+    )
+
+    teams_users: dict[str, list[DBUser]] = {}
+    for team_id, db_user in session.execute(query):
+        team_users = teams_users.setdefault(team_id, [])
+
+        if db_user is not None:
+            team_users.append(db_user)
+
+    return teams_users
+
+
 def read_team_events_db(team_id: str, session: Session) -> Sequence[str]:
     """
     Read a team's events from the DB via its primary key.
@@ -321,7 +447,7 @@ def create_team_event_db(
     :rtype: str
 
     :raise DBNotFoundError: Team does not have a host or team members do not have a pass.
-    :raise DBValidationError: Team is not eligible for the event.
+    :raise DBValidationError: Team is not eligible for the event or is already registered for it.
     """
     if validate:
         if not _validate_team_users_for_event(team_id, event_id, validate_host_only, session):
@@ -331,8 +457,19 @@ def create_team_event_db(
             )
 
     query = sqlalchemy.insert(DBTeamEvent).values(team_id=team_id, event_id=event_id).returning(DBTeamEvent.id)
-    new_id = session.scalar(query)
-    session.commit()
+
+    try:
+        new_id = session.scalar(query)
+        session.commit()
+
+    except IntegrityError:
+        session.rollback()
+        raise DBValidationError(
+            f'Team with ID {team_id} cannot be associated with event with ID {event_id} because they are already '
+            'associated or do not exist.'
+        )
+
+    versions.bump(DBTeamEvent.__tablename__)
 
     return new_id
 
@@ -360,6 +497,7 @@ def delete_team_event_db(team_id: str, event_id: str, session: Session) -> str:
 
     deleted_id = session.scalar(query)
     session.commit()
+    versions.bump(DBTeamEvent.__tablename__)
 
     return deleted_id
 
@@ -396,6 +534,29 @@ def read_event_users_db(event_id: str, session: Session) -> Sequence[str]:
     return session.scalars(query).all()
 
 
+def read_event_attendees_db(event_id: str, session: Session) -> Sequence[str]:
+    """
+    Read every user attending an event from the DB via its primary key: users registered individually, and the hosts
+    and members of registered teams.
+
+    :param event_id: ID of the event whose attendees are to be read.
+    :type event_id: str
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: DB user IDs without duplicates, in primary key order.
+    :rtype: Sequence[str]
+    """
+    team_ids = sqlalchemy.select(DBTeamEvent.team_id).where(DBTeamEvent.event_id == event_id)
+    query = sqlalchemy.union(
+        sqlalchemy.select(DBUserEvent.user_id.label('user_id')).where(DBUserEvent.event_id == event_id),
+        sqlalchemy.select(DBTeamUser.user_id).where(DBTeamUser.team_id.in_(team_ids)),
+        sqlalchemy.select(DBTeam.host_id).where(DBTeam.id.in_(team_ids))
+    ).order_by('user_id')
+
+    return session.scalars(query).all()
+
+
 def create_user_event_db(user_id: str, event_id: str, validate: bool, session: Session) -> str:
     """
     Create a new user-event association in the DB.
@@ -413,7 +574,7 @@ def create_user_event_db(user_id: str, event_id: str, validate: bool, session: S
     :rtype: str
 
     :raise DBNotFoundError: User does not have a pass.
-    :raise DBValidationError: User is not eligible for the event.
+    :raise DBValidationError: User is not eligible for the event or is already registered for it.
     """
     if validate:
         if not _validate_user_for_event(user_id, event_id, session):
@@ -422,8 +583,19 @@ def create_user_event_db(user_id: str, event_id: str, validate: bool, session: S
             )
 
     query = sqlalchemy.insert(DBUserEvent).values(user_id=user_id, event_id=event_id).returning(DBUserEvent.id)
-    new_id = session.scalar(query)
-    session.commit()
+
+    try:
+        new_id = session.scalar(query)
+        session.commit()
+
+    except IntegrityError:
+        session.rollback()
+        raise DBValidationError(
+            f'User with ID {user_id} cannot be associated with event with ID {event_id} because they are already '
+            'associated or do not exist.'
+        )
+
+    versions.bump(DBUserEvent.__tablename__)
 
     return new_id
 
@@ -450,5 +622,6 @@ def delete_user_event_db(user_id: str, event_id: str, session: Session) -> str:
 
     deleted_id = session.scalar(query)
     session.commit()
+    versions.bump(DBUserEvent.__tablename__)
 
     return deleted_id
@@ -0,0 +1,246 @@
+"""Bloom filters of every user, event and team ID, used to reject unknown IDs without a DB round trip."""
+import hashlib
+import math
+import os
+import threading
+import time
+from typing import Any, Optional, Type
+
+import dotenv
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.core import DBEvent, DBTeam, DBUser
+
+dotenv.load_dotenv()
+
+FALSE_POSITIVE_RATE = float(os.getenv('BLOOM_FILTER_FALSE_POSITIVE_RATE', 0.01))
+TTL_SECONDS = float(os.getenv('BLOOM_FILTER_TTL', 10))
+
+# Filters are sized for this many times the IDs they are loaded with, so that IDs created until the next reload do not
+# push the false positive rate above its target.
+_GROWTH_FACTOR = 2
+_MIN_CAPACITY = 1024
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings, using double hashing of a single BLAKE2b digest."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        """
+        :param capacity: Number of items that the filter is sized for.
+        :type capacity: int
+        :param false_positive_rate: Probability of a false positive once the filter holds `capacity` items.
+        :type false_positive_rate: float
+        """
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & 1 << (position & 7) for position in self._positions(item))
+
+    def read_false_positive_rate(self) -> float:
+        """
+        Estimate the current probability of a false positive from the number of items added.
+
+        :return: False positive rate.
+        :rtype: float
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self._bits.__sizeof__()
+
+
+class IDFilter:
+    """
+    Bloom filter of every primary key in a table. IDs created by this process are added as they are committed, and
+    the filter is reloaded from the DB after `TTL_SECONDS`, which bounds how long IDs created by other processes are
+    wrongly rejected and clears out deleted ones.
+    """
+
+    def __init__(self, db_class: Type[Any]):
+        """
+        :param db_class: DB class of the table whose IDs the filter holds.
+        :type db_class: Type[Any]
+        """
+        self._db_class = db_class
+        self._filter: Optional[BloomFilter] = None
+        self._expires_at: Optional[float] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.rejections = 0
+
+    def load(self, session: Session):
+        """
+        Load the filter from every ID in the table, replacing its current contents.
+
+        :param session: Current DB session.
+        :type session: Session
+        """
+        generation = self._generation
+        ids = session.scalars(sqlalchemy.select(self._db_class.id)).all()
+        bloom_filter = BloomFilter(max(len(ids) * _GROWTH_FACTOR, _MIN_CAPACITY), FALSE_POSITIVE_RATE)
+
+        for id_ in ids:
+            bloom_filter.add(id_)
+
+        with self._lock:
+            self._filter = bloom_filter
+            # An ID committed while the table was being read may be missing, so load again on the next use.
+            self._expires_at = time.monotonic() + TTL_SECONDS if self._generation == generation else 0
+            self._generation += 1
+
+    def _is_loaded(self) -> bool:
+        return self._expires_at is not None and self._expires_at > time.monotonic()
+
+    def _contains(self, id_: str) -> bool:
+        if id_ in self._filter:
+            return True
+
+        self.rejections += 1
+        return False
+
+    def might_exist(self, id_: str, session: Session) -> bool:
+        """
+        Check whether an ID might be in the table. False means that it is certainly not, barring IDs created by other
+        processes since the filter was loaded.
+
+        Only one thread loads the filter at a time; while it does, the others wait for a filter that was never loaded
+        and keep using a stale one.
+
+        :param id_: ID to check.
+        :type id_: str
+        :param session: Current DB session, used only if the filter has to be loaded.
+        :type session: Session
+
+        :return: False if the ID is not in the table, else True.
+        :rtype: bool
+        """
+        if not self._is_loaded() and self._load_lock.acquire(blocking=self._filter is None):
+            try:
+                if not self._is_loaded():
+                    self.load(session)
+
+            finally:
+                self._load_lock.release()
+
+        return self._contains(id_)
+
+    async def might_exist_async(self, id_: str, session: AsyncSession) -> bool:
+        """
+        Check whether an ID might be in the table without blocking the event loop. While another request loads the
+        filter, IDs are checked against the stale filter or, if there is none yet, looked up by their primary key.
+
+        :param id_: ID to check.
+        :type id_: str
+        :param session: Current async DB session, used only if the filter has to be loaded or another request is
+            loading it for the first time.
+        :type session: AsyncSession
+
+        :return: False if the ID is not in the table, else True.
+        :rtype: bool
+        """
+        if not self._is_loaded() and self._load_lock.acquire(blocking=False):
+            try:
+                if not self._is_loaded():
+                    await session.run_sync(self.load)
+
+            finally:
+                self._load_lock.release()
+
+        if self._filter is None:
+            return await session.get(self._db_class, id_) is not None
+
+        return self._contains(id_)
+
+    def add(self, id_: str):
+        """
+        Add an ID to the filter once its row has been committed to the DB.
+
+        :param id_: ID of the new row.
+        :type id_: str
+        """
+        with self._lock:
+            if self._expires_at is None:
+                return
+
+            self._filter.add(id_)
+            self._generation += 1
+
+            # Past its capacity the filter's false positive rate climbs, so resize it on the next use.
+            if self._filter.count > self._filter.capacity:
+                self._expires_at = 0
+
+    def invalidate(self):
+        """Mark the filter as stale so that it is reloaded on its next use."""
+        with self._lock:
+            self._expires_at = None
+            self._generation += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Read the size and accuracy of the filter.
+
+        :return: IDs held and capacity, bits and hash functions, memory footprint in bytes, estimated false positive
+            rate and IDs rejected so far; only the rejections until it is loaded.
+        :rtype: dict[str, int | float]
+        """
+        bloom_filter = self._filter
+
+        if bloom_filter is None:
+            return {'rejections': self.rejections}
+
+        return {
+            'count': bloom_filter.count, 'capacity': bloom_filter.capacity, 'bits': bloom_filter.size,
+            'hashes': bloom_filter.hashes, 'bytes': bloom_filter.__sizeof__(),
+            'false_positive_rate': bloom_filter.read_false_positive_rate(), 'rejections': self.rejections
+        }
+
+
+users = IDFilter(DBUser)
+events = IDFilter(DBEvent)
+teams = IDFilter(DBTeam)
+
+
+def load(session: Session):
+    """
+    Load every ID filter from the DB.
+
+    :param session: Current DB session.
+    :type session: Session
+    """
+    for id_filter in (users, events, teams):
+        id_filter.load(session)
+
+
+def invalidate():
+    """Mark every ID filter as stale so that it is reloaded on its next use."""
+    for id_filter in (users, events, teams):
+        id_filter.invalidate()
+
+
+def read_stats() -> dict[str, dict[str, int | float]]:
+    """
+    Read the size and accuracy of every ID filter.
+
+    :return: Statistics per filter.
+    :rtype: dict[str, dict[str, int | float]]
+    """
+    return {'user': users.stats(), 'event': events.stats(), 'team': teams.stats()}
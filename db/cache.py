@@ -0,0 +1,122 @@
+"""Bounded in-process caches for reads that are frequent but rarely change."""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable
+
+import dotenv
+
+dotenv.load_dotenv()
+
+_MISSING = object()
+
+
+class TTLCache[V]:
+    """
+    Least-recently-used cache whose entries also expire a fixed number of seconds after they are stored. Safe to share
+    between the event loop and the DB thread pool.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param max_size: Maximum number of entries before the least recently used is evicted.
+        :type max_size: int
+        :param ttl: Seconds for which an entry is served before it is read again.
+        :type ttl: float
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        """
+        Get an entry from the cache, counting the lookup as a hit or a miss.
+
+        :param key: Key of the entry.
+        :type key: Hashable
+        :param default: Value returned when the entry is missing or has expired.
+
+        :return: Cached value if the entry is fresh, else the default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: V, generation: int | None = None):
+        """
+        Store an entry in the cache, evicting the least recently used entry once the cache is full.
+
+        :param key: Key of the entry.
+        :type key: Hashable
+        :param value: Value to store.
+        :type value: V
+        :param generation: Generation read before the value was loaded; the value is dropped if the cache was cleared
+        since, as it may predate the write that cleared it.
+        :type generation: int | None
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry from the cache after a write that may have changed any of them."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the size of the cache and its hit and miss counters.
+
+        :return: Cache statistics.
+        :rtype: dict[str, int]
+        """
+        with self._lock:
+            return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        Get an entry from the cache, loading and storing it on a miss.
+
+        :param key: Key of the entry.
+        :type key: Hashable
+        :param loader: Function that reads the value from the DB; exceptions it raises are not cached.
+        :type loader: Callable[[], Awaitable[V]]
+
+        :return: Cached or freshly loaded value.
+        :rtype: V
+        """
+        value = self.get(key, _MISSING)
+
+        if value is not _MISSING:
+            return value
+
+        generation = self._generation
+        value = await loader()
+        self.set(key, value, generation)
+
+        return value
+
+
+catalog: TTLCache = TTLCache(int(os.getenv('CATALOG_CACHE_SIZE', 1024)), float(os.getenv('CATALOG_CACHE_TTL', 60)))
+"""Cache for event and pass reads, cleared whenever an event, a pass or a pass-event association changes."""
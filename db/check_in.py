@@ -0,0 +1,268 @@
+"""Fest gate check-in type and mapping, with a buffered log that records scans in batches."""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, ContextManager, Optional
+
+import dotenv
+import sqlalchemy
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from db import access_index, admission
+from db.core import DBCheckIn
+
+dotenv.load_dotenv()
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv('CHECK_IN_FLUSH_INTERVAL_MS', 250)) / 1000
+FLUSH_ROWS = int(os.getenv('CHECK_IN_FLUSH_ROWS', 500))
+DEDUPLICATION_SECONDS = float(os.getenv('CHECK_IN_DEDUPLICATION_SECONDS', 30))
+MAX_BUFFER_ROWS = int(os.getenv('CHECK_IN_MAX_BUFFER_ROWS', 100_000))
+
+_logger = logging.getLogger(__name__)
+
+_buffer: list[dict] = []
+# Time of the last recorded scan per user, event and outcome, in the order they were recorded.
+_recorded_at: dict[tuple[str, str, bool], float] = {}
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_stopping = threading.Event()
+_writer: Optional[threading.Thread] = None
+
+
+def _trim():
+    """Drop the oldest buffered check-ins beyond `MAX_BUFFER_ROWS`, so that a long DB outage cannot exhaust memory."""
+    overflow = len(_buffer) - MAX_BUFFER_ROWS
+
+    if overflow > 0:
+        del _buffer[:overflow]
+        _logger.warning('Dropped %d buffered check-ins over the limit of %d.', overflow, MAX_BUFFER_ROWS)
+
+
+class CheckIn(BaseModel):
+    """Gate check-in model."""
+    event_id: str
+    user_id: str
+    allowed: bool
+    timestamp: datetime
+
+    class Config:
+        from_attributes = True
+
+
+def _record(check_in: CheckIn) -> bool:
+    """
+    Add a check-in to the buffer, unless the same user was already recorded with the same outcome at the same event
+    within the last `DEDUPLICATION_SECONDS`, as happens when a gate scans a QR code several times.
+
+    :param check_in: Check-in to be recorded.
+    :type check_in: CheckIn
+
+    :return: True if the buffer has reached `FLUSH_ROWS` and should be flushed, else False.
+    :rtype: bool
+    """
+    key = (check_in.user_id, check_in.event_id, check_in.allowed)
+    now = time.monotonic()
+
+    with _lock:
+        while _recorded_at:
+            oldest_key, recorded_at = next(iter(_recorded_at.items()))
+
+            if now - recorded_at < DEDUPLICATION_SECONDS:
+                break
+
+            del _recorded_at[oldest_key]
+
+        if key in _recorded_at:
+            return False
+
+        _recorded_at[key] = now
+        _buffer.append(check_in.model_dump())
+        _trim()
+
+        return len(_buffer) >= FLUSH_ROWS
+
+
+def _requeue(rows: list[dict]):
+    """Put check-ins that could not be written back at the front of the buffer, to be retried by the next flush."""
+    global _buffer
+
+    with _lock:
+        _buffer = rows + _buffer
+        _trim()
+
+
+def _write_rows(rows: list[dict], session: Session) -> int:
+    """
+    Write check-ins to the DB one at a time, dropping those that violate a constraint, such as scans of a user or event
+    deleted since, so that they cannot block every later check-in from being written.
+
+    :param rows: Check-ins to be written.
+    :type rows: list[dict]
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Number of check-ins written.
+    :rtype: int
+    """
+    written = 0
+
+    for index, row in enumerate(rows):
+        try:
+            session.execute(sqlalchemy.insert(DBCheckIn), [row])
+            session.commit()
+            written += 1
+
+        except sqlalchemy.exc.IntegrityError:
+            session.rollback()
+            _logger.warning('Dropped check-in of user %s at event %s: %s', row['user_id'], row['event_id'], row)
+
+        except Exception:
+            session.rollback()
+            _requeue(rows[index:])
+            raise
+
+    if written < len(rows):
+        _logger.warning('Dropped %d of %d check-ins that violate a constraint.', len(rows) - written, len(rows))
+
+    return written
+
+
+def flush(session: Session) -> int:
+    """
+    Write every buffered check-in to the DB in one multi-row insert. If a row violates a constraint, the rows are
+    written one at a time instead and those that still fail are dropped. On any other error the rows are put back at
+    the front of the buffer to be retried by the next flush.
+
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Number of check-ins written.
+    :rtype: int
+    """
+    global _buffer
+
+    with _flush_lock:
+        with _lock:
+            rows, _buffer = _buffer, []
+
+        if len(rows) == 0:
+            return 0
+
+        try:
+            session.execute(sqlalchemy.insert(DBCheckIn), rows)
+            session.commit()
+
+        except sqlalchemy.exc.IntegrityError:
+            session.rollback()
+            return _write_rows(rows, session)
+
+        except Exception:
+            session.rollback()
+            _requeue(rows)
+            raise
+
+        return len(rows)
+
+
+def _write(session_factory: Callable[[], ContextManager[Session]]):
+    """
+    Flush the buffer every `FLUSH_INTERVAL_SECONDS` until the log is stopped, then flush it one last time.
+
+    :param session_factory: Opens a DB session for each flush.
+    :type session_factory: Callable[[], ContextManager[Session]]
+    """
+    while not _stopping.wait(FLUSH_INTERVAL_SECONDS):
+        if len(_buffer) == 0:
+            continue
+
+        try:
+            with session_factory() as session:
+                flush(session)
+
+        except Exception:
+            # The rows are back in the buffer, so a DB outage delays check-ins being recorded rather than losing them.
+            _logger.exception('Failed to flush %d check-ins; retrying in %gs.', len(_buffer), FLUSH_INTERVAL_SECONDS)
+
+    try:
+        with session_factory() as session:
+            flush(session)
+
+    except Exception:
+        _logger.exception('Failed to flush check-ins on shutdown; dropped %d check-ins.', len(_buffer))
+
+
+def start(session_factory: Callable[[], ContextManager[Session]]):
+    """
+    Start flushing the buffer periodically on a background thread.
+
+    :param session_factory: Opens a DB session for each flush.
+    :type session_factory: Callable[[], ContextManager[Session]]
+    """
+    global _writer
+
+    _stopping.clear()
+    _writer = threading.Thread(target=_write, args=(session_factory,), name='check-in-writer', daemon=True)
+    _writer.start()
+
+
+def stop():
+    """Stop the background writer once it has flushed every buffered check-in to the DB."""
+    global _writer
+
+    if _writer is None:
+        return
+
+    _stopping.set()
+    _writer.join()
+    _writer = None
+
+
+def create_db(event_id: str, user_id: str, session: Session) -> CheckIn:
+    """
+    Check a user in to an event at a gate, deciding whether their pass admits them with the in-memory admission and
+    access indexes, and log the scan whether or not they are admitted. Scans are written to the DB in batches by the
+    background writer, or by this call once `FLUSH_ROWS` of them are waiting; failing to write them does not fail the
+    scan.
+
+    :param event_id: ID of the event that the user is checking in to.
+    :type event_id: str
+    :param user_id: ID of the user checking in.
+    :type user_id: str
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Check-in.
+    :rtype: CheckIn
+
+    :raise DBNotFoundError: Event or user does not exist.
+    """
+    admission.validate_event(event_id, session)
+    pass_id = admission.read_user_pass(user_id, session)
+
+    check_in = CheckIn(
+        event_id=event_id, user_id=user_id, allowed=access_index.can_access(pass_id, event_id, session),
+        timestamp=datetime.now()
+    )
+
+    if _record(check_in):
+        try:
+            flush(session)
+
+        except Exception:
+            # The scan has been decided and its rows are back in the buffer for the background writer to retry, so a DB
+            # error must not fail it.
+            _logger.exception('Failed to flush check-ins.')
+
+    return check_in
+
+
+def clear():
+    """Discard every buffered check-in and forget every recorded scan, without writing them to the DB."""
+    global _buffer
+
+    with _lock:
+        _buffer = []
+        _recorded_at.clear()
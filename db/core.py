@@ -6,11 +6,13 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, Generator
+from typing import AsyncGenerator, Optional, Generator
 
 import dotenv
 import sqlalchemy
-from sqlalchemy import Enum as SQLAlchemyEnum, Numeric, ForeignKey, orm, String
+from sqlalchemy import Enum as SQLAlchemyEnum, Numeric, ForeignKey, Index, orm, String
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session
 
 
@@ -25,6 +27,26 @@ def _generate_base64_uuid() -> str:
     return base64.urlsafe_b64encode(raw_uuid.bytes).decode('utf-8').rstrip('=')
 
 
+def _to_async_database_url(database_url: str) -> str:
+    """
+    Convert a synchronous database URL into its asynchronous counterpart by swapping in the async driver; asyncpg for
+    PostgreSQL and aiosqlite for SQLite. URLs that already name an async driver are returned unchanged.
+
+    :param database_url: Synchronous database URL.
+    :type database_url: str
+
+    :return: Asynchronous database URL.
+    :rtype: str
+    """
+    url = make_url(database_url)
+    async_drivers = {'postgresql': 'postgresql+asyncpg', 'sqlite': 'sqlite+aiosqlite'}
+
+    if url.get_backend_name() in async_drivers and url.get_driver_name() not in ('asyncpg', 'aiosqlite'):
+        url = url.set(drivername=async_drivers[url.get_backend_name()])
+
+    return url.render_as_string(hide_password=False)
+
+
 def _generate_shortened_user_id() -> str:
     """
     Generate a shorted ID for use as primary keys only on certain human-readable IDs in the database. Avoid using for
@@ -93,7 +115,7 @@ class DBEvent(DBBase):
     team_members: Mapped[Optional[int]]
     start: Mapped[Optional[datetime]]
     venue: Mapped[Optional[str]]
-    organizer_id: Mapped[Optional[str]] = orm.mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+    organizer_id: Mapped[Optional[str]] = orm.mapped_column(ForeignKey('user.id', ondelete='CASCADE'), index=True)
 
 
 class DBPass(DBBase):
@@ -110,7 +132,7 @@ class DBTeam(DBBase):
     __tablename__ = 'team'
 
     name: Mapped[str]
-    host_id: Mapped[str] = orm.mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+    host_id: Mapped[str] = orm.mapped_column(ForeignKey('user.id', ondelete='CASCADE'), index=True)
 
 
 class DBUser(DBBase):
@@ -120,7 +142,7 @@ class DBUser(DBBase):
     first_name: Mapped[str]
     last_name: Mapped[str]
     email_address: Mapped[str] = orm.mapped_column(unique=True)
-    phone_number: Mapped[Optional[str]]
+    phone_number: Mapped[Optional[str]] = orm.mapped_column(index=True)
     mahe_registration_number: Mapped[Optional[int]] = orm.mapped_column(unique=True)
     pass_id: Mapped[Optional[str]] = orm.mapped_column(ForeignKey('pass.id', ondelete='CASCADE'))
     id: Mapped[str] = orm.mapped_column(String(22), primary_key=True, default=_generate_shortened_user_id, index=True)
@@ -132,11 +154,11 @@ class DBSupportTicket(DBBase):
 
     name: Mapped[str]
     description: Mapped[str]
-    category: Mapped[SupportTicketCategory] = orm.mapped_column(SQLAlchemyEnum(SupportTicketCategory))
+    category: Mapped[SupportTicketCategory] = orm.mapped_column(SQLAlchemyEnum(SupportTicketCategory), index=True)
     timestamp: Mapped[datetime]
     solved: Mapped[bool]
     college_name: Mapped[Optional[str]]
-    email_address: Mapped[Optional[str]]
+    email_address: Mapped[Optional[str]] = orm.mapped_column(index=True)
     phone_number: Mapped[Optional[str]]
     solved_email_address: Mapped[Optional[str]]
     comment: Mapped[Optional[str]]
@@ -145,6 +167,10 @@ class DBSupportTicket(DBBase):
 class DBPassEvent(DBBase):
     """Pass and event association table."""
     __tablename__ = 'pass_event'
+    __table_args__ = (
+        Index('ix_pass_event_pass_id_event_id', 'pass_id', 'event_id', unique=True),
+        Index('ix_pass_event_event_id', 'event_id'),
+    )
 
     pass_id: Mapped[str] = orm.mapped_column(ForeignKey('pass.id', ondelete='CASCADE'))
     event_id: Mapped[str] = orm.mapped_column(ForeignKey('event.id', ondelete='CASCADE'))
@@ -153,6 +179,10 @@ class DBPassEvent(DBBase):
 class DBTeamUser(DBBase):
     """Team and user association table."""
     __tablename__ = 'team_user'
+    __table_args__ = (
+        Index('ix_team_user_team_id_user_id', 'team_id', 'user_id', unique=True),
+        Index('ix_team_user_user_id', 'user_id'),
+    )
 
     team_id: Mapped[str] = orm.mapped_column(ForeignKey('team.id', ondelete='CASCADE'))
     user_id: Mapped[str] = orm.mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
@@ -161,6 +191,10 @@ class DBTeamUser(DBBase):
 class DBTeamEvent(DBBase):
     """Team and event association table."""
     __tablename__ = 'team_event'
+    __table_args__ = (
+        Index('ix_team_event_team_id_event_id', 'team_id', 'event_id', unique=True),
+        Index('ix_team_event_event_id', 'event_id'),
+    )
 
     team_id: Mapped[str] = orm.mapped_column(ForeignKey('team.id', ondelete='CASCADE'))
     event_id: Mapped[str] = orm.mapped_column(ForeignKey('event.id', ondelete='CASCADE'))
@@ -169,11 +203,28 @@ class DBTeamEvent(DBBase):
 class DBUserEvent(DBBase):
     """User and event association table. Use only for shows like pro-shows."""
     __tablename__ = 'user_event'
+    __table_args__ = (
+        Index('ix_user_event_user_id_event_id', 'user_id', 'event_id', unique=True),
+        Index('ix_user_event_event_id', 'event_id'),
+    )
 
     user_id: Mapped[str] = orm.mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
     event_id: Mapped[str] = orm.mapped_column(ForeignKey('event.id', ondelete='CASCADE'))
 
 
+class DBCheckIn(DBBase):
+    """Gate check-in log table."""
+    __tablename__ = 'check_in'
+    __table_args__ = (
+        Index('ix_check_in_event_id_user_id', 'event_id', 'user_id'),
+    )
+
+    event_id: Mapped[str] = orm.mapped_column(ForeignKey('event.id', ondelete='CASCADE'))
+    user_id: Mapped[str] = orm.mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+    allowed: Mapped[bool]
+    timestamp: Mapped[datetime]
+
+
 class DBNotFoundError(Exception):
     pass
 
@@ -182,16 +233,32 @@ class DBValidationError(Exception):
     pass
 
 
+class DBBusyError(Exception):
+    pass
+
+
 dotenv.load_dotenv()
 
+POOL_SIZE = 32
+MAX_OVERFLOW = 64
+
 _database_url = os.getenv('DATABASE_URL')
 _engine = sqlalchemy.create_engine(
-    _database_url, pool_size=32, max_overflow=64, pool_timeout=30, pool_recycle=1800, pool_pre_ping=True
+    _database_url, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_timeout=30, pool_recycle=1800,
+    pool_pre_ping=True
 )
 
 _session_local = orm.sessionmaker(autocommit=False, autoflush=False, bind=_engine)
 DBBase.metadata.create_all(bind=_engine)
 
+_async_database_url = os.getenv('ASYNC_DATABASE_URL') or _to_async_database_url(_database_url)
+_async_engine = create_async_engine(
+    _async_database_url, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_timeout=30, pool_recycle=1800,
+    pool_pre_ping=True
+)
+
+_async_session_local = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=_async_engine)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -206,3 +273,19 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a current async DB session as a generator. The session never blocks the event loop while waiting on the DB and
+    is automatically closed after it is used.
+
+    :return: The current async DB session.
+    :rtype: AsyncGenerator[AsyncSession, None]
+    """
+    db = _async_session_local()
+
+    try:
+        yield db
+    finally:
+        await db.close()
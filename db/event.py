@@ -1,12 +1,13 @@
 """Fest event type and mapping."""
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import AsyncIterator, Optional, Sequence, Type
 
 import sqlalchemy
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db import operations
+from db import access_index, admission, bloom, cache, operations
 from db.core import EventType, DBEvent, DBNotFoundError
 
 
@@ -58,6 +59,9 @@ def read_db(event_id: str, session: Session) -> DBEvent:
 
     :raise DBNotFoundError: Event does not exist.
     """
+    if not bloom.events.might_exist(event_id, session):
+        raise DBNotFoundError(f'Event with ID {event_id} not found.')
+
     db_event: Optional[DBEvent] = session.get(DBEvent, event_id)
 
     if db_event is None:
@@ -82,6 +86,26 @@ def read_by_ids_db(event_ids: Sequence[str], session: Session) -> Sequence[DBEve
     return session.scalars(query).all()
 
 
+def read_models_by_ids_db(
+        event_ids: Sequence[str], session: Session, model: Type[BaseModel] = Event
+) -> list[BaseModel]:
+    """
+    Read events from the DB via their primary keys straight into models, without hydrating ORM instances; for
+    read-only use.
+
+    :param event_ids: IDs of the events to be read.
+    :type event_ids: Sequence[str]
+    :param session: Current DB session.
+    :type session: Session
+    :param model: `Event`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the events.
+    :rtype: list[BaseModel]
+    """
+    return operations.read_models_by_ids_db(event_ids, DBEvent, model, session)
+
+
 def read_all_db(session: Session) -> list[DBEvent]:
     """
     Read all events from the DB.
@@ -108,7 +132,11 @@ def create_db(event: EventCreate, session: Session) -> DBEvent:
     :return: New event DB instance.
     :rtype: DBEvent
     """
-    return operations.create_db(event, DBEvent, session)
+    db_event = operations.create_db(event, DBEvent, session)
+    bloom.events.add(db_event.id)
+    cache.catalog.clear()
+
+    return db_event
 
 
 def update_db(event_id: str, event: EventUpdate, session: Session) -> DBEvent:
@@ -127,7 +155,10 @@ def update_db(event_id: str, event: EventUpdate, session: Session) -> DBEvent:
 
     :raise DBNotFoundError: Event does not exist.
     """
-    return operations.update_db(event_id, event, read_db, session)
+    db_event = operations.update_db(event_id, event, read_db, session)
+    cache.catalog.clear()
+
+    return db_event
 
 
 def delete_db(event_id: str, session: Session) -> DBEvent:
@@ -144,4 +175,187 @@ def delete_db(event_id: str, session: Session) -> DBEvent:
 
     :raise DBNotFoundError: Event does not exist.
     """
-    return operations.delete_db(event_id, read_db, session)
\ No newline at end of file
+    db_event = operations.delete_db(event_id, read_db, session)
+    cache.catalog.clear()
+    access_index.invalidate()
+    admission.remove_event(event_id)
+
+    return db_event
+
+
+async def read_db_async(event_id: str, session: AsyncSession) -> DBEvent:
+    """
+    Read an event from the DB via its primary key without blocking the event loop.
+
+    :param event_id: ID of the event to read.
+    :type event_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Event DB instance.
+    :rtype: DBEvent
+
+    :raise DBNotFoundError: Event does not exist.
+    """
+    if not await bloom.events.might_exist_async(event_id, session):
+        raise DBNotFoundError(f'Event with ID {event_id} not found.')
+
+    db_event: Optional[DBEvent] = await session.get(DBEvent, event_id)
+
+    if db_event is None:
+        raise DBNotFoundError(f'Event with ID {event_id} not found.')
+
+    return db_event
+
+
+async def read_models_by_ids_db_async(event_ids: Sequence[str], session: AsyncSession) -> list[Event]:
+    """
+    Read events from the DB via their primary keys straight into models, without hydrating ORM instances or blocking
+    the event loop; for read-only use.
+
+    :param event_ids: IDs of the events to be read.
+    :type event_ids: Sequence[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Event models.
+    :rtype: list[Event]
+    """
+    return await operations.read_models_by_ids_db_async(event_ids, DBEvent, Event, session)
+
+
+async def read_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession
+) -> tuple[Sequence[DBEvent], Optional[str]]:
+    """
+    Read a page of events from the DB ordered by primary key without blocking the event loop.
+
+    :param limit: Maximum number of events in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Event DB instances in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[Sequence[DBEvent], Optional[str]]
+    """
+    return await operations.read_page_db_async(DBEvent, limit, cursor, session)
+
+
+async def read_models_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession, model: Type[BaseModel] = Event
+) -> tuple[list[BaseModel], Optional[str]]:
+    """
+    Read a page of events from the DB ordered by primary key straight into models, without hydrating ORM instances or
+    blocking the event loop; for read-only use.
+
+    :param limit: Maximum number of events in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+    :param model: `Event`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the events in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[list[BaseModel], Optional[str]]
+    """
+    return await operations.read_models_page_db_async(DBEvent, model, limit, cursor, session)
+
+
+def stream_all_db_async(session: AsyncSession) -> AsyncIterator[DBEvent]:
+    """
+    Stream all events from the DB through a server-side cursor without blocking the event loop.
+
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Event DB instances, one at a time.
+    :rtype: AsyncIterator[DBEvent]
+    """
+    return operations.stream_all_db_async(DBEvent, session)
+
+
+async def read_cached_async(event_id: str, session: AsyncSession) -> Event:
+    """
+    Read an event via its primary key from the catalog cache, reading it from the DB on a miss.
+
+    :param event_id: ID of the event to read.
+    :type event_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Event model.
+    :rtype: Event
+
+    :raise DBNotFoundError: Event does not exist.
+    """
+    async def load() -> Event:
+        return Event.model_validate(await read_db_async(event_id, session))
+
+    return await cache.catalog.get_or_load_async(('event', event_id), load)
+
+
+async def create_db_async(event: EventCreate, session: AsyncSession) -> DBEvent:
+    """
+    Create a new event in the DB without blocking the event loop.
+
+    :param event: Event to create.
+    :type event: EventCreate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: New event DB instance.
+    :rtype: DBEvent
+    """
+    db_event = await operations.create_db_async(event, DBEvent, session)
+    bloom.events.add(db_event.id)
+    cache.catalog.clear()
+
+    return db_event
+
+
+async def update_db_async(event_id: str, event: EventUpdate, session: AsyncSession) -> DBEvent:
+    """
+    Update an existing event in the DB without blocking the event loop.
+
+    :param event_id: ID of the event to update.
+    :type event_id: str
+    :param event: Event to update.
+    :type event: EventUpdate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Updated event DB instance.
+    :rtype: DBEvent
+
+    :raise DBNotFoundError: Event does not exist.
+    """
+    db_event = await operations.update_db_async(event_id, event, read_db_async, session)
+    cache.catalog.clear()
+
+    return db_event
+
+
+async def delete_db_async(event_id: str, session: AsyncSession) -> DBEvent:
+    """
+    Delete an existing event from the DB without blocking the event loop.
+
+    :param event_id: ID of the event to delete.
+    :type event_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Deleted event DB instance.
+    :rtype: DBEvent
+
+    :raise DBNotFoundError: Event does not exist.
+    """
+    db_event = await operations.delete_db_async(event_id, read_db_async, session)
+    cache.catalog.clear()
+    access_index.invalidate()
+    admission.remove_event(event_id)
+
+    return db_event
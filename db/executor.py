@@ -0,0 +1,115 @@
+"""Run synchronous DB functions off the event loop on a bounded thread pool."""
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Callable
+
+import dotenv
+
+from db.core import DBBusyError, MAX_OVERFLOW, POOL_SIZE
+
+dotenv.load_dotenv()
+
+INLINE_MODE = 'inline'
+THREAD_MODE = 'thread'
+
+RETRY_AFTER_SECONDS = int(os.getenv('DB_EXECUTOR_RETRY_AFTER', 1))
+
+_mode = os.getenv('DB_EXECUTION_MODE', INLINE_MODE)
+_max_workers = POOL_SIZE + MAX_OVERFLOW
+_max_queue_depth = int(os.getenv('DB_EXECUTOR_QUEUE_DEPTH', 4 * _max_workers))
+
+_executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix='db')
+_pending = 0
+_pending_lock = threading.Lock()
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+
+def _reserve():
+    """
+    Reserve a place among the requests that are running or queued for DB access.
+
+    :raise DBBusyError: Every worker is busy and the queue is at its depth limit.
+    """
+    global _pending
+
+    with _pending_lock:
+        if _pending >= _max_workers + _max_queue_depth:
+            raise DBBusyError(f'DB is saturated with {_pending} pending requests; retry in {RETRY_AFTER_SECONDS}s.')
+
+        _pending += 1
+
+
+def _release():
+    """Release a place reserved by `_reserve` once its request is done with the DB."""
+    global _pending
+
+    with _pending_lock:
+        _pending -= 1
+
+
+def _semaphore() -> asyncio.Semaphore:
+    """
+    Get the semaphore that limits the requests running DB work on the current event loop to the number of workers.
+
+    :return: Worker semaphore for the running event loop.
+    :rtype: asyncio.Semaphore
+    """
+    loop = asyncio.get_running_loop()
+
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(_max_workers)
+
+    return _semaphores[loop]
+
+
+async def admit() -> AsyncGenerator[None, None]:
+    """
+    FastAPI dependency that admits a request to the DB thread pool for its whole lifetime, since its session holds a
+    pooled connection until it is closed. Requests queue once every worker is busy and are rejected outright once the
+    queue is full so that latency degrades gracefully. A no-op unless the thread execution mode is selected.
+
+    :raise DBBusyError: The thread pool and its queue are saturated.
+    """
+    if _mode != THREAD_MODE:
+        yield
+        return
+
+    _reserve()
+
+    try:
+        async with _semaphore():
+            yield
+
+    finally:
+        _release()
+
+
+async def run[T](function: Callable[..., T], *args) -> T:
+    """
+    Run a synchronous DB function with the execution mode selected by the `DB_EXECUTION_MODE` environment variable. In
+    inline mode the function is called directly on the event loop. In thread mode it runs on a dedicated thread pool
+    sized to the DB connection pool, keeping the event loop free while the DB works.
+
+    :param function: Synchronous DB function to run.
+    :type function: Callable[..., T]
+    :param args: Positional arguments for the function, usually ending with the current DB session.
+
+    :return: Result of the function.
+    :rtype: T
+    """
+    if _mode != THREAD_MODE:
+        return function(*args)
+
+    future = asyncio.get_running_loop().run_in_executor(_executor, functools.partial(function, *args))
+
+    try:
+        return await asyncio.shield(future)
+
+    except asyncio.CancelledError:
+        # The worker may still hold the session; let it finish before the session dependency closes it.
+        await asyncio.wait({future})
+        raise
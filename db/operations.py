@@ -1,9 +1,13 @@
-"""Generic functions to create, update and delete records in the DB."""
-from typing import Any, Callable, Type
+"""Generic functions to create, read, update and delete records in the DB."""
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence, Type
 
+import sqlalchemy
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from db import versions
+
 
 def create_db[T](creator: BaseModel, db_class: Type[T], session: Session) -> T:
     """
@@ -23,6 +27,7 @@ def create_db[T](creator: BaseModel, db_class: Type[T], session: Session) -> T:
 
     session.add(db_item)
     session.commit()
+    versions.bump(db_class.__tablename__)
     session.refresh(db_item)
 
     return db_item
@@ -53,6 +58,7 @@ def update_db[T](primary_key: Any, update_model: BaseModel, reader: Callable[[An
         setattr(db_item, key, model_dump[key])
 
     session.commit()
+    versions.bump(db_item.__tablename__)
     session.refresh(db_item)
 
     return db_item
@@ -78,5 +84,231 @@ def delete_db[T](primary_key: Any, reader: Callable[[Any, Session], T], session:
 
     session.delete(db_item)
     session.commit()
+    versions.bump_deleted(db_item.__tablename__)
+
+    return db_item
+
+
+def _select_models_by_ids(ids: Sequence[Any], db_class: Type[Any], model: Type[BaseModel]) -> sqlalchemy.Select:
+    # Columns are selected in the order of the model's fields, so that rows zip straight into them.
+    table = db_class.__table__
+    return sqlalchemy.select(*(table.c[name] for name in model.model_fields)).where(table.c.id.in_(ids))
+
+
+def read_models_by_ids_db[M: BaseModel](
+        ids: Sequence[Any], db_class: Type[Any], model: Type[M], session: Session
+) -> list[M]:
+    """
+    Read records from the DB via their primary keys straight into models, for read-only use. Only the model's columns
+    are selected, as plain rows through SQLAlchemy Core, and the models are built from them without validation, so that
+    no ORM instance is hydrated, instrumented or added to the identity map.
+
+    :param ids: Primary keys of the records to be read.
+    :type ids: Sequence[Any]
+    :param db_class: Class of the data-type.
+    :type db_class: Type[Any]
+    :param model: Model of the data-type, whose fields are all columns of the table.
+    :type model: Type[M]
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Models of the records that exist.
+    :rtype: list[M]
+    """
+    rows = session.execute(_select_models_by_ids(ids, db_class, model))
+    return [model.model_construct(**dict(zip(model.model_fields, row))) for row in rows]
+
+
+async def read_models_by_ids_db_async[M: BaseModel](
+        ids: Sequence[Any], db_class: Type[Any], model: Type[M], session: AsyncSession
+) -> list[M]:
+    """
+    Read records from the DB via their primary keys straight into models, for read-only use, without blocking the event
+    loop.
+
+    :param ids: Primary keys of the records to be read.
+    :type ids: Sequence[Any]
+    :param db_class: Class of the data-type.
+    :type db_class: Type[Any]
+    :param model: Model of the data-type, whose fields are all columns of the table.
+    :type model: Type[M]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Models of the records that exist.
+    :rtype: list[M]
+    """
+    rows = await session.execute(_select_models_by_ids(ids, db_class, model))
+    return [model.model_construct(**dict(zip(model.model_fields, row))) for row in rows]
+
+
+async def read_models_page_db_async[M: BaseModel](
+        db_class: Type[Any], model: Type[M], limit: int, cursor: Optional[str], session: AsyncSession
+) -> tuple[list[M], Optional[str]]:
+    """
+    Read a page of records from the DB ordered by primary key straight into models, for read-only use. Like
+    `read_models_by_ids_db`, only the model's columns are selected, along with the primary key for the cursor.
+
+    :param db_class: Class of the data-type.
+    :type db_class: Type[Any]
+    :param model: Model of the data-type, whose fields are all columns of the table.
+    :type model: Type[M]
+    :param limit: Maximum number of records in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Models in the page and the cursor for the next page, if there is one, else None.
+    :rtype: tuple[list[M], Optional[str]]
+    """
+    table = db_class.__table__
+    query = sqlalchemy.select(table.c.id, *(table.c[name] for name in model.model_fields))
+    query = query.order_by(table.c.id).limit(limit + 1)
+
+    if cursor is not None:
+        query = query.where(table.c.id > cursor)
+
+    rows = (await session.execute(query)).all()
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+
+    return [model.model_construct(**dict(zip(model.model_fields, row[1:]))) for row in rows[:limit]], next_cursor
+
+
+async def read_page_db_async[T](
+        db_class: Type[T], limit: int, cursor: Optional[str], session: AsyncSession
+) -> tuple[Sequence[T], Optional[str]]:
+    """
+    Read a page of records from the DB ordered by primary key, using the primary key of the last record of the previous
+    page as the cursor (keyset pagination) so that every page costs the same regardless of how deep it is.
+
+    :param db_class: Class of the data-type.
+    :type db_class: Type[T]
+    :param limit: Maximum number of records in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: DB instances in the page and the cursor for the next page, if there is one, else None.
+    :rtype: tuple[Sequence[T], Optional[str]]
+    """
+    query = sqlalchemy.select(db_class).order_by(db_class.id).limit(limit + 1)
+
+    if cursor is not None:
+        query = query.where(db_class.id > cursor)
+
+    db_items = (await session.scalars(query)).all()
+
+    if len(db_items) > limit:
+        return db_items[:limit], db_items[limit - 1].id
+
+    return db_items, None
+
+
+async def stream_all_db_async[T](db_class: Type[T], session: AsyncSession, batch_size: int = 1000) -> AsyncIterator[T]:
+    """
+    Stream every record from the DB ordered by primary key through a server-side cursor, fetching `batch_size` rows at
+    a time so that memory stays flat regardless of the size of the table.
+
+    :param db_class: Class of the data-type.
+    :type db_class: Type[T]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+    :param batch_size: Number of rows fetched from the cursor at a time.
+    :type batch_size: int
+
+    :return: DB instances, one at a time.
+    :rtype: AsyncIterator[T]
+    """
+    query = sqlalchemy.select(db_class).order_by(db_class.id).execution_options(yield_per=batch_size)
+
+    async for db_item in await session.stream_scalars(query):
+        yield db_item
+
+
+async def create_db_async[T](creator: BaseModel, db_class: Type[T], session: AsyncSession) -> T:
+    """
+    Create a new record in the DB without blocking the event loop.
+
+    :param creator: Creator model for the data-type.
+    :type creator: BaseModel
+    :param db_class: Class of the data-type.
+    :type db_class: Type[T]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: New DB instance.
+    :rtype: T
+    """
+    db_item = db_class(**creator.model_dump(exclude_none=True))
+
+    session.add(db_item)
+    await session.commit()
+    versions.bump(db_class.__tablename__)
+    await session.refresh(db_item)
+
+    return db_item
+
+
+async def update_db_async[T](
+        primary_key: Any, update_model: BaseModel, reader: Callable[[Any, AsyncSession], Awaitable[T]],
+        session: AsyncSession
+) -> T:
+    """
+    Update an existing record in the DB without blocking the event loop.
+
+    :param primary_key: Primary key for the record.
+    :type primary_key: Any
+    :param update_model: Update model for the data-type.
+    :type update_model: BaseModel
+    :param reader: Async DB retrieval function for the data-type.
+    :type reader: Callable[[Any, AsyncSession], Awaitable[T]]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Updated DB instance.
+    :rtype: T
+
+    :raise DBNotFoundError: Record does not exist.
+    """
+    db_item = await reader(primary_key, session)
+
+    model_dump = update_model.model_dump()
+    for key in update_model.model_fields_set:
+        setattr(db_item, key, model_dump[key])
+
+    await session.commit()
+    versions.bump(db_item.__tablename__)
+    await session.refresh(db_item)
+
+    return db_item
+
+
+async def delete_db_async[T](
+        primary_key: Any, reader: Callable[[Any, AsyncSession], Awaitable[T]], session: AsyncSession
+) -> T:
+    """
+    Delete an existing record from the DB without blocking the event loop.
+
+    :param primary_key: Primary key for the record.
+    :type primary_key: Any
+    :param reader: Async retrieval function for the data-type.
+    :type reader: Callable[[Any, AsyncSession], Awaitable[T]]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Deleted DB instance.
+    :rtype: T
+
+    :raise DBNotFoundError: Record does not exist.
+    """
+    db_item = await reader(primary_key, session)
+
+    await session.delete(db_item)
+    await session.commit()
+    versions.bump_deleted(db_item.__tablename__)
 
     return db_item
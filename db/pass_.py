@@ -1,13 +1,15 @@
 """Fest pass type and mapping."""
 from decimal import Decimal
-from typing import Optional, Sequence
+from typing import AsyncIterator, Optional, Sequence, Type
 
 import sqlalchemy
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db import operations
+from db import access_index, admission, associations, cache, event, operations
 from db.core import DBPass, DBNotFoundError
+from db.event import Event
 
 
 class _PassBase(BaseModel):
@@ -74,6 +76,26 @@ def read_by_ids_db(pass_ids: Sequence[str], session: Session) -> Sequence[DBPass
     return session.scalars(query).all()
 
 
+def read_models_by_ids_db(
+        pass_ids: Sequence[str], session: Session, model: Type[BaseModel] = Pass
+) -> list[BaseModel]:
+    """
+    Read passes from the DB via their primary keys straight into models, without hydrating ORM instances; for
+    read-only use.
+
+    :param pass_ids: IDs of the passes to be read.
+    :type pass_ids: Sequence[str]
+    :param session: Current DB session.
+    :type session: Session
+    :param model: `Pass`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the passes.
+    :rtype: list[BaseModel]
+    """
+    return operations.read_models_by_ids_db(pass_ids, DBPass, model, session)
+
+
 def read_all_db(session: Session) -> list[DBPass]:
     """
     Read all passes from the DB.
@@ -100,7 +122,10 @@ def create_db(pass_: PassCreate, session: Session) -> DBPass:
     :return: New pass DB instance.
     :rtype: DBPass
     """
-    return operations.create_db(pass_, DBPass, session)
+    db_pass = operations.create_db(pass_, DBPass, session)
+    cache.catalog.clear()
+
+    return db_pass
 
 
 def update_db(pass_id: str, pass_: PassUpdate, session: Session) -> DBPass:
@@ -119,7 +144,10 @@ def update_db(pass_id: str, pass_: PassUpdate, session: Session) -> DBPass:
 
     :raise DBNotFoundError: Pass does not exist.
     """
-    return operations.update_db(pass_id, pass_, read_db, session)
+    db_pass = operations.update_db(pass_id, pass_, read_db, session)
+    cache.catalog.clear()
+
+    return db_pass
 
 
 def delete_db(pass_id: str, session: Session) -> DBPass:
@@ -136,4 +164,188 @@ def delete_db(pass_id: str, session: Session) -> DBPass:
 
     :raise DBNotFoundError: Pass does not exist.
     """
-    return operations.delete_db(pass_id, read_db, session)
+    db_pass = operations.delete_db(pass_id, read_db, session)
+    cache.catalog.clear()
+    access_index.invalidate()
+    # Deleting a pass cascades to the users who hold it.
+    admission.invalidate()
+
+    return db_pass
+
+
+async def read_db_async(pass_id: str, session: AsyncSession) -> DBPass:
+    """
+    Read a pass from the DB via its primary key without blocking the event loop.
+
+    :param pass_id: ID of the pass to read.
+    :type pass_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Pass DB instance.
+    :rtype: DBPass
+
+    :raise DBNotFoundError: Pass does not exist.
+    """
+    db_pass: Optional[DBPass] = await session.get(DBPass, pass_id)
+
+    if db_pass is None:
+        raise DBNotFoundError(f'Pass with ID {pass_id} not found.')
+
+    return db_pass
+
+
+async def read_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession
+) -> tuple[Sequence[DBPass], Optional[str]]:
+    """
+    Read a page of passes from the DB ordered by primary key without blocking the event loop.
+
+    :param limit: Maximum number of passes in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Pass DB instances in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[Sequence[DBPass], Optional[str]]
+    """
+    return await operations.read_page_db_async(DBPass, limit, cursor, session)
+
+
+async def read_models_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession, model: Type[BaseModel] = Pass
+) -> tuple[list[BaseModel], Optional[str]]:
+    """
+    Read a page of passes from the DB ordered by primary key straight into models, without hydrating ORM instances or
+    blocking the event loop; for read-only use.
+
+    :param limit: Maximum number of passes in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+    :param model: `Pass`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the passes in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[list[BaseModel], Optional[str]]
+    """
+    return await operations.read_models_page_db_async(DBPass, model, limit, cursor, session)
+
+
+def stream_all_db_async(session: AsyncSession) -> AsyncIterator[DBPass]:
+    """
+    Stream all passes from the DB through a server-side cursor without blocking the event loop.
+
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Pass DB instances, one at a time.
+    :rtype: AsyncIterator[DBPass]
+    """
+    return operations.stream_all_db_async(DBPass, session)
+
+
+async def read_cached_async(pass_id: str, session: AsyncSession) -> Pass:
+    """
+    Read a pass via its primary key from the catalog cache, reading it from the DB on a miss.
+
+    :param pass_id: ID of the pass to read.
+    :type pass_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Pass model.
+    :rtype: Pass
+
+    :raise DBNotFoundError: Pass does not exist.
+    """
+    async def load() -> Pass:
+        return Pass.model_validate(await read_db_async(pass_id, session))
+
+    return await cache.catalog.get_or_load_async(('pass', pass_id), load)
+
+
+async def read_events_cached_async(pass_id: str, session: AsyncSession) -> list[Event]:
+    """
+    Read a pass' events via its primary key from the catalog cache, reading them from the DB on a miss.
+
+    :param pass_id: ID of the pass whose events are to be read.
+    :type pass_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Event models.
+    :rtype: list[Event]
+    """
+    async def load() -> list[Event]:
+        event_ids = await associations.read_pass_events_db_async(pass_id, session)
+        return await event.read_models_by_ids_db_async(event_ids, session)
+
+    return await cache.catalog.get_or_load_async(('pass-events', pass_id), load)
+
+
+async def create_db_async(pass_: PassCreate, session: AsyncSession) -> DBPass:
+    """
+    Create a new pass in the DB without blocking the event loop.
+
+    :param pass_: Pass to create.
+    :type pass_: PassCreate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: New pass DB instance.
+    :rtype: DBPass
+    """
+    db_pass = await operations.create_db_async(pass_, DBPass, session)
+    cache.catalog.clear()
+
+    return db_pass
+
+
+async def update_db_async(pass_id: str, pass_: PassUpdate, session: AsyncSession) -> DBPass:
+    """
+    Update an existing pass in the DB without blocking the event loop.
+
+    :param pass_id: ID of the pass to update.
+    :type pass_id: str
+    :param pass_: Pass to update.
+    :type pass_: PassUpdate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Updated pass DB instance.
+    :rtype: DBPass
+
+    :raise DBNotFoundError: Pass does not exist.
+    """
+    db_pass = await operations.update_db_async(pass_id, pass_, read_db_async, session)
+    cache.catalog.clear()
+
+    return db_pass
+
+
+async def delete_db_async(pass_id: str, session: AsyncSession) -> DBPass:
+    """
+    Delete an existing pass from the DB without blocking the event loop.
+
+    :param pass_id: ID of the pass to delete.
+    :type pass_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Deleted pass DB instance.
+    :rtype: DBPass
+
+    :raise DBNotFoundError: Pass does not exist.
+    """
+    db_pass = await operations.delete_db_async(pass_id, read_db_async, session)
+    cache.catalog.clear()
+    access_index.invalidate()
+    # Deleting a pass cascades to the users who hold it.
+    admission.invalidate()
+
+    return db_pass
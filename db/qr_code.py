@@ -0,0 +1,486 @@
+"""Rendering and content-addressed caching of QR code PNGs."""
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from io import BytesIO
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+import dotenv
+import segno
+
+from db.cache import TTLCache
+
+dotenv.load_dotenv()
+
+DEFAULT_SCALE = 1
+DEFAULT_BORDER = 4
+
+RENDER_TIMEOUT_SECONDS = float(os.getenv('QR_CODE_RENDER_TIMEOUT', 5))
+
+SHEET_COLUMNS = 4
+SHEET_ROWS = 6
+SHEET_CELL_MILLIMETRES = 40
+SHEET_PAGE_MILLIMETRES = (210, 297)
+
+_CACHE_DIR = os.getenv('QR_CODE_CACHE_DIR')
+_workers = int(os.getenv('QR_CODE_WORKERS', os.cpu_count() or 1))
+
+# A QR code never changes for a given payload and set of render options, so entries only leave the cache when evicted.
+_memory_cache: TTLCache[tuple[bytes, str]] = TTLCache(int(os.getenv('QR_CODE_CACHE_SIZE', 4096)), float('inf'))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class QRCodeTimeoutError(Exception):
+    """QR code could not be rendered in time because every render worker is busy."""
+
+
+class QRCodeSheetFormat(Enum):
+    """Formats that many QR codes can be rendered to at once, both downloaded as ZIP archives."""
+    # A PNG per QR code.
+    ZIP = 'zip'
+    # Printable A4 SVG pages of QR codes.
+    SVG = 'svg'
+
+
+class _ChunkWriter:
+    """Write-only file object that collects what is written to it until the chunks are taken."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        """
+        Take every chunk written since the last call.
+
+        :return: Written bytes.
+        :rtype: bytes
+        """
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+
+        return data
+
+
+def render_png(payload: str, scale: int = DEFAULT_SCALE, border: int = DEFAULT_BORDER) -> bytes:
+    """
+    Render a QR code as a PNG.
+
+    :param payload: Data encoded in the QR code.
+    :type payload: str
+    :param scale: Size of a single module in pixels.
+    :type scale: int
+    :param border: Width of the quiet zone around the code in modules.
+    :type border: int
+
+    :return: PNG image.
+    :rtype: bytes
+    """
+    image_stream = BytesIO()
+    segno.make_qr(payload).save(image_stream, kind='png', scale=scale, border=border)
+
+    return image_stream.getvalue()
+
+
+def render_svg(payload: str, border: int = DEFAULT_BORDER) -> str:
+    """
+    Render a QR code as an SVG element without a fixed size, so that it scales to whatever box it is placed in.
+
+    :param payload: Data encoded in the QR code.
+    :type payload: str
+    :param border: Width of the quiet zone around the code in modules.
+    :type border: int
+
+    :return: SVG element.
+    :rtype: str
+    """
+    image_stream = BytesIO()
+    segno.make_qr(payload).save(image_stream, kind='svg', border=border, xmldecl=False, omitsize=True, nl=False)
+
+    return image_stream.getvalue().decode()
+
+
+def _cache_key(payload: str, scale: int, border: int) -> str:
+    """
+    Get the key that a QR code is cached under, which also names its file in the on-disk cache.
+
+    :param payload: Data encoded in the QR code.
+    :type payload: str
+    :param scale: Size of a single module in pixels.
+    :type scale: int
+    :param border: Width of the quiet zone around the code in modules.
+    :type border: int
+
+    :return: Hex digest of the payload and render options.
+    :rtype: str
+    """
+    return hashlib.sha256(f'{segno.__version__}:{scale}:{border}:{payload}'.encode()).hexdigest()
+
+
+def read_etag(payload: str, scale: int = DEFAULT_SCALE, border: int = DEFAULT_BORDER) -> str:
+    """
+    Get the strong entity tag of a QR code without rendering it. Rendering is deterministic for a given version of the
+    encoder, so the tag is the code's cache key.
+
+    :param payload: Data encoded in the QR code.
+    :type payload: str
+    :param scale: Size of a single module in pixels.
+    :type scale: int
+    :param border: Width of the quiet zone around the code in modules.
+    :type border: int
+
+    :return: Entity tag of the PNG image.
+    :rtype: str
+    """
+    return f'"{_cache_key(payload, scale, border)}"'
+
+
+def _read_disk(key: str) -> Optional[bytes]:
+    """
+    Read a rendered PNG from the on-disk cache, if one is configured.
+
+    :param key: Cache key of the QR code.
+    :type key: str
+
+    :return: PNG image if it is on disk, else None.
+    :rtype: Optional[bytes]
+    """
+    if _CACHE_DIR is None:
+        return None
+
+    try:
+        with open(os.path.join(_CACHE_DIR, f'{key}.png'), 'rb') as file:
+            return file.read()
+
+    except FileNotFoundError:
+        return None
+
+
+def _write_disk(key: str, png: bytes):
+    """
+    Write a rendered PNG to the on-disk cache, if one is configured. The file is renamed into place so that concurrent
+    readers never see a partial image.
+
+    :param key: Cache key of the QR code.
+    :type key: str
+    :param png: PNG image.
+    :type png: bytes
+    """
+    if _CACHE_DIR is None:
+        return
+
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=_CACHE_DIR, suffix='.tmp')
+
+    with os.fdopen(file_descriptor, 'wb') as file:
+        file.write(png)
+
+    os.replace(temp_path, os.path.join(_CACHE_DIR, f'{key}.png'))
+
+
+async def _read_cached_async(key: str) -> Optional[tuple[bytes, str]]:
+    """
+    Read a QR code PNG from the memory cache, then the on-disk cache, promoting it to memory if it was on disk. The
+    disk is read on a worker thread so that it never blocks the event loop.
+
+    :param key: Cache key of the QR code.
+    :type key: str
+
+    :return: PNG image and its strong entity tag if either cache has it, else None.
+    :rtype: Optional[tuple[bytes, str]]
+    """
+    cached = _memory_cache.get(key)
+
+    if cached is not None:
+        return cached
+
+    if _CACHE_DIR is None:
+        return None
+
+    png = await asyncio.to_thread(_read_disk, key)
+
+    if png is None:
+        return None
+
+    cached = (png, f'"{key}"')
+    _memory_cache.set(key, cached)
+
+    return cached
+
+
+async def _store_async(key: str, png: bytes) -> tuple[bytes, str]:
+    """
+    Store a freshly rendered QR code PNG in both caches, writing it to disk on a worker thread.
+
+    :param key: Cache key of the QR code.
+    :type key: str
+    :param png: PNG image.
+    :type png: bytes
+
+    :return: PNG image and its strong entity tag, its cache key.
+    :rtype: tuple[bytes, str]
+    """
+    if _CACHE_DIR is not None:
+        await asyncio.to_thread(_write_disk, key, png)
+
+    cached = (png, f'"{key}"')
+    _memory_cache.set(key, cached)
+
+    return cached
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the render worker pool, starting it on first use. Workers are spawned rather than forked, as forking a process
+    that runs an event loop and DB threads is unsafe.
+
+    :return: Render worker pool, or None if the `QR_CODE_WORKERS` environment variable disables it.
+    :rtype: Optional[ProcessPoolExecutor]
+    """
+    global _pool
+
+    if _workers == 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=_workers, mp_context=multiprocessing.get_context('spawn'))
+
+        return _pool
+
+
+async def _render_async[T](render: Callable[..., T], *args) -> T:
+    """
+    Run a render function on the render worker pool so that encoding never blocks the event loop.
+
+    :param render: Render function, which must be importable by the worker processes.
+    :type render: Callable[..., T]
+    :param args: Positional arguments for the render function.
+
+    :return: Result of the render function.
+    :rtype: T
+
+    :raise QRCodeTimeoutError: The render did not finish within `RENDER_TIMEOUT_SECONDS`.
+    """
+    pool = _get_pool()
+
+    if pool is None:
+        return render(*args)
+
+    future = pool.submit(render, *args)
+
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), RENDER_TIMEOUT_SECONDS)
+
+    except TimeoutError:
+        # Drops the render if it is still queued; one already running finishes in the background.
+        future.cancel()
+        raise QRCodeTimeoutError(f'QR code was not rendered within {RENDER_TIMEOUT_SECONDS}s; retry shortly.')
+
+
+async def render_png_async(payload: str, scale: int = DEFAULT_SCALE, border: int = DEFAULT_BORDER) -> bytes:
+    """
+    Render a QR code as a PNG on the render worker pool so that encoding never blocks the event loop.
+
+    :param payload: Data encoded in the QR code.
+    :type payload: str
+    :param scale: Size of a single module in pixels.
+    :type scale: int
+    :param border: Width of the quiet zone around the code in modules.
+    :type border: int
+
+    :return: PNG image.
+    :rtype: bytes
+
+    :raise QRCodeTimeoutError: The QR code was not rendered within `RENDER_TIMEOUT_SECONDS`.
+    """
+    return await _render_async(render_png, payload, scale, border)
+
+
+async def _render_many_async[T](
+        render: Callable[..., T], payloads: Iterable[str], *options
+) -> AsyncIterator[tuple[str, T]]:
+    """
+    Render many QR codes in parallel on the render worker pool, yielding them in order as they finish. Only a couple of
+    renders per worker are in flight at a time, so memory stays flat however many codes there are.
+
+    :param render: Render function, which must be importable by the worker processes.
+    :type render: Callable[..., T]
+    :param payloads: Data encoded in each QR code.
+    :type payloads: Iterable[str]
+    :param options: Render options passed after the payload.
+
+    :return: Payload and rendered QR code pairs.
+    :rtype: AsyncIterator[tuple[str, T]]
+
+    :raise QRCodeTimeoutError: A QR code was not rendered within `RENDER_TIMEOUT_SECONDS`.
+    """
+    in_flight: deque[tuple[str, asyncio.Task[T]]] = deque()
+    window = 2 * max(_workers, 1)
+
+    try:
+        for payload in payloads:
+            in_flight.append((payload, asyncio.create_task(_render_async(render, payload, *options))))
+
+            if len(in_flight) >= window:
+                payload, task = in_flight.popleft()
+                yield payload, await task
+
+        while in_flight:
+            payload, task = in_flight.popleft()
+            yield payload, await task
+
+    finally:
+        # Stop rendering if the client went away before the last code was sent.
+        for _, task in in_flight:
+            task.cancel()
+
+
+async def stream_zip_async(payloads: Iterable[str], scale: int, border: int) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive of QR code PNGs named after their payloads, sending each PNG as soon as it is rendered. PNGs
+    are already compressed, so they are stored as-is.
+
+    :param payloads: Data encoded in each QR code.
+    :type payloads: Iterable[str]
+    :param scale: Size of a single module in pixels.
+    :type scale: int
+    :param border: Width of the quiet zone around each code in modules.
+    :type border: int
+
+    :return: Chunks of the ZIP archive.
+    :rtype: AsyncIterator[bytes]
+
+    :raise QRCodeTimeoutError: A QR code was not rendered within `RENDER_TIMEOUT_SECONDS`.
+    """
+    writer = _ChunkWriter()
+
+    # noinspection PyTypeChecker
+    with zipfile.ZipFile(writer, mode='w', compression=zipfile.ZIP_STORED) as zip_file:
+        async for payload, png in _render_many_async(render_png, payloads, scale, border):
+            zip_file.writestr(f'{payload}.png', png)
+            yield writer.take()
+
+    yield writer.take()
+
+
+def _svg_page(svgs: list[str]) -> str:
+    """
+    Lay out QR code SVGs on an A4 page in a grid of `SHEET_COLUMNS` columns and `SHEET_ROWS` rows of square cells
+    `SHEET_CELL_MILLIMETRES` wide, centred on the page.
+
+    :param svgs: SVG elements of at most a page of QR codes.
+    :type svgs: list[str]
+
+    :return: SVG document of the page.
+    :rtype: str
+    """
+    cell = SHEET_CELL_MILLIMETRES
+    width, height = SHEET_PAGE_MILLIMETRES
+    left, top = (width - SHEET_COLUMNS * cell) / 2, (height - SHEET_ROWS * cell) / 2
+
+    cells = [
+        svg.replace(
+            '<svg ',
+            f'<svg x="{left + (index % SHEET_COLUMNS) * cell:g}" y="{top + (index // SHEET_COLUMNS) * cell:g}" '
+            f'width="{cell}" height="{cell}" ', 1
+        )
+        for index, svg in enumerate(svgs)
+    ]
+
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}mm" height="{height}mm" viewBox="0 0 {width} {height}">'
+        f'{"".join(cells)}</svg>\n'
+    )
+
+
+async def stream_svg_pages_async(payloads: Iterable[str], border: int) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive of printable A4 SVG pages, each holding up to `SHEET_COLUMNS` × `SHEET_ROWS` QR codes, sending
+    each page as soon as its codes are rendered. Only one page is held in memory however many codes there are.
+
+    :param payloads: Data encoded in each QR code.
+    :type payloads: Iterable[str]
+    :param border: Width of the quiet zone around each code in modules.
+    :type border: int
+
+    :return: Chunks of the ZIP archive.
+    :rtype: AsyncIterator[bytes]
+
+    :raise QRCodeTimeoutError: A QR code was not rendered within `RENDER_TIMEOUT_SECONDS`.
+    """
+    writer = _ChunkWriter()
+    page: list[str] = []
+    pages = 0
+
+    # noinspection PyTypeChecker
+    with zipfile.ZipFile(writer, mode='w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+        async for _, svg in _render_many_async(render_svg, payloads, border):
+            page.append(svg)
+
+            if len(page) == SHEET_COLUMNS * SHEET_ROWS:
+                pages += 1
+                zip_file.writestr(f'page-{pages:04}.svg', _svg_page(page))
+                page = []
+                yield writer.take()
+
+        if page:
+            zip_file.writestr(f'page-{pages + 1:04}.svg', _svg_page(page))
+
+    yield writer.take()
+
+
+async def read_png_async(payload: str, scale: int = DEFAULT_SCALE, border: int = DEFAULT_BORDER) -> tuple[bytes, str]:
+    """
+    Read a QR code PNG from the caches, rendering it on the render worker pool and caching it if it is in neither.
+
+    :param payload: Data encoded in the QR code.
+    :type payload: str
+    :param scale: Size of a single module in pixels.
+    :type scale: int
+    :param border: Width of the quiet zone around the code in modules.
+    :type border: int
+
+    :return: PNG image and its strong entity tag, as read by `read_etag`.
+    :rtype: tuple[bytes, str]
+
+    :raise QRCodeTimeoutError: The QR code was not rendered within `RENDER_TIMEOUT_SECONDS`.
+    """
+    key = _cache_key(payload, scale, border)
+    return await _read_cached_async(key) or await _store_async(key, await render_png_async(payload, scale, border))
+
+
+def shutdown():
+    """Stop the render worker pool, if it was started, once the app shuts down."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def read_stats() -> dict[str, int]:
+    """
+    Get the size of the memory cache and its hit and miss counters.
+
+    :return: Cache statistics.
+    :rtype: dict[str, int]
+    """
+    return _memory_cache.stats()
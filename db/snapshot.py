@@ -0,0 +1,244 @@
+"""Export of offline gate snapshots of every user's pass and every pass's events, and of deltas between them."""
+import glob
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import dotenv
+import sqlalchemy
+from sqlalchemy.orm import Session
+
+from db.core import DBEvent, DBPass, DBPassEvent, DBUser
+from db.snapshot_reader import (
+    DELTA_MAGIC, FORMAT_VERSION, HEADER, ID_SIZE, NO_PASS, PASS_INDEX, SNAPSHOT_MAGIC, Snapshot, SnapshotFormatError,
+    pad_id
+)
+
+dotenv.load_dotenv()
+
+SNAPSHOT_DIR = os.getenv('GATE_SNAPSHOT_DIR')
+SNAPSHOT_HISTORY = int(os.getenv('GATE_SNAPSHOT_HISTORY', 24))
+
+_lock = threading.Lock()
+
+
+class SnapshotNotFoundError(Exception):
+    """Snapshot version that a delta was requested since is not stored, or is no longer stored."""
+
+
+class SnapshotStorageDisabledError(Exception):
+    """Deltas cannot be exported because no directory is configured to store the snapshots they are based on."""
+
+
+def _encode(
+        magic: bytes, version: int, base_version: int, user_passes: dict[str, Optional[str]],
+        deleted_user_ids: set[str], pass_events: dict[str, frozenset[str]], event_ids: set[str]
+) -> bytes:
+    """
+    Encode a snapshot or delta in the format read by `db.snapshot_reader`.
+
+    :param magic: Magic identifying a snapshot or a delta.
+    :type magic: bytes
+    :param version: Version of the snapshot, or of the snapshot that the delta brings its base up to.
+    :type version: int
+    :param base_version: Version of the snapshot that the delta applies to, or 0 for a snapshot.
+    :type base_version: int
+    :param user_passes: Pass ID, or None for no pass, per user ID.
+    :type user_passes: dict[str, Optional[str]]
+    :param deleted_user_ids: IDs of users deleted since the base version.
+    :type deleted_user_ids: set[str]
+    :param pass_events: Event IDs per pass ID, for every pass.
+    :type pass_events: dict[str, frozenset[str]]
+    :param event_ids: ID of every event.
+    :type event_ids: set[str]
+
+    :return: Encoded file.
+    :rtype: bytes
+
+    :raise SnapshotFormatError: There are too many passes to index, or an ID is too long.
+    """
+    pass_ids = sorted(pass_events)
+    event_ids = sorted(event_ids)
+
+    if len(pass_ids) >= NO_PASS:
+        raise SnapshotFormatError(f'Gate snapshots hold at most {NO_PASS - 1} passes.')
+
+    pass_indexes = {pass_id: index for index, pass_id in enumerate(pass_ids)}
+    event_indexes = {event_id: index for index, event_id in enumerate(event_ids)}
+    user_ids = sorted(user_passes)
+    row_size = (len(event_ids) + 7) // 8
+
+    bitsets = [sum(1 << event_indexes[event_id] for event_id in pass_events[pass_id]) for pass_id in pass_ids]
+    open_events = (1 << len(event_ids)) - 1
+
+    for bitset in bitsets:
+        open_events &= ~bitset
+
+    return b''.join((
+        HEADER.pack(
+            magic, FORMAT_VERSION, ID_SIZE, version, base_version, len(user_ids), len(deleted_user_ids), len(pass_ids),
+            len(event_ids)
+        ),
+        b''.join(pad_id(user_id) for user_id in user_ids),
+        b''.join(
+            PASS_INDEX.pack(NO_PASS if user_passes[user_id] is None else pass_indexes[user_passes[user_id]])
+            for user_id in user_ids
+        ),
+        b''.join(pad_id(user_id) for user_id in sorted(deleted_user_ids)),
+        b''.join(pad_id(pass_id) for pass_id in pass_ids),
+        b''.join(pad_id(event_id) for event_id in event_ids),
+        b''.join(bitset.to_bytes(row_size, 'little') for bitset in [*bitsets, open_events])
+    ))
+
+
+def _read_state_db(session: Session) -> tuple[dict[str, Optional[str]], dict[str, frozenset[str]], set[str]]:
+    """
+    Read every user's pass, every pass's events and every event from the DB.
+
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Pass ID per user ID, event IDs per pass ID and event IDs.
+    :rtype: tuple[dict[str, Optional[str]], dict[str, frozenset[str]], set[str]]
+    """
+    user_passes = {row.id: row.pass_id for row in session.execute(sqlalchemy.select(DBUser.id, DBUser.pass_id))}
+    pass_events: dict[str, set[str]] = {pass_id: set() for pass_id in session.scalars(sqlalchemy.select(DBPass.id))}
+
+    for row in session.execute(sqlalchemy.select(DBPassEvent.pass_id, DBPassEvent.event_id)):
+        pass_events[row.pass_id].add(row.event_id)
+
+    event_ids = set(session.scalars(sqlalchemy.select(DBEvent.id)))
+
+    return user_passes, {pass_id: frozenset(events) for pass_id, events in pass_events.items()}, event_ids
+
+
+def _read_stored_versions() -> list[int]:
+    """
+    Read the versions of the snapshots stored in `SNAPSHOT_DIR`.
+
+    :return: Stored versions, oldest first.
+    :rtype: list[int]
+    """
+    names = (os.path.basename(path) for path in glob.glob(os.path.join(glob.escape(SNAPSHOT_DIR), '*.snapshot')))
+    return sorted(int(name.removesuffix('.snapshot')) for name in names if name.removesuffix('.snapshot').isdigit())
+
+
+def _path(version: int) -> str:
+    return os.path.join(SNAPSHOT_DIR, f'{version}.snapshot')
+
+
+def _store(version: int, data: bytes):
+    """
+    Store a snapshot in `SNAPSHOT_DIR` so that deltas can later be exported since it, and remove all but the newest
+    `SNAPSHOT_HISTORY` snapshots. The file is renamed into place so that concurrent readers never see a partial one.
+
+    :param version: Version of the snapshot.
+    :type version: int
+    :param data: Encoded snapshot.
+    :type data: bytes
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix='.tmp')
+
+    with os.fdopen(file_descriptor, 'wb') as file:
+        file.write(data)
+
+    os.replace(temp_path, _path(version))
+
+    for old_version in _read_stored_versions()[:-SNAPSHOT_HISTORY]:
+        os.remove(_path(old_version))
+
+
+def _create_db(session: Session) -> tuple[int, bytes, dict[str, Optional[str]], dict[str, frozenset[str]], set[str]]:
+    """
+    Export a snapshot of the DB, storing it if `SNAPSHOT_DIR` is configured. If nothing has changed since the newest
+    stored snapshot, that snapshot and its version are reused, so gates polling for deltas do not churn the history.
+
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Version and contents of the snapshot, and the state it was encoded from.
+    :rtype: tuple[int, bytes, dict[str, Optional[str]], dict[str, frozenset[str]], set[str]]
+    """
+    user_passes, pass_events, event_ids = _read_state_db(session)
+    # Versions are UNIX times in milliseconds, so they keep increasing across restarts.
+    version = int(time.time() * 1000)
+
+    if SNAPSHOT_DIR is None:
+        data = _encode(SNAPSHOT_MAGIC, version, 0, user_passes, set(), pass_events, event_ids)
+        return version, data, user_passes, pass_events, event_ids
+
+    with _lock:
+        stored_versions = _read_stored_versions()
+
+        if len(stored_versions) > 0:
+            latest_version = stored_versions[-1]
+            data = _encode(SNAPSHOT_MAGIC, latest_version, 0, user_passes, set(), pass_events, event_ids)
+
+            with open(_path(latest_version), 'rb') as file:
+                if file.read() == data:
+                    return latest_version, data, user_passes, pass_events, event_ids
+
+            version = max(version, latest_version + 1)
+
+        data = _encode(SNAPSHOT_MAGIC, version, 0, user_passes, set(), pass_events, event_ids)
+        _store(version, data)
+
+    return version, data, user_passes, pass_events, event_ids
+
+
+def create_db(session: Session) -> tuple[int, bytes]:
+    """
+    Export a snapshot of every user's pass and every pass's events for gates to admit users offline.
+
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Version and contents of the snapshot.
+    :rtype: tuple[int, bytes]
+
+    :raise SnapshotFormatError: There are too many passes to index, or an ID is too long.
+    """
+    version, data, *_ = _create_db(session)
+    return version, data
+
+
+def create_delta_db(since: int, session: Session) -> tuple[int, bytes]:
+    """
+    Export a delta that brings a stored snapshot up to date with the DB. It holds only the users who were created,
+    changed or deleted since, and the full pass and event sections.
+
+    :param since: Version of the snapshot that the gate holds.
+    :type since: int
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Version that the delta brings the snapshot up to, and contents of the delta.
+    :rtype: tuple[int, bytes]
+
+    :raise SnapshotNotFoundError: Snapshot version is not stored, so the gate needs a full snapshot.
+    :raise SnapshotStorageDisabledError: `GATE_SNAPSHOT_DIR` is not set.
+    :raise SnapshotFormatError: There are too many passes to index, or an ID is too long.
+    """
+    if SNAPSHOT_DIR is None:
+        raise SnapshotStorageDisabledError('Gate snapshot deltas are disabled because GATE_SNAPSHOT_DIR is not set.')
+
+    try:
+        base = Snapshot(_path(since))
+
+    except FileNotFoundError:
+        raise SnapshotNotFoundError(f'Gate snapshot with version {since} not found.')
+
+    with base:
+        base_user_passes = base.read_user_passes()
+
+    version, _, user_passes, pass_events, event_ids = _create_db(session)
+    changed_user_passes = {
+        user_id: pass_id for user_id, pass_id in user_passes.items()
+        if user_id not in base_user_passes or base_user_passes[user_id] != pass_id
+    }
+    deleted_user_ids = base_user_passes.keys() - user_passes.keys()
+
+    return version, _encode(DELTA_MAGIC, version, since, changed_user_passes, deleted_user_ids, pass_events, event_ids)
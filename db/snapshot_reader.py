@@ -0,0 +1,282 @@
+"""
+Reader for offline gate snapshots, which answers admission checks from a memory-mapped file without the DB or the
+network. It only depends on the standard library, so gate devices can run this module on its own.
+
+A snapshot is a little-endian binary file made of a header followed by these sections:
+
+1. User IDs, sorted and NUL-padded to `ID_SIZE` bytes each.
+2. Index of each user's pass in the pass IDs section, as an unsigned 16-bit integer, or `NO_PASS`.
+3. IDs of deleted users, sorted and NUL-padded; always empty in a snapshot.
+4. Pass IDs, sorted and NUL-padded.
+5. Event IDs, sorted and NUL-padded.
+6. One bitset of `ceil(events / 8)` bytes per pass, with bit `i` set if the pass grants access to event `i`, followed by
+   one more bitset of the events that no pass is associated with, which are open to everyone.
+
+A delta has the same layout, with only the users who were created, changed or deleted since its base snapshot version.
+"""
+import bisect
+import mmap
+import struct
+from typing import Iterator, Optional
+
+SNAPSHOT_MAGIC = b'FESTSNAP'
+DELTA_MAGIC = b'FESTDLTA'
+FORMAT_VERSION = 1
+ID_SIZE = 22
+NO_PASS = 0xFFFF
+
+# Magic, format version, ID size, version, base version, users, deleted users, passes and events.
+HEADER = struct.Struct('<8sHHQQIIII')
+PASS_INDEX = struct.Struct('<H')
+
+
+class SnapshotFormatError(Exception):
+    """File is not a supported gate snapshot or delta, or a delta does not apply to the snapshot."""
+
+
+def pad_id(id_: str) -> bytes:
+    """
+    Encode an ID as a fixed-width field of a snapshot.
+
+    :param id_: ID to encode.
+    :type id_: str
+
+    :return: ID NUL-padded to `ID_SIZE` bytes.
+    :rtype: bytes
+
+    :raise SnapshotFormatError: ID is longer than `ID_SIZE` bytes.
+    """
+    encoded = id_.encode()
+
+    if len(encoded) > ID_SIZE:
+        raise SnapshotFormatError(f'ID {id_} is longer than {ID_SIZE} bytes.')
+
+    return encoded.ljust(ID_SIZE, b'\0')
+
+
+class _IDArray:
+    """Sorted section of fixed-width IDs, binary searched where it lies in the file."""
+
+    def __init__(self, buffer: bytes | mmap.mmap, offset: int, count: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self._offset + index * ID_SIZE
+        return self._buffer[start:start + ID_SIZE]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.decode(index) for index in range(self._count))
+
+    def decode(self, index: int) -> str:
+        return self[index].rstrip(b'\0').decode()
+
+    def find(self, id_: str) -> Optional[int]:
+        key = id_.encode().ljust(ID_SIZE, b'\0')
+        index = bisect.bisect_left(self, key)
+        return index if index < self._count and self[index] == key else None
+
+
+class _Sections:
+    """Sections of a snapshot or delta, with the user sections left in the file and the small ones decoded."""
+
+    def __init__(self, buffer: bytes | mmap.mmap, magic: bytes):
+        if len(buffer) < HEADER.size:
+            raise SnapshotFormatError('File is too short to be a gate snapshot.')
+
+        magic_, format_version, id_size, self.version, self.base_version, users, deleted_users, passes, events = (
+            HEADER.unpack_from(buffer)
+        )
+
+        if magic_ != magic or format_version != FORMAT_VERSION or id_size != ID_SIZE:
+            raise SnapshotFormatError('File is not a supported gate snapshot.')
+
+        offset = HEADER.size
+        self._buffer = buffer
+        self.user_ids = _IDArray(buffer, offset, users)
+        offset += users * ID_SIZE
+        self._user_passes_offset = offset
+        offset += users * PASS_INDEX.size
+        self.deleted_user_ids = _IDArray(buffer, offset, deleted_users)
+        offset += deleted_users * ID_SIZE
+        pass_ids = _IDArray(buffer, offset, passes)
+        offset += passes * ID_SIZE
+        event_ids = _IDArray(buffer, offset, events)
+        bitsets_offset = offset + events * ID_SIZE
+        row_size = (events + 7) // 8
+
+        if bitsets_offset + (passes + 1) * row_size != len(buffer):
+            raise SnapshotFormatError('File is truncated or has trailing data.')
+
+        bitsets = [
+            int.from_bytes(buffer[bitsets_offset + row * row_size:bitsets_offset + (row + 1) * row_size], 'little')
+            for row in range(passes + 1)
+        ]
+
+        self.pass_ids = list(pass_ids)
+        self.event_indexes = {event_id: index for index, event_id in enumerate(event_ids)}
+        self.pass_events = dict(zip(self.pass_ids, bitsets))
+        self.open_events = bitsets[passes]
+
+    def read_user_pass(self, index: int) -> Optional[str]:
+        (pass_index,) = PASS_INDEX.unpack_from(self._buffer, self._user_passes_offset + index * PASS_INDEX.size)
+        return None if pass_index == NO_PASS else self.pass_ids[pass_index]
+
+
+class Snapshot:
+    """
+    Gate snapshot mapped into memory, with any deltas applied on top of it. The user sections are binary searched in
+    place, so opening a snapshot takes time proportional to the number of passes and events, not users.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path of the snapshot file.
+        :type path: str
+
+        :raise SnapshotFormatError: File is not a supported gate snapshot.
+        """
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._base = _Sections(self._mmap, SNAPSHOT_MAGIC)
+
+        except SnapshotFormatError:
+            self._mmap.close()
+            raise
+
+        self.version: int = self._base.version
+        self._event_indexes = self._base.event_indexes
+        self._pass_events = self._base.pass_events
+        self._open_events = self._base.open_events
+        self._changed_user_passes: dict[str, Optional[str]] = {}
+        self._deleted_user_ids: set[str] = set()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """Unmap the snapshot file."""
+        self._mmap.close()
+
+    def apply(self, delta: bytes):
+        """
+        Apply a delta to the snapshot, bringing it up to the delta's version.
+
+        :param delta: Contents of a delta file whose base version is the snapshot's current version.
+        :type delta: bytes
+
+        :raise SnapshotFormatError: Delta is not a supported gate snapshot delta or has a different base version.
+        """
+        sections = _Sections(delta, DELTA_MAGIC)
+
+        if sections.base_version != self.version:
+            raise SnapshotFormatError(
+                f'Delta applies to version {sections.base_version}, but the snapshot is at version {self.version}.'
+            )
+
+        for index, user_id in enumerate(sections.user_ids):
+            self._changed_user_passes[user_id] = sections.read_user_pass(index)
+            self._deleted_user_ids.discard(user_id)
+
+        for user_id in sections.deleted_user_ids:
+            self._changed_user_passes.pop(user_id, None)
+            self._deleted_user_ids.add(user_id)
+
+        self.version = sections.version
+        self._event_indexes = sections.event_indexes
+        self._pass_events = sections.pass_events
+        self._open_events = sections.open_events
+
+    def read_user_pass(self, user_id: str) -> Optional[str]:
+        """
+        Read a user's pass.
+
+        :param user_id: ID of the user whose pass is to be read.
+        :type user_id: str
+
+        :return: User pass ID, if the user has a pass, else None.
+        :rtype: Optional[str]
+
+        :raise KeyError: User is not in the snapshot.
+        """
+        if user_id in self._changed_user_passes:
+            return self._changed_user_passes[user_id]
+
+        index = None if user_id in self._deleted_user_ids else self._base.user_ids.find(user_id)
+
+        if index is None:
+            raise KeyError(user_id)
+
+        return self._base.read_user_pass(index)
+
+    def read_user_passes(self) -> dict[str, Optional[str]]:
+        """
+        Read every user's pass.
+
+        :return: User pass ID, or None for no pass, per user ID.
+        :rtype: dict[str, Optional[str]]
+        """
+        user_passes = {
+            user_id: self._base.read_user_pass(index) for index, user_id in enumerate(self._base.user_ids)
+            if user_id not in self._deleted_user_ids
+        }
+        user_passes.update(self._changed_user_passes)
+
+        return user_passes
+
+    def read_pass_events(self) -> dict[str, frozenset[str]]:
+        """
+        Read the events that each pass grants access to.
+
+        :return: Event IDs per pass ID.
+        :rtype: dict[str, frozenset[str]]
+        """
+        return {
+            pass_id: frozenset(event_id for event_id, index in self._event_indexes.items() if bitset >> index & 1)
+            for pass_id, bitset in self._pass_events.items()
+        }
+
+    def read_event_ids(self) -> frozenset[str]:
+        """
+        Read every event's ID.
+
+        :return: Event IDs.
+        :rtype: frozenset[str]
+        """
+        return frozenset(self._event_indexes)
+
+    def can_access(self, user_id: str, event_id: str) -> bool:
+        """
+        Check whether a user may enter an event, with the same rules as the API: events that no pass is associated with
+        are open to everyone.
+
+        :param user_id: ID of the user to check.
+        :type user_id: str
+        :param event_id: ID of the event to check against.
+        :type event_id: str
+
+        :return: True if the user may enter the event, else False, including for unknown users and events.
+        :rtype: bool
+        """
+        event_index = self._event_indexes.get(event_id)
+
+        if event_index is None:
+            return False
+
+        try:
+            pass_id = self.read_user_pass(user_id)
+
+        except KeyError:
+            return False
+
+        event_bit = 1 << event_index
+        return bool(self._open_events & event_bit or self._pass_events.get(pass_id, 0) & event_bit)
@@ -1,9 +1,10 @@
 """Fest support ticket and mapping."""
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import AsyncIterator, Optional, Sequence, Type
 
 import sqlalchemy
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from db import operations
@@ -167,3 +168,132 @@ def delete_db(support_ticket_id: str, session: Session) -> DBSupportTicket:
     :raise DBNotFoundError: Support ticket does not exist.
     """
     return operations.delete_db(support_ticket_id, read_db, session)
+
+
+async def read_db_async(support_ticket_id: str, session: AsyncSession) -> DBSupportTicket:
+    """
+    Read a support ticket from the DB via its primary key without blocking the event loop.
+
+    :param support_ticket_id: ID of the support ticket to read.
+    :type support_ticket_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Support ticket DB instance.
+    :rtype: DBSupportTicket
+
+    :raise DBNotFoundError: Support ticket does not exist.
+    """
+    db_support_ticket: Optional[DBSupportTicket] = await session.get(DBSupportTicket, support_ticket_id)
+
+    if db_support_ticket is None:
+        raise DBNotFoundError(f'Support ticket with ID {support_ticket_id} not found.')
+
+    return db_support_ticket
+
+
+async def read_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession
+) -> tuple[Sequence[DBSupportTicket], Optional[str]]:
+    """
+    Read a page of support tickets from the DB ordered by primary key without blocking the event loop.
+
+    :param limit: Maximum number of support tickets in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Support ticket DB instances in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[Sequence[DBSupportTicket], Optional[str]]
+    """
+    return await operations.read_page_db_async(DBSupportTicket, limit, cursor, session)
+
+
+async def read_models_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession, model: Type[BaseModel] = SupportTicket
+) -> tuple[list[BaseModel], Optional[str]]:
+    """
+    Read a page of support tickets from the DB ordered by primary key straight into models, without hydrating ORM
+    instances or blocking the event loop; for read-only use.
+
+    :param limit: Maximum number of support tickets in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+    :param model: `SupportTicket`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the support tickets in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[list[BaseModel], Optional[str]]
+    """
+    return await operations.read_models_page_db_async(DBSupportTicket, model, limit, cursor, session)
+
+
+def stream_all_db_async(session: AsyncSession) -> AsyncIterator[DBSupportTicket]:
+    """
+    Stream all support tickets from the DB through a server-side cursor without blocking the event loop.
+
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Support ticket DB instances, one at a time.
+    :rtype: AsyncIterator[DBSupportTicket]
+    """
+    return operations.stream_all_db_async(DBSupportTicket, session)
+
+
+async def create_db_async(support_ticket: SupportTicketCreate, session: AsyncSession) -> DBSupportTicket:
+    """
+    Create a new support ticket in the DB without blocking the event loop.
+
+    :param support_ticket: Support ticket to create.
+    :type support_ticket: SupportTicketCreate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: New support ticket DB instance.
+    :rtype: DBSupportTicket
+    """
+    return await operations.create_db_async(support_ticket, DBSupportTicket, session)
+
+
+async def update_db_async(
+        support_ticket_id: str, support_ticket: SupportTicketUpdate, session: AsyncSession
+) -> DBSupportTicket:
+    """
+    Update an existing support ticket in the DB without blocking the event loop.
+
+    :param support_ticket_id: ID of the support ticket to update.
+    :type support_ticket_id: str
+    :param support_ticket: Support ticket to update.
+    :type support_ticket: SupportTicketUpdate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Updated support ticket DB instance.
+    :rtype: DBSupportTicket
+
+    :raise DBNotFoundError: Support ticket does not exist.
+    """
+    return await operations.update_db_async(support_ticket_id, support_ticket, read_db_async, session)
+
+
+async def delete_db_async(support_ticket_id: str, session: AsyncSession) -> DBSupportTicket:
+    """
+    Delete an existing support ticket from the DB without blocking the event loop.
+
+    :param support_ticket_id: ID of the support ticket to delete.
+    :type support_ticket_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Deleted support ticket DB instance.
+    :rtype: DBSupportTicket
+
+    :raise DBNotFoundError: Support ticket does not exist.
+    """
+    return await operations.delete_db_async(support_ticket_id, read_db_async, session)
@@ -1,11 +1,12 @@
 """Fest team and mapping."""
-from typing import Optional, Sequence
+from typing import AsyncIterator, Optional, Sequence, Type
 
 import sqlalchemy
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db import operations
+from db import bloom, operations
 from db.core import DBTeam, DBNotFoundError
 
 
@@ -47,6 +48,9 @@ def read_db(team_id: str, session: Session) -> DBTeam:
 
     :raise DBNotFoundError: Team does not exist.
     """
+    if not bloom.teams.might_exist(team_id, session):
+        raise DBNotFoundError(f'Team with ID {team_id} not found.')
+
     db_team: Optional[DBTeam] = session.get(DBTeam, team_id)
 
     if db_team is None:
@@ -71,6 +75,26 @@ def read_by_ids_db(team_ids: Sequence[str], session: Session) -> Sequence[DBTeam
     return session.scalars(query).all()
 
 
+def read_models_by_ids_db(
+        team_ids: Sequence[str], session: Session, model: Type[BaseModel] = Team
+) -> list[BaseModel]:
+    """
+    Read teams from the DB via their primary keys straight into models, without hydrating ORM instances; for
+    read-only use.
+
+    :param team_ids: IDs of the teams to be read.
+    :type team_ids: Sequence[str]
+    :param session: Current DB session.
+    :type session: Session
+    :param model: `Team`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the teams.
+    :rtype: list[BaseModel]
+    """
+    return operations.read_models_by_ids_db(team_ids, DBTeam, model, session)
+
+
 def read_all_db(session: Session) -> list[DBTeam]:
     """
     Read all teams from the DB.
@@ -97,7 +121,10 @@ def create_db(team: TeamCreate, session: Session) -> DBTeam:
     :return: New team DB instance.
     :rtype: DBTeam
     """
-    return operations.create_db(team, DBTeam, session)
+    db_team = operations.create_db(team, DBTeam, session)
+    bloom.teams.add(db_team.id)
+
+    return db_team
 
 
 def update_db(team_id: str, team: TeamUpdate, session: Session) -> DBTeam:
@@ -134,3 +161,136 @@ def delete_db(team_id: str, session: Session) -> DBTeam:
     :raise DBNotFoundError: Team does not exist.
     """
     return operations.delete_db(team_id, read_db, session)
+
+
+async def read_db_async(team_id: str, session: AsyncSession) -> DBTeam:
+    """
+    Read a team from the DB via its primary key without blocking the event loop.
+
+    :param team_id: ID of the team to read.
+    :type team_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Team DB instance.
+    :rtype: DBTeam
+
+    :raise DBNotFoundError: Team does not exist.
+    """
+    if not await bloom.teams.might_exist_async(team_id, session):
+        raise DBNotFoundError(f'Team with ID {team_id} not found.')
+
+    db_team: Optional[DBTeam] = await session.get(DBTeam, team_id)
+
+    if db_team is None:
+        raise DBNotFoundError(f'Team with ID {team_id} not found.')
+
+    return db_team
+
+
+async def read_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession
+) -> tuple[Sequence[DBTeam], Optional[str]]:
+    """
+    Read a page of teams from the DB ordered by primary key without blocking the event loop.
+
+    :param limit: Maximum number of teams in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Team DB instances in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[Sequence[DBTeam], Optional[str]]
+    """
+    return await operations.read_page_db_async(DBTeam, limit, cursor, session)
+
+
+async def read_models_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession, model: Type[BaseModel] = Team
+) -> tuple[list[BaseModel], Optional[str]]:
+    """
+    Read a page of teams from the DB ordered by primary key straight into models, without hydrating ORM instances or
+    blocking the event loop; for read-only use.
+
+    :param limit: Maximum number of teams in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+    :param model: `Team`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the teams in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[list[BaseModel], Optional[str]]
+    """
+    return await operations.read_models_page_db_async(DBTeam, model, limit, cursor, session)
+
+
+def stream_all_db_async(session: AsyncSession) -> AsyncIterator[DBTeam]:
+    """
+    Stream all teams from the DB through a server-side cursor without blocking the event loop.
+
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Team DB instances, one at a time.
+    :rtype: AsyncIterator[DBTeam]
+    """
+    return operations.stream_all_db_async(DBTeam, session)
+
+
+async def create_db_async(team: TeamCreate, session: AsyncSession) -> DBTeam:
+    """
+    Create a new team in the DB without blocking the event loop.
+
+    :param team: Team to create.
+    :type team: TeamCreate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: New team DB instance.
+    :rtype: DBTeam
+    """
+    db_team = await operations.create_db_async(team, DBTeam, session)
+    bloom.teams.add(db_team.id)
+
+    return db_team
+
+
+async def update_db_async(team_id: str, team: TeamUpdate, session: AsyncSession) -> DBTeam:
+    """
+    Update an existing team in the DB without blocking the event loop.
+
+    :param team_id: ID of the team to update.
+    :type team_id: str
+    :param team: Team to update.
+    :type team: TeamUpdate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Updated team DB instance.
+    :rtype: DBTeam
+
+    :raise DBNotFoundError: Team does not exist.
+    """
+    return await operations.update_db_async(team_id, team, read_db_async, session)
+
+
+async def delete_db_async(team_id: str, session: AsyncSession) -> DBTeam:
+    """
+    Delete an existing team from the DB without blocking the event loop.
+
+    :param team_id: ID of the team to delete.
+    :type team_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: Deleted team DB instance.
+    :rtype: DBTeam
+
+    :raise DBNotFoundError: Team does not exist.
+    """
+    return await operations.delete_db_async(team_id, read_db_async, session)
@@ -0,0 +1,206 @@
+"""Signed QR code payloads that gates can verify without a DB lookup."""
+import base64
+import hashlib
+import hmac
+import os
+import time
+from typing import Optional
+
+import dotenv
+import sqlalchemy
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from db import access_index, admission
+from db.core import DBNotFoundError, DBUser
+
+dotenv.load_dotenv()
+
+PREFIX = 'FEST1'
+TTL_SECONDS = int(os.getenv('QR_CODE_SIGNED_TTL', 24 * 60 * 60))
+
+# Expiries are rounded up to the hour so that a user's signed payload, and so its rendered QR code, is stable for an
+# hour at a time and can be cached.
+_EXPIRY_GRANULARITY_SECONDS = 60 * 60
+_SIGNATURE_BYTES = 16
+
+
+class TicketInvalidError(Exception):
+    """Signed payload is malformed, has been tampered with or has expired."""
+
+
+class TicketSigningDisabledError(Exception):
+    """Signed payloads cannot be issued or verified because no signing key is configured."""
+
+
+class Ticket(BaseModel):
+    """Contents of a signed QR code payload."""
+    user_id: str
+    pass_id: Optional[str]
+    version: str
+    expires_at: int
+
+
+class TicketVerification(BaseModel):
+    """Outcome of verifying a signed QR code payload for an event."""
+    user_id: str
+    allowed: bool
+
+
+def _read_key() -> bytes:
+    """
+    Read the signing key shared by the API and the gate devices.
+
+    :return: Signing key.
+    :rtype: bytes
+
+    :raise TicketSigningDisabledError: The `QR_CODE_SIGNING_KEY` environment variable is not set.
+    """
+    key = os.getenv('QR_CODE_SIGNING_KEY')
+
+    if not key:
+        raise TicketSigningDisabledError('Signed QR codes are disabled because QR_CODE_SIGNING_KEY is not set.')
+
+    return key.encode()
+
+
+def _sign(message: str, key: bytes) -> str:
+    """
+    Sign a message with a truncated HMAC-SHA256, encoded so that it fits compactly in a QR code.
+
+    :param message: Message to sign.
+    :type message: str
+    :param key: Signing key.
+    :type key: bytes
+
+    :return: URL-safe base 64 signature without padding.
+    :rtype: str
+    """
+    digest = hmac.new(key, message.encode(), hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+def sign(ticket: Ticket, key: bytes) -> str:
+    """
+    Encode a ticket as a signed payload of dot-separated fields: prefix, user ID, pass ID, access index version, expiry
+    and signature.
+
+    :param ticket: Ticket to sign.
+    :type ticket: Ticket
+    :param key: Signing key.
+    :type key: bytes
+
+    :return: Signed payload.
+    :rtype: str
+    """
+    message = f'{PREFIX}.{ticket.user_id}.{ticket.pass_id or ""}.{ticket.version}.{ticket.expires_at}'
+    return f'{message}.{_sign(message, key)}'
+
+
+def read(payload: str, key: bytes, now: Optional[float] = None) -> Ticket:
+    """
+    Decode a signed payload after checking its signature and expiry. Needs neither the DB nor the network, so gate
+    devices can run it offline.
+
+    :param payload: Signed payload read from a QR code.
+    :type payload: str
+    :param key: Signing key.
+    :type key: bytes
+    :param now: Current UNIX time, or None to use the system clock.
+    :type now: Optional[float]
+
+    :return: Decoded ticket.
+    :rtype: Ticket
+
+    :raise TicketInvalidError: Payload is malformed, its signature does not match or it has expired.
+    """
+    message, _, signature = payload.rpartition('.')
+    fields = message.split('.')
+
+    if len(fields) != 5 or fields[0] != PREFIX or not fields[4].isdigit():
+        raise TicketInvalidError('QR code is not a signed Fest-API payload.')
+
+    # Compared as bytes, as compare_digest rejects strings with non-ASCII characters.
+    if not hmac.compare_digest(signature.encode(), _sign(message, key).encode()):
+        raise TicketInvalidError('QR code signature is invalid.')
+
+    _, user_id, pass_id, version, expires_at = fields
+
+    if int(expires_at) <= (time.time() if now is None else now):
+        raise TicketInvalidError(f'QR code for user with ID {user_id} has expired.')
+
+    return Ticket(user_id=user_id, pass_id=pass_id or None, version=version, expires_at=int(expires_at))
+
+
+def _read_user_pass_db(user_id: str, session: Session) -> Optional[str]:
+    """
+    Read a user's pass from the DB via its primary key, telling a user without a pass apart from a missing user.
+
+    :param user_id: ID of the user whose pass is to be read.
+    :type user_id: str
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: User pass primary key, if the user has a pass, else None.
+    :rtype: Optional[str]
+
+    :raise DBNotFoundError: User does not exist.
+    """
+    query = sqlalchemy.select(DBUser.pass_id).where(DBUser.id == user_id)
+    db_user = session.execute(query).one_or_none()
+
+    if db_user is None:
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
+    return db_user.pass_id
+
+
+def create_db(user_id: str, session: Session) -> str:
+    """
+    Issue a signed payload for a user that binds their current pass to the current access index version.
+
+    :param user_id: ID of the user to issue the payload to.
+    :type user_id: str
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Signed payload.
+    :rtype: str
+
+    :raise DBNotFoundError: User does not exist.
+    :raise TicketSigningDisabledError: No signing key is configured.
+    """
+    key = _read_key()
+    pass_id = _read_user_pass_db(user_id, session)
+    expires_at = -(-int(time.time() + TTL_SECONDS) // _EXPIRY_GRANULARITY_SECONDS) * _EXPIRY_GRANULARITY_SECONDS
+
+    ticket = Ticket(user_id=user_id, pass_id=pass_id, version=access_index.read_version(session), expires_at=expires_at)
+    return sign(ticket, key)
+
+
+def verify_db(payload: str, event_id: str, session: Session) -> TicketVerification:
+    """
+    Verify whether a signed payload admits its user to an event. The pass in the payload may have been changed or
+    revoked since it was issued, so the user's current pass is read from the gate admission index instead, and the
+    decision is made in memory unless the user is not yet indexed.
+
+    :param payload: Signed payload read from a QR code.
+    :type payload: str
+    :param event_id: ID of the event to admit the user to.
+    :type event_id: str
+    :param session: Current DB session, used only if the event or user is not yet indexed.
+    :type session: Session
+
+    :return: ID of the user and whether their pass grants access to the event.
+    :rtype: TicketVerification
+
+    :raise DBNotFoundError: Event or the payload's user does not exist.
+    :raise TicketInvalidError: Payload is malformed, its signature does not match or it has expired.
+    :raise TicketSigningDisabledError: No signing key is configured.
+    """
+    admission.validate_event(event_id, session)
+
+    ticket = read(payload, _read_key())
+    pass_id = admission.read_user_pass(ticket.user_id, session)
+
+    return TicketVerification(user_id=ticket.user_id, allowed=access_index.can_access(pass_id, event_id, session))
@@ -1,14 +1,16 @@
 """Fest user and mapping."""
-from io import BytesIO
-from typing import Optional, Sequence
+from typing import AsyncIterator, Optional, Sequence, Type
 
-import segno
 import sqlalchemy
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db import operations
-from db.core import DBUser, DBNotFoundError, DBTeam, DBEvent
+from db import access_index, admission, bloom, cache, operations, qr_code
+from db.core import DBUser, DBNotFoundError, DBPass, DBTeam, DBTeamUser, DBEvent, DBUserEvent
+from db.event import Event
+from db.pass_ import Pass
+from db.team import Team
 
 
 class _UserBase(BaseModel):
@@ -33,6 +35,16 @@ class UserCreate(_UserBase):
     """User creation model."""
 
 
+class UserOverview(BaseModel):
+    """Everything about a user that the attendee app shows on launch."""
+    user: User
+    pass_: Optional[Pass] = Field(serialization_alias='pass')
+    organized_events: list[Event]
+    events: list[Event]
+    teams: list[Team]
+    hosted_teams: list[Team]
+
+
 class UserUpdate(_UserBase):
     """User update model."""
     first_name: Optional[str] = None
@@ -57,6 +69,9 @@ def read_db(user_id: str, session: Session) -> DBUser:
 
     :raise DBNotFoundError: User does not exist.
     """
+    if not bloom.users.might_exist(user_id, session):
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
     db_user: Optional[DBUser] = session.get(DBUser, user_id)
 
     if db_user is None:
@@ -81,6 +96,26 @@ def read_by_ids_db(user_ids: Sequence[str], session: Session) -> Sequence[DBUser
     return session.scalars(query).all()
 
 
+def read_models_by_ids_db(
+        user_ids: Sequence[str], session: Session, model: Type[BaseModel] = User
+) -> list[BaseModel]:
+    """
+    Read users from the DB via their primary keys straight into models, without hydrating ORM instances; for
+    read-only use.
+
+    :param user_ids: IDs of the users to be read.
+    :type user_ids: Sequence[str]
+    :param session: Current DB session.
+    :type session: Session
+    :param model: `User`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the users.
+    :rtype: list[BaseModel]
+    """
+    return operations.read_models_by_ids_db(user_ids, DBUser, model, session)
+
+
 def read_id_from_email_address_db(user_email_address: str, session: Session) -> Optional[str]:
     """
     Read a user's ID from the DB via their unique email address.
@@ -164,6 +199,9 @@ def read_pass_db(user_id: str, session: Session) -> Optional[str]:
 
     :raise DBNotFoundError: User does not exist.
     """
+    if not bloom.users.might_exist(user_id, session):
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
     query = sqlalchemy.select(DBUser.pass_id).where(DBUser.id == user_id)
     pass_id = session.scalar(query)
 
@@ -217,68 +255,287 @@ def create_db(user: UserCreate, session: Session) -> DBUser:
     :return: New user DB instance.
     :rtype: DBUser
     """
-    return operations.create_db(user, DBUser, session)
+    db_user = operations.create_db(user, DBUser, session)
+    bloom.users.add(db_user.id)
 
+    return db_user
 
-def create_qr_code(user_id: str, session: Session) -> BytesIO:
+
+def update_db(user_id: str, user: UserUpdate, session: Session) -> DBUser:
     """
-    Generate a QR code that contains the user's primary key.
+    Update an existing user in the DB.
 
-    :param user_id: ID of the user whose QR code is to be generated.
+    :param user_id: ID of the user to update.
     :type user_id: str
+    :param user: User to update.
+    :type user: UserUpdate
     :param session: Current DB session.
     :type session: Session
 
-    :return: Byte stream containing a QR code.
-    :rtype: BytesIO
+    :return: Updated user DB instance.
+    :rtype: DBUser
 
     :raise DBNotFoundError: User does not exist.
     """
-    db_user: Optional[DBUser] = session.get(DBUser, user_id)
+    db_user = operations.update_db(user_id, user, read_db, session)
+    admission.set_user_pass(user_id, db_user.pass_id)
+
+    return db_user
+
+
+def delete_db(user_id: str, session: Session) -> DBUser:
+    """
+    Delete an existing user in the DB.
+
+    :param user_id: ID of the user to delete.
+    :type user_id: str
+    :param session: Current DB session.
+    :type session: Session
+
+    :return: Deleted user DB instance.
+    :rtype: DBUser
+
+    :raise DBNotFoundError: User does not exist.
+    """
+    db_user = operations.delete_db(user_id, read_db, session)
+    # Deleting a user cascades to the events they organize and to those events' pass associations.
+    cache.catalog.clear()
+    access_index.invalidate()
+    admission.invalidate()
+
+    return db_user
+
+
+async def read_db_async(user_id: str, session: AsyncSession) -> DBUser:
+    """
+    Read a user from the DB via its primary key without blocking the event loop.
+
+    :param user_id: ID of the user to read.
+    :type user_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: User DB instance.
+    :rtype: DBUser
+
+    :raise DBNotFoundError: User does not exist.
+    """
+    if not await bloom.users.might_exist_async(user_id, session):
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
+    db_user: Optional[DBUser] = await session.get(DBUser, user_id)
 
     if db_user is None:
         raise DBNotFoundError(f'User with ID {user_id} not found.')
 
-    qr_code = segno.make_qr(user_id)
-    image_stream = BytesIO()
+    return db_user
 
-    qr_code.save(image_stream, kind='png')
-    image_stream.seek(0)
 
-    return image_stream
+async def validate_ids_db_async(user_ids: Sequence[str], session: AsyncSession):
+    """
+    Validate that every user exists in the DB in a single query without blocking the event loop.
 
+    :param user_ids: IDs of the users to be validated.
+    :type user_ids: Sequence[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
 
-def update_db(user_id: str, user: UserUpdate, session: Session) -> DBUser:
+    :raise DBNotFoundError: At least one user does not exist.
     """
-    Update an existing user in the DB.
+    query = sqlalchemy.select(DBUser.id).where(DBUser.id.in_(user_ids))
+    missing_user_ids = set(user_ids) - set((await session.scalars(query)).all())
+
+    if len(missing_user_ids) > 0:
+        raise DBNotFoundError(f'Users with IDs {", ".join(sorted(missing_user_ids))} not found.')
+
+
+async def read_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession
+) -> tuple[Sequence[DBUser], Optional[str]]:
+    """
+    Read a page of users from the DB ordered by primary key without blocking the event loop.
+
+    :param limit: Maximum number of users in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: User DB instances in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[Sequence[DBUser], Optional[str]]
+    """
+    return await operations.read_page_db_async(DBUser, limit, cursor, session)
+
+
+async def read_models_page_db_async(
+        limit: int, cursor: Optional[str], session: AsyncSession, model: Type[BaseModel] = User
+) -> tuple[list[BaseModel], Optional[str]]:
+    """
+    Read a page of users from the DB ordered by primary key straight into models, without hydrating ORM instances or
+    blocking the event loop; for read-only use.
+
+    :param limit: Maximum number of users in the page.
+    :type limit: int
+    :param cursor: Cursor returned with the previous page, or None for the first page.
+    :type cursor: Optional[str]
+    :param session: Current async DB session.
+    :type session: AsyncSession
+    :param model: `User`, or a model of a subset of its fields, whose columns are the only ones selected.
+    :type model: Type[BaseModel]
+
+    :return: Models of the users in the page and the next page's cursor, if there is one, else None.
+    :rtype: tuple[list[BaseModel], Optional[str]]
+    """
+    return await operations.read_models_page_db_async(DBUser, model, limit, cursor, session)
+
+
+def stream_all_db_async(session: AsyncSession) -> AsyncIterator[DBUser]:
+    """
+    Stream all users from the DB through a server-side cursor without blocking the event loop.
+
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: User DB instances, one at a time.
+    :rtype: AsyncIterator[DBUser]
+    """
+    return operations.stream_all_db_async(DBUser, session)
+
+
+async def create_db_async(user: UserCreate, session: AsyncSession) -> DBUser:
+    """
+    Create a new user in the DB without blocking the event loop.
+
+    :param user: User to create.
+    :type user: UserCreate
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: New user DB instance.
+    :rtype: DBUser
+    """
+    db_user = await operations.create_db_async(user, DBUser, session)
+    bloom.users.add(db_user.id)
+
+    return db_user
+
+
+async def update_db_async(user_id: str, user: UserUpdate, session: AsyncSession) -> DBUser:
+    """
+    Update an existing user in the DB without blocking the event loop.
 
     :param user_id: ID of the user to update.
     :type user_id: str
     :param user: User to update.
     :type user: UserUpdate
-    :param session: Current DB session.
-    :type session: Session
+    :param session: Current async DB session.
+    :type session: AsyncSession
 
     :return: Updated user DB instance.
     :rtype: DBUser
 
     :raise DBNotFoundError: User does not exist.
     """
-    return operations.update_db(user_id, user, read_db, session)
+    db_user = await operations.update_db_async(user_id, user, read_db_async, session)
+    admission.set_user_pass(user_id, db_user.pass_id)
 
+    return db_user
 
-def delete_db(user_id: str, session: Session) -> DBUser:
+
+async def delete_db_async(user_id: str, session: AsyncSession) -> DBUser:
     """
-    Delete an existing user in the DB.
+    Delete an existing user from the DB without blocking the event loop.
 
     :param user_id: ID of the user to delete.
     :type user_id: str
-    :param session: Current DB session.
-    :type session: Session
+    :param session: Current async DB session.
+    :type session: AsyncSession
 
     :return: Deleted user DB instance.
     :rtype: DBUser
 
     :raise DBNotFoundError: User does not exist.
     """
-    return operations.delete_db(user_id, read_db, session)
+    db_user = await operations.delete_db_async(user_id, read_db_async, session)
+    # Deleting a user cascades to the events they organize and to those events' pass associations.
+    cache.catalog.clear()
+    access_index.invalidate()
+    admission.invalidate()
+
+    return db_user
+
+
+async def create_qr_code_async(user_id: str, scale: int, border: int, session: AsyncSession) -> tuple[bytes, str]:
+    """
+    Generate a QR code that contains the user's primary key without blocking the event loop, rendering it on the
+    render worker pool only if it is not already cached.
+
+    :param user_id: ID of the user whose QR code is to be generated.
+    :type user_id: str
+    :param scale: Size of a single module in pixels.
+    :type scale: int
+    :param border: Width of the quiet zone around the code in modules.
+    :type border: int
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: PNG image of the QR code and its strong entity tag.
+    :rtype: tuple[bytes, str]
+
+    :raise DBNotFoundError: User does not exist.
+    :raise QRCodeTimeoutError: QR code was not rendered in time.
+    """
+    await read_db_async(user_id, session)
+    return await qr_code.read_png_async(user_id, scale, border)
+
+
+async def read_overview_db_async(user_id: str, session: AsyncSession) -> UserOverview:
+    """
+    Read a user with their pass, the events they organize or are registered for and the teams they are a member or host
+    of from the DB in three queries, without blocking the event loop.
+
+    :param user_id: ID of the user whose overview is to be read.
+    :type user_id: str
+    :param session: Current async DB session.
+    :type session: AsyncSession
+
+    :return: User overview.
+    :rtype: UserOverview
+
+    :raise DBNotFoundError: User does not exist.
+    """
+    if not await bloom.users.might_exist_async(user_id, session):
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
+    query = (
+        sqlalchemy.select(DBUser, DBPass).outerjoin(DBPass, DBUser.pass_id == DBPass.id).where(DBUser.id == user_id)
+    )
+    row = (await session.execute(query)).one_or_none()
+
+    if row is None:
+        raise DBNotFoundError(f'User with ID {user_id} not found.')
+
+    registered_event_ids = sqlalchemy.select(DBUserEvent.event_id).where(DBUserEvent.user_id == user_id)
+    organized, registered = DBEvent.organizer_id == user_id, DBEvent.id.in_(registered_event_ids)
+    query = (
+        sqlalchemy.select(DBEvent, organized.label('organized'), registered.label('registered'))
+        .where(sqlalchemy.or_(organized, registered)).order_by(DBEvent.id)
+    )
+    event_rows = (await session.execute(query)).all()
+
+    member_team_ids = sqlalchemy.select(DBTeamUser.team_id).where(DBTeamUser.user_id == user_id)
+    hosted, member = DBTeam.host_id == user_id, DBTeam.id.in_(member_team_ids)
+    query = (
+        sqlalchemy.select(DBTeam, hosted.label('hosted'), member.label('member'))
+        .where(sqlalchemy.or_(hosted, member)).order_by(DBTeam.id)
+    )
+    team_rows = (await session.execute(query)).all()
+
+    return UserOverview(
+        user=User.model_validate(row.DBUser), pass_=None if row.DBPass is None else Pass.model_validate(row.DBPass),
+        organized_events=[Event.model_validate(event_row.DBEvent) for event_row in event_rows if event_row.organized],
+        events=[Event.model_validate(event_row.DBEvent) for event_row in event_rows if event_row.registered],
+        teams=[Team.model_validate(team_row.DBTeam) for team_row in team_rows if team_row.member],
+        hosted_teams=[Team.model_validate(team_row.DBTeam) for team_row in team_rows if team_row.hosted]
+    )
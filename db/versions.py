@@ -0,0 +1,92 @@
+"""
+Per-table change versions, bumped by every write and served as strong entity tags for conditional reads.
+
+Versions live in this process only, so they are meant for a single worker. Behind several, each worker misses the
+others' writes until its tags roll over after `TTL_SECONDS`, and each issues different tags for the same data.
+"""
+import functools
+import os
+import secrets
+import threading
+import time
+
+import dotenv
+
+from db.core import DBBase
+
+dotenv.load_dotenv()
+
+TTL_SECONDS = float(os.getenv('ETAG_TTL', 60))
+
+_versions: dict[str, int] = {}
+# Versions only count this process's writes, so entity tags are scoped to it and change on restart.
+_epoch = secrets.token_hex(4)
+_lock = threading.Lock()
+
+
+@functools.cache
+def _read_cascades(table_name: str) -> frozenset[str]:
+    """
+    Read the tables whose rows are deleted along with a row of a table, through foreign keys that cascade on delete.
+
+    :param table_name: Name of the table that rows are deleted from.
+    :type table_name: str
+
+    :return: Names of the table and of every table that its deletes cascade to.
+    :rtype: frozenset[str]
+    """
+    table_names = {table_name}
+
+    for table in DBBase.metadata.sorted_tables:
+        if any(foreign_key.column.table.name in table_names and foreign_key.ondelete == 'CASCADE'
+               for foreign_key in table.foreign_keys):
+            table_names.add(table.name)
+
+    return frozenset(table_names)
+
+
+def bump(*table_names: str):
+    """
+    Bump the versions of tables once a write to them has been committed to the DB.
+
+    :param table_names: Names of the written tables.
+    :type table_names: str
+    """
+    with _lock:
+        for table_name in table_names:
+            _versions[table_name] = _versions.get(table_name, 0) + 1
+
+
+def bump_deleted(table_name: str):
+    """
+    Bump the versions of a table and of every table that its deletes cascade to, once a delete has been committed.
+
+    :param table_name: Name of the table that a row was deleted from.
+    :type table_name: str
+    """
+    bump(*_read_cascades(table_name))
+
+
+def read_etag(*table_names: str) -> str:
+    """
+    Read a strong entity tag for a representation built from tables, which changes whenever one of them is written.
+    Writes by other processes are not counted, so the tag also changes every `TTL_SECONDS` to bound how long they go
+    unnoticed.
+
+    :param table_names: Names of the tables that the representation is read from.
+    :type table_names: str
+
+    :return: Entity tag, including its quotes.
+    :rtype: str
+    """
+    window = int(time.time() // TTL_SECONDS)
+    return f'"{_epoch}-{window}-{"-".join(str(_versions.get(table_name, 0)) for table_name in table_names)}"'
+
+
+def reset():
+    """Forget every version and start a new epoch, so that no entity tag issued before matches again."""
+    global _epoch
+
+    with _lock:
+        _versions.clear()
+        _epoch = secrets.token_hex(4)
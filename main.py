@@ -1,16 +1,49 @@
+import contextlib
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Depends
 
+import router as router_core
 import security
-from router import event, pass_, support_ticket, team, user
+from db import access_index, admission, bloom, cache, check_in, core, executor, qr_code
+from db.core import DBBusyError
+from db.qr_code import QRCodeTimeoutError
+from router import event, gate, pass_, support_ticket, team, user
+
+
+@contextlib.asynccontextmanager
+async def lifespan(fast_api: FastAPI) -> AsyncIterator[None]:
+    get_db = contextlib.contextmanager(fast_api.dependency_overrides.get(core.get_db, core.get_db))
+
+    with get_db() as db:
+        access_index.load(db)
+        admission.load(db)
+        bloom.load(db)
+
+    check_in.start(get_db)
 
-app = FastAPI()
-app.include_router(event.router, dependencies=[Depends(security.verify_token)])
-app.include_router(pass_.router, dependencies=[Depends(security.verify_token)])
-app.include_router(support_ticket.router, dependencies=[Depends(security.verify_token)])
-app.include_router(team.router, dependencies=[Depends(security.verify_token)])
-app.include_router(user.router, dependencies=[Depends(security.verify_token)])
+    yield
+
+    check_in.stop()
+    qr_code.shutdown()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=router_core.PydanticJSONResponse)
+app.add_exception_handler(DBBusyError, router_core.service_unavailable_error)
+app.add_exception_handler(QRCodeTimeoutError, router_core.service_unavailable_error)
+app.include_router(event.router, dependencies=[Depends(security.verify_token), Depends(executor.admit)])
+app.include_router(gate.router, dependencies=[Depends(security.verify_token), Depends(executor.admit)])
+app.include_router(pass_.router, dependencies=[Depends(security.verify_token), Depends(executor.admit)])
+app.include_router(support_ticket.router, dependencies=[Depends(security.verify_token), Depends(executor.admit)])
+app.include_router(team.router, dependencies=[Depends(security.verify_token), Depends(executor.admit)])
+app.include_router(user.router, dependencies=[Depends(security.verify_token), Depends(executor.admit)])
 
 
 @app.get('/')
 def root():
     return {'message': 'Hello Fest-API!'}
+
+
+@app.get('/cache', dependencies=[Depends(security.verify_token)])
+def read_cache_stats():
+    return {'catalog': cache.catalog.stats(), 'qr_code': qr_code.read_stats(), 'bloom': bloom.read_stats()}
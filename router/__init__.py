@@ -1,7 +1,105 @@
 """Core router functions required in every route."""
-from starlette import status
+import functools
+import gzip
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Optional, Type
 
+import pydantic
+import pydantic_core
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
 from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from db import cache, executor, qr_code
+from db.qr_code import QRCodeSheetFormat
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+# Smaller bodies fit in a packet or two anyway, so compressing them is not worth the client's CPU.
+GZIP_MIN_SIZE = 1024
+
+
+class Page[T](BaseModel):
+    """Page of a list endpoint; pass `next_cursor` back as the `cursor` query parameter to get the next page."""
+    items: list[T]
+    next_cursor: Optional[str]
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response encoded by pydantic-core instead of the standard library's json module; the app's default."""
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+@functools.cache
+def _type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def model_response(content: Any, response_type: Any, headers: Optional[dict[str, str]] = None) -> Response:
+    """
+    Respond with DB instances or models validated once against a type and serialized straight to JSON bytes.
+    Returning a model from a route instead makes FastAPI dump it, validate it against the response model a second time
+    and encode it, so routes that return a `model_response` declare their schema with `response_model` instead.
+
+    :param content: DB instances or models to respond with, possibly nested in lists, dicts and pages.
+    :type content: Any
+    :param response_type: Type that the content is validated against and serialized as, e.g. `list[User]`.
+    :type response_type: Any
+    :param headers: Additional response headers.
+    :type headers: Optional[dict[str, str]]
+
+    :return: JSON response.
+    :rtype: Response
+    """
+    type_adapter = _type_adapter(response_type)
+    body = type_adapter.dump_json(type_adapter.validate_python(content, from_attributes=True), by_alias=True)
+    return Response(body, media_type='application/json', headers=headers)
+
+
+@functools.cache
+def _create_fields_model(model: Type[BaseModel], field_names: tuple[str, ...]) -> Type[BaseModel]:
+    return pydantic.create_model(
+        f'{model.__name__}Fields', __config__=model.model_config,
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in field_names}
+    )
+
+
+def fields_model(model: Type[BaseModel], fields: Optional[str]) -> Type[BaseModel]:
+    """
+    Read the model that a `fields` query parameter (a sparse fieldset) restricts a response to. Reads that select the
+    model's columns only select these fields' columns from the DB.
+
+    :param model: Model of the data-type.
+    :type model: Type[BaseModel]
+    :param fields: Comma-separated names of the fields to respond with, or None for every field.
+    :type fields: Optional[str]
+
+    :return: Model with only the requested fields, in the order that the data-type's model declares them, or the
+        data-type's model itself if no fields were requested.
+    :rtype: Type[BaseModel]
+
+    :raise HTTPException: HTTP 400 Bad Request if no field or an unknown field is requested.
+    """
+    if fields is None:
+        return model
+
+    field_names = {name.strip() for name in fields.split(',')} - {''}
+    unknown_field_names = field_names - model.model_fields.keys()
+
+    if len(field_names) == 0 or len(unknown_field_names) > 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Fields must be a comma-separated list of {", ".join(model.model_fields)}.'
+        )
+
+    return _create_fields_model(model, tuple(name for name in model.model_fields if name in field_names))
 
 
 def not_found_error(exception: Exception) -> HTTPException:
@@ -28,3 +126,199 @@ def validation_error(exception: Exception) -> HTTPException:
     :rtype: HTTPException
     """
     return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exception))
+
+
+def not_implemented_error(exception: Exception) -> HTTPException:
+    """
+    Generic exception for 501 Not Implemented, raised when an optional feature is not configured.
+
+    :param exception: Specific exception that occurred.
+    :type exception: Exception
+
+    :return: HTTP 501 Not Implemented exception enclosing the base exception.
+    :rtype: HTTPException
+    """
+    return HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exception))
+
+
+async def service_unavailable_error(_request: Request, exception: Exception) -> JSONResponse:
+    """
+    Generic exception handler for 503 Service Unavailable, raised when the DB or the QR code render workers are
+    saturated. The response carries a Retry-After header so that clients back off instead of piling on.
+
+    :param _request: Request during which the exception occurred.
+    :type _request: Request
+    :param exception: Specific exception that occurred.
+    :type exception: Exception
+
+    :return: HTTP 503 Service Unavailable response enclosing the base exception.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        content={'detail': str(exception)}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': str(executor.RETRY_AFTER_SECONDS)}
+    )
+
+
+def ndjson_requested(request: Request) -> bool:
+    """
+    Check whether the client asked for a newline-delimited JSON stream instead of a page.
+
+    :param request: Current request.
+    :type request: Request
+
+    :return: True if the Accept header includes the NDJSON media type, else False.
+    :rtype: bool
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
+
+
+def ndjson_response(db_items: AsyncIterator[Any], model: Type[BaseModel], session: AsyncSession) -> StreamingResponse:
+    """
+    Stream DB instances as newline-delimited JSON, one model per line, so that a full export never holds more than one
+    batch of rows in memory.
+
+    :param db_items: DB instances streamed from the DB session.
+    :type db_items: AsyncIterator[Any]
+    :param model: Model that each DB instance is serialized as.
+    :type model: Type[BaseModel]
+    :param session: DB session that the instances are streamed from; it is closed once the stream is exhausted.
+    :type session: AsyncSession
+
+    :return: Streaming NDJSON response.
+    :rtype: StreamingResponse
+    """
+    async def lines() -> AsyncIterator[str]:
+        # The session dependency has already been closed by the time the body streams, so close it again here to
+        # return the connection that streaming checked out.
+        try:
+            async for db_item in db_items:
+                yield model.model_validate(db_item).model_dump_json() + '\n'
+
+        finally:
+            await session.close()
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the client already has the representation with the given entity tag.
+
+    :param request: Current request.
+    :type request: Request
+    :param etag: Strong entity tag of the current representation, including its quotes.
+    :type etag: str
+
+    :return: True if the If-None-Match header lists the entity tag or is a wildcard, else False.
+    :rtype: bool
+    """
+    if_none_match = request.headers.get('if-none-match')
+
+    if if_none_match is None:
+        return False
+
+    return any(tag.strip() in (etag, f'W/{etag}', '*') for tag in if_none_match.split(','))
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    Generic response for 304 Not Modified, telling the client to reuse the representation that it already has.
+
+    :param etag: Strong entity tag of the current representation, including its quotes.
+    :type etag: str
+
+    :return: HTTP 304 Not Modified response without a body.
+    :rtype: Response
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+
+def gzip_accepted(request: Request) -> bool:
+    """
+    Check whether the client accepts gzip-encoded responses.
+
+    :param request: Current request.
+    :type request: Request
+
+    :return: True if the Accept-Encoding header lists gzip or a wildcard without a zero quality, else False.
+    :rtype: bool
+    """
+    for coding in request.headers.get('accept-encoding', '').split(','):
+        name, _, parameters = coding.partition(';')
+
+        if name.strip().lower() in ('gzip', '*') and parameters.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+            return True
+
+    return False
+
+
+async def cached_json_response(
+        request: Request, key: Hashable, loader: Callable[[], Awaitable[BaseModel]], etag: str
+) -> Response:
+    """
+    Respond with a model encoded as JSON, caching the encoded body, and a gzipped copy of large bodies, in the catalog
+    cache so that hits skip validation and serialization entirely. Answers 304 if the client has the current version.
+
+    :param request: Current request.
+    :type request: Request
+    :param key: Catalog cache key of the response, unique to the endpoint and its query.
+    :type key: Hashable
+    :param loader: Function that reads the model from the DB on a miss.
+    :type loader: Callable[[], Awaitable[BaseModel]]
+    :param etag: Strong entity tag of the current representation, including its quotes.
+    :type etag: str
+
+    :return: JSON response, possibly gzip-encoded, or HTTP 304 Not Modified response.
+    :rtype: Response
+    """
+    # The gzipped body is a different representation, so it needs a different strong entity tag.
+    gzip_etag = f'{etag[:-1]}-gzip"'
+
+    for matched_etag in (etag, gzip_etag):
+        if etag_matches(request, matched_etag):
+            return not_modified_response(matched_etag)
+
+    async def encode() -> tuple[bytes, Optional[bytes]]:
+        body = (await loader()).model_dump_json().encode()
+        return body, gzip.compress(body) if len(body) >= GZIP_MIN_SIZE else None
+
+    body, gzipped_body = await cache.catalog.get_or_load_async(('json', key), encode)
+    headers = {'ETag': etag, 'Vary': 'Accept-Encoding'}
+
+    if gzipped_body is not None and gzip_accepted(request):
+        headers = {'ETag': gzip_etag, 'Vary': 'Accept-Encoding', 'Content-Encoding': 'gzip'}
+        return Response(gzipped_body, media_type='application/json', headers=headers)
+
+    return Response(body, media_type='application/json', headers=headers)
+
+
+def qr_code_sheet_response(
+        user_ids: list[str], sheet_format: QRCodeSheetFormat, scale: int, border: int, file_name: str
+) -> StreamingResponse:
+    """
+    Stream the QR codes of many users as a ZIP archive of PNGs or of printable SVG pages, rendered in parallel.
+
+    :param user_ids: IDs of the users whose QR codes are to be rendered.
+    :type user_ids: list[str]
+    :param sheet_format: Format of the download.
+    :type sheet_format: QRCodeSheetFormat
+    :param scale: Size of a single module in pixels; only used for PNGs.
+    :type scale: int
+    :param border: Width of the quiet zone around each code in modules.
+    :type border: int
+    :param file_name: Name of the download without its extension.
+    :type file_name: str
+
+    :return: Streaming download response.
+    :rtype: StreamingResponse
+    """
+    if sheet_format == QRCodeSheetFormat.ZIP:
+        content = qr_code.stream_zip_async(user_ids, scale, border)
+    else:
+        content, file_name = qr_code.stream_svg_pages_async(user_ids, border), f'{file_name}-svg'
+
+    return StreamingResponse(
+        content, media_type='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{file_name}.zip"'}
+    )
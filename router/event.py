@@ -1,97 +1,126 @@
 """Route for all events at /event."""
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 import router as router_core
-from db import associations, core, event, pass_, team, user
-from db.core import DBNotFoundError, DBValidationError
+from db import associations, check_in, core, event, executor, pass_, qr_code, team, ticket, user, versions
+from db.check_in import CheckIn
+from db.core import DBEvent, DBNotFoundError, DBValidationError
 from db.event import EventCreate, Event, EventUpdate
 from db.pass_ import Pass
+from db.qr_code import QRCodeSheetFormat
 from db.team import Team
+from db.ticket import TicketInvalidError, TicketSigningDisabledError, TicketVerification
 from db.user import User
 
 router = APIRouter(prefix='/event', tags=['event'])
 
 
-@router.get('/')
-async def read_all_events(db: Session = Depends(core.get_db)) -> list[Event]:
-    db_events = event.read_all_db(db)
-    return [Event.model_validate(db_event) for db_event in db_events]
+@router.get('/', response_model=router_core.Page[Event])
+async def read_all_events(
+        request: Request, limit: int = Query(router_core.DEFAULT_PAGE_LIMIT, ge=1, le=router_core.MAX_PAGE_LIMIT),
+        cursor: Optional[str] = None, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(Event, fields)
+
+    if router_core.ndjson_requested(request):
+        return router_core.ndjson_response(event.stream_all_db_async(db), model, db)
+
+    async def load() -> router_core.Page:
+        items, next_cursor = await event.read_models_page_db_async(limit, cursor, db, model)
+        return router_core.Page[model](items=items, next_cursor=next_cursor)
+
+    etag = versions.read_etag(DBEvent.__tablename__)
+    return await router_core.cached_json_response(request, ('event-page', limit, cursor, model), load, etag)
 
 
 @router.post('/')
-async def create_event(event_create: EventCreate, db: Session = Depends(core.get_db)) -> Event:
-    db_event = event.create_db(event_create, db)
+async def create_event(event_create: EventCreate, db: AsyncSession = Depends(core.get_async_db)) -> Event:
+    db_event = await event.create_db_async(event_create, db)
     return Event.model_validate(db_event)
 
 
-@router.get('/{event_id}')
-async def read_event(event_id: str, db: Session = Depends(core.get_db)) -> Event:
+@router.get('/{event_id}', response_model=Event)
+async def read_event(
+        event_id: str, request: Request, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(Event, fields)
+    etag = versions.read_etag(DBEvent.__tablename__)
+
+    if router_core.etag_matches(request, etag):
+        return router_core.not_modified_response(etag)
+
     try:
-        db_event = event.read_db(event_id, db)
+        return router_core.model_response(await event.read_cached_async(event_id, db), model, {'ETag': etag})
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return Event.model_validate(db_event)
 
+@router.get('/{event_id}/passes', response_model=list[Pass])
+async def read_event_passes(
+        event_id: str, fields: Optional[str] = None, db: Session = Depends(core.get_db)
+) -> Response:
+    model = router_core.fields_model(Pass, fields)
 
-@router.get('/{event_id}/passes')
-async def read_event_passes(event_id: str, db: Session = Depends(core.get_db)) -> list[Pass]:
     try:
-        pass_ids = associations.read_event_passes_db(event_id, db)
-        db_passes = pass_.read_by_ids_db(pass_ids, db)
+        pass_ids = await executor.run(associations.read_event_passes_db, event_id, db)
+        passes = await executor.run(pass_.read_models_by_ids_db, pass_ids, db, model)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return [Pass.model_validate(db_pass) for db_pass in db_passes]
+    return router_core.model_response(passes, list[model])
 
 
 @router.post('/{event_id}/passes/{pass_id}')
 async def create_event_pass(event_id: str, pass_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.create_pass_event_db(pass_id, event_id, db)
+    try:
+        association_id = await executor.run(associations.create_pass_event_db, pass_id, event_id, db)
+
+    except DBValidationError as e:
+        raise router_core.validation_error(e)
+
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
 @router.delete('/{event_id}/passes/{pass_id}')
 async def delete_event_pass(event_id: str, pass_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.delete_pass_event_db(pass_id, event_id, db)
+    association_id = await executor.run(associations.delete_pass_event_db, pass_id, event_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
-@router.get('/{event_id}/teams')
-async def read_event_teams(event_id: str, db: Session = Depends(core.get_db)) -> list[Team]:
+@router.get('/{event_id}/teams', response_model=list[Team])
+async def read_event_teams(
+        event_id: str, fields: Optional[str] = None, db: Session = Depends(core.get_db)
+) -> Response:
+    model = router_core.fields_model(Team, fields)
+
     try:
-        team_ids = associations.read_event_teams_db(event_id, db)
-        db_teams = team.read_by_ids_db(team_ids, db)
+        team_ids = await executor.run(associations.read_event_teams_db, event_id, db)
+        teams = await executor.run(team.read_models_by_ids_db, team_ids, db, model)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return [Team.model_validate(db_team) for db_team in db_teams]
+    return router_core.model_response(teams, list[model])
 
 
-@router.get('/{event_id}/teams/users')
-async def read_event_teams_users(event_id: str, db: Session = Depends(core.get_db)) -> dict[str, list[User]]:
+@router.get('/{event_id}/teams/users', response_model=dict[str, list[User]])
+async def read_event_teams_users(event_id: str, db: Session = Depends(core.get_db)) -> Response:
     try:
-        team_ids = associations.read_event_teams_db(event_id, db)
-
-        result: dict[str, list[User]] = {}
-        for team_id in team_ids:
-            user_ids = associations.read_team_users_db(team_id, db)
-            db_users = user.read_by_ids_db(user_ids, db)
-
-            result[team_id] = [User.model_validate(db_user) for db_user in db_users]
+        db_teams_users = await executor.run(associations.read_event_teams_users_db, event_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return result
+    return router_core.model_response(db_teams_users, dict[str, list[User]])
 
 
 @router.post('/{event_id}/teams/{team_id}')
@@ -100,7 +129,9 @@ async def create_event_team(
         db: Session = Depends(core.get_db)
 ) -> JSONResponse:
     try:
-        association_id = associations.create_team_event_db(team_id, event_id, validate, validate_host_only, db)
+        association_id = await executor.run(
+            associations.create_team_event_db, team_id, event_id, validate, validate_host_only, db
+        )
 
     except DBValidationError as e:
         raise router_core.validation_error(e)
@@ -113,20 +144,67 @@ async def create_event_team(
 
 @router.delete('/{event_id}/teams/{team_id}')
 async def delete_event_team(event_id: str, team_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.delete_team_event_db(team_id, event_id, db)
+    association_id = await executor.run(associations.delete_team_event_db, team_id, event_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
-@router.get('/{event_id}/users')
-async def read_event_users(event_id: str, db: Session = Depends(core.get_db)) -> list[User]:
+@router.get('/{event_id}/users', response_model=list[User])
+async def read_event_users(
+        event_id: str, fields: Optional[str] = None, db: Session = Depends(core.get_db)
+) -> Response:
+    model = router_core.fields_model(User, fields)
+
+    try:
+        user_ids = await executor.run(associations.read_event_users_db, event_id, db)
+        users = await executor.run(user.read_models_by_ids_db, user_ids, db, model)
+
+    except DBNotFoundError as e:
+        raise router_core.not_found_error(e)
+
+    return router_core.model_response(users, list[model])
+
+
+@router.post('/{event_id}/check-in/{user_id}')
+async def create_event_check_in(event_id: str, user_id: str, db: Session = Depends(core.get_db)) -> CheckIn:
+    try:
+        return await executor.run(check_in.create_db, event_id, user_id, db)
+
+    except DBNotFoundError as e:
+        raise router_core.not_found_error(e)
+
+
+@router.post('/{event_id}/verify')
+async def verify_event_ticket(
+        event_id: str, payload: str = Body(embed=True), db: Session = Depends(core.get_db)
+) -> TicketVerification:
+    try:
+        return await executor.run(ticket.verify_db, payload, event_id, db)
+
+    except DBNotFoundError as e:
+        raise router_core.not_found_error(e)
+
+    except TicketInvalidError as e:
+        raise router_core.validation_error(e)
+
+    except TicketSigningDisabledError as e:
+        raise router_core.not_implemented_error(e)
+
+
+@router.get('/{event_id}/users/qr_codes')
+async def read_event_users_qr_codes(
+        event_id: str, sheet_format: QRCodeSheetFormat = Query(QRCodeSheetFormat.ZIP, alias='format'),
+        scale: int = Query(qr_code.DEFAULT_SCALE, ge=1, le=50),
+        border: int = Query(qr_code.DEFAULT_BORDER, ge=0, le=20),
+        db: Session = Depends(core.get_db)
+) -> StreamingResponse:
     try:
-        user_ids = associations.read_event_users_db(event_id, db)
-        db_users = user.read_by_ids_db(user_ids, db)
+        await executor.run(event.read_db, event_id, db)
+        user_ids = await executor.run(associations.read_event_attendees_db, event_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return [User.model_validate(db_user) for db_user in db_users]
+    return router_core.qr_code_sheet_response(list(user_ids), sheet_format, scale, border, f'event-{event_id}')
 
 
 @router.post('/{event_id}/users/{user_id}')
@@ -134,7 +212,7 @@ async def create_event_user(
         event_id: str, user_id: str, validate: bool = True, db: Session = Depends(core.get_db)
 ) -> JSONResponse:
     try:
-        association_id = associations.create_user_event_db(user_id, event_id, validate, db)
+        association_id = await executor.run(associations.create_user_event_db, user_id, event_id, validate, db)
 
     except DBValidationError as e:
         raise router_core.validation_error(e)
@@ -147,14 +225,16 @@ async def create_event_user(
 
 @router.delete('/{event_id}/users/{user_id}')
 async def delete_event_user(event_id: str, user_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.delete_user_event_db(user_id, event_id, db)
+    association_id = await executor.run(associations.delete_user_event_db, user_id, event_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
 @router.patch('/{event_id}')
-async def update_event(event_id: str, event_update: EventUpdate, db: Session = Depends(core.get_db)) -> Event:
+async def update_event(
+        event_id: str, event_update: EventUpdate, db: AsyncSession = Depends(core.get_async_db)
+) -> Event:
     try:
-        db_event = event.update_db(event_id, event_update, db)
+        db_event = await event.update_db_async(event_id, event_update, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -163,9 +243,9 @@ async def update_event(event_id: str, event_update: EventUpdate, db: Session = D
 
 
 @router.delete('/{event_id}')
-async def delete_event(event_id: str, db: Session = Depends(core.get_db)) -> Event:
+async def delete_event(event_id: str, db: AsyncSession = Depends(core.get_async_db)) -> Event:
     try:
-        db_event = event.delete_db(event_id, db)
+        db_event = await event.delete_db_async(event_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
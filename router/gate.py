@@ -0,0 +1,34 @@
+"""Route for offline gate snapshots at /gate."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+import router as router_core
+from db import core, executor, snapshot
+from db.snapshot import SnapshotNotFoundError, SnapshotStorageDisabledError
+
+router = APIRouter(prefix='/gate', tags=['gate'])
+
+
+@router.get('/snapshot')
+async def read_snapshot(since: Optional[int] = None, db: Session = Depends(core.get_db)) -> Response:
+    if since is None:
+        version, data = await executor.run(snapshot.create_db, db)
+        file_name = f'{version}.snapshot'
+
+    else:
+        try:
+            version, data = await executor.run(snapshot.create_delta_db, since, db)
+
+        except SnapshotNotFoundError as e:
+            raise router_core.not_found_error(e)
+
+        except SnapshotStorageDisabledError as e:
+            raise router_core.not_implemented_error(e)
+
+        file_name = f'{since}-{version}.delta'
+
+    headers = {'Content-Disposition': f'attachment; filename="{file_name}"', 'X-Snapshot-Version': str(version)}
+    return Response(data, media_type='application/octet-stream', headers=headers)
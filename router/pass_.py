@@ -1,69 +1,98 @@
 """Route for all passes at /pass."""
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
 import router as router_core
-from db import associations, core, event, pass_
-from db.core import DBNotFoundError
+from db import associations, core, executor, pass_, versions
+from db.core import DBEvent, DBNotFoundError, DBPass, DBPassEvent, DBValidationError
 from db.event import Event
 from db.pass_ import Pass, PassCreate, PassUpdate
 
 router = APIRouter(prefix='/pass', tags=['pass'])
 
 
-@router.get('/')
-async def read_all_passes(db: Session = Depends(core.get_db)) -> list[Pass]:
-    db_passes = pass_.read_all_db(db)
-    return [Pass.model_validate(db_pass) for db_pass in db_passes]
+@router.get('/', response_model=router_core.Page[Pass])
+async def read_all_passes(
+        request: Request, limit: int = Query(router_core.DEFAULT_PAGE_LIMIT, ge=1, le=router_core.MAX_PAGE_LIMIT),
+        cursor: Optional[str] = None, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(Pass, fields)
+
+    if router_core.ndjson_requested(request):
+        return router_core.ndjson_response(pass_.stream_all_db_async(db), model, db)
+
+    async def load() -> router_core.Page:
+        items, next_cursor = await pass_.read_models_page_db_async(limit, cursor, db, model)
+        return router_core.Page[model](items=items, next_cursor=next_cursor)
+
+    etag = versions.read_etag(DBPass.__tablename__)
+    return await router_core.cached_json_response(request, ('pass-page', limit, cursor, model), load, etag)
 
 
 @router.post('/')
-async def create_pass(pass_create: PassCreate, db: Session = Depends(core.get_db)) -> Pass:
-    db_pass = pass_.create_db(pass_create, db)
+async def create_pass(pass_create: PassCreate, db: AsyncSession = Depends(core.get_async_db)) -> Pass:
+    db_pass = await pass_.create_db_async(pass_create, db)
     return Pass.model_validate(db_pass)
 
 
-@router.get('/{pass_id}')
-async def read_pass(pass_id: str, db: Session = Depends(core.get_db)) -> Pass:
+@router.get('/{pass_id}', response_model=Pass)
+async def read_pass(
+        pass_id: str, request: Request, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(Pass, fields)
+    etag = versions.read_etag(DBPass.__tablename__)
+
+    if router_core.etag_matches(request, etag):
+        return router_core.not_modified_response(etag)
+
     try:
-        db_pass = pass_.read_db(pass_id, db)
+        return router_core.model_response(await pass_.read_cached_async(pass_id, db), model, {'ETag': etag})
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return Pass.model_validate(db_pass)
-
 
-@router.get('/{pass_id}/events')
-async def read_pass_events(pass_id: str, db: Session = Depends(core.get_db)) -> list[Event]:
-    try:
-        event_ids = associations.read_pass_events_db(pass_id, db)
-        db_events = event.read_by_ids_db(event_ids, db)
+@router.get('/{pass_id}/events', response_model=list[Event])
+async def read_pass_events(
+        pass_id: str, request: Request, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(Event, fields)
+    etag = versions.read_etag(DBPassEvent.__tablename__, DBEvent.__tablename__)
 
-    except DBNotFoundError as e:
-        raise router_core.not_found_error(e)
+    if router_core.etag_matches(request, etag):
+        return router_core.not_modified_response(etag)
 
-    return [Event.model_validate(db_event) for db_event in db_events]
+    events = await pass_.read_events_cached_async(pass_id, db)
+    return router_core.model_response(events, list[model], {'ETag': etag})
 
 
 @router.post('/{pass_id}/events/{event_id}')
 async def create_pass_event(pass_id: str, event_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.create_pass_event_db(pass_id, event_id, db)
+    try:
+        association_id = await executor.run(associations.create_pass_event_db, pass_id, event_id, db)
+
+    except DBValidationError as e:
+        raise router_core.validation_error(e)
+
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
 @router.delete('/{pass_id}/events/{event_id}')
 async def delete_pass_event(pass_id: str, event_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.delete_pass_event_db(pass_id, event_id, db)
+    association_id = await executor.run(associations.delete_pass_event_db, pass_id, event_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
 @router.patch('/{pass_id}')
-async def update_pass(pass_id: str, pass_update: PassUpdate, db: Session = Depends(core.get_db)) -> Pass:
+async def update_pass(pass_id: str, pass_update: PassUpdate, db: AsyncSession = Depends(core.get_async_db)) -> Pass:
     try:
-        db_pass = pass_.update_db(pass_id, pass_update, db)
+        db_pass = await pass_.update_db_async(pass_id, pass_update, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -72,9 +101,9 @@ async def update_pass(pass_id: str, pass_update: PassUpdate, db: Session = Depen
 
 
 @router.delete('/{pass_id}')
-async def delete_pass(pass_id: str, db: Session = Depends(core.get_db)) -> Pass:
+async def delete_pass(pass_id: str, db: AsyncSession = Depends(core.get_async_db)) -> Pass:
     try:
-        db_pass = pass_.delete_db(pass_id, db)
+        db_pass = await pass_.delete_db_async(pass_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
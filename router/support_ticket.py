@@ -1,31 +1,44 @@
 """Route for all support tickets at /support-ticket."""
 from typing import Sequence
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
 from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
 from typing_extensions import Optional
 
 import router as router_core
-from db import core, support_ticket
+from db import core, executor, support_ticket
 from db.core import DBNotFoundError, SupportTicketCategory
 from db.support_ticket import SupportTicketCreate, SupportTicket, SupportTicketUpdate
 
 router = APIRouter(prefix='/support-ticket', tags=['support_ticket'])
 
 
-@router.get('/')
-async def read_all_support_tickets(db: Session = Depends(core.get_db)) -> list[SupportTicket]:
-    db_support_tickets = support_ticket.read_all_db(db)
-    return [SupportTicket.model_validate(db_support_ticket) for db_support_ticket in db_support_tickets]
+@router.get('/', response_model=router_core.Page[SupportTicket])
+async def read_all_support_tickets(
+        request: Request, limit: int = Query(router_core.DEFAULT_PAGE_LIMIT, ge=1, le=router_core.MAX_PAGE_LIMIT),
+        cursor: Optional[str] = None, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(SupportTicket, fields)
+
+    if router_core.ndjson_requested(request):
+        return router_core.ndjson_response(support_ticket.stream_all_db_async(db), model, db)
+
+    support_tickets, next_cursor = await support_ticket.read_models_page_db_async(limit, cursor, db, model)
+    return router_core.model_response(
+        {'items': support_tickets, 'next_cursor': next_cursor}, router_core.Page[model]
+    )
 
 
 @router.post('/')
 async def create_support_ticket(
-        support_ticket_create: SupportTicketCreate, db: Session = Depends(core.get_db)
+        support_ticket_create: SupportTicketCreate, db: AsyncSession = Depends(core.get_async_db)
 ) -> SupportTicket:
-    db_support_ticket = support_ticket.create_db(support_ticket_create, db)
+    db_support_ticket = await support_ticket.create_db_async(support_ticket_create, db)
     return SupportTicket.model_validate(db_support_ticket)
 
 
@@ -33,30 +46,35 @@ async def create_support_ticket(
 async def read_support_ticket_by_category(
         category: SupportTicketCategory, db: Session = Depends(core.get_db)
 ) -> Sequence[str]:
-    db_support_ticket_ids = support_ticket.read_all_by_category(category, db)
+    db_support_ticket_ids = await executor.run(support_ticket.read_all_by_category, category, db)
     return db_support_ticket_ids
 
 
 @router.get('/email_address/ids')
 async def read_support_ticket_by_email_address(email_address: str, db: Session = Depends(core.get_db)) -> Sequence[str]:
-    db_support_ticket_ids = support_ticket.read_all_by_email_address(email_address, db)
+    db_support_ticket_ids = await executor.run(support_ticket.read_all_by_email_address, email_address, db)
     return db_support_ticket_ids
 
 
-@router.get('/{support_ticket_id}')
-async def read_support_ticket(support_ticket_id: str, db: Session = Depends(core.get_db)) -> SupportTicket:
+@router.get('/{support_ticket_id}', response_model=SupportTicket)
+async def read_support_ticket(
+        support_ticket_id: str, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(SupportTicket, fields)
+
     try:
-        db_support_ticket = support_ticket.read_db(support_ticket_id, db)
+        db_support_ticket = await support_ticket.read_db_async(support_ticket_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return SupportTicket.model_validate(db_support_ticket)
+    return router_core.model_response(db_support_ticket, model)
 
 
 @router.post('/{support_ticket_id}')
 async def solve_support_ticket(
-        support_ticket_id: str, solved: bool, email_address: Optional[str] = None, db: Session = Depends(core.get_db)
+        support_ticket_id: str, solved: bool, email_address: Optional[str] = None,
+        db: AsyncSession = Depends(core.get_async_db)
 ) -> SupportTicket:
     if not solved and email_address is not None:
         raise HTTPException(
@@ -66,7 +84,7 @@ async def solve_support_ticket(
 
     try:
         update_model = SupportTicketUpdate(solved=solved, solved_email_address=email_address)
-        db_support_ticket = support_ticket.update_db(support_ticket_id, update_model, db)
+        db_support_ticket = await support_ticket.update_db_async(support_ticket_id, update_model, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -76,10 +94,11 @@ async def solve_support_ticket(
 
 @router.patch('/{support_ticket_id}')
 async def update_support_ticket(
-        support_ticket_id: str, support_ticket_update: SupportTicketUpdate, db: Session = Depends(core.get_db)
+        support_ticket_id: str, support_ticket_update: SupportTicketUpdate,
+        db: AsyncSession = Depends(core.get_async_db)
 ) -> SupportTicket:
     try:
-        db_support_ticket = support_ticket.update_db(support_ticket_id, support_ticket_update, db)
+        db_support_ticket = await support_ticket.update_db_async(support_ticket_id, support_ticket_update, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -88,9 +107,9 @@ async def update_support_ticket(
 
 
 @router.delete('/{support_ticket_id}')
-async def delete_support_ticket(support_ticket_id: str, db: Session = Depends(core.get_db)) -> SupportTicket:
+async def delete_support_ticket(support_ticket_id: str, db: AsyncSession = Depends(core.get_async_db)) -> SupportTicket:
     try:
-        db_support_ticket = support_ticket.delete_db(support_ticket_id, db)
+        db_support_ticket = await support_ticket.delete_db_async(support_ticket_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -1,16 +1,18 @@
 """Route for all teams at /team."""
 from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
 from starlette.exceptions import HTTPException
-from starlette.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
 import router as router_core
-from db import associations, core, event, team, user
-from db.core import DBNotFoundError, DBValidationError
+from db import associations, core, event, executor, team, user, versions
+from db.core import DBNotFoundError, DBTeam, DBValidationError
 from db.event import Event
 from db.team import TeamCreate, Team, TeamUpdate
 from db.user import User
@@ -18,39 +20,64 @@ from db.user import User
 router = APIRouter(prefix='/team', tags=['team'])
 
 
-@router.get('/')
-async def read_all_teams(db: Session = Depends(core.get_db)) -> list[Team]:
-    db_teams = team.read_all_db(db)
-    return [Team.model_validate(db_team) for db_team in db_teams]
+@router.get('/', response_model=router_core.Page[Team])
+async def read_all_teams(
+        request: Request, limit: int = Query(router_core.DEFAULT_PAGE_LIMIT, ge=1, le=router_core.MAX_PAGE_LIMIT),
+        cursor: Optional[str] = None, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(Team, fields)
+
+    if router_core.ndjson_requested(request):
+        return router_core.ndjson_response(team.stream_all_db_async(db), model, db)
+
+    etag = versions.read_etag(DBTeam.__tablename__)
+
+    if router_core.etag_matches(request, etag):
+        return router_core.not_modified_response(etag)
+
+    teams, next_cursor = await team.read_models_page_db_async(limit, cursor, db, model)
+    return router_core.model_response(
+        {'items': teams, 'next_cursor': next_cursor}, router_core.Page[model], {'ETag': etag}
+    )
 
 
 @router.post('/')
-async def create_team(team_create: TeamCreate, db: Session = Depends(core.get_db)) -> Team:
-    db_team = team.create_db(team_create, db)
+async def create_team(team_create: TeamCreate, db: AsyncSession = Depends(core.get_async_db)) -> Team:
+    db_team = await team.create_db_async(team_create, db)
     return Team.model_validate(db_team)
 
 
-@router.get('/{team_id}')
-async def read_team(team_id: str, db: Session = Depends(core.get_db)) -> Team:
+@router.get('/{team_id}', response_model=Team)
+async def read_team(
+        team_id: str, request: Request, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(Team, fields)
+    etag = versions.read_etag(DBTeam.__tablename__)
+
+    if router_core.etag_matches(request, etag):
+        return router_core.not_modified_response(etag)
+
     try:
-        db_team = team.read_db(team_id, db)
+        db_team = await team.read_db_async(team_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return Team.model_validate(db_team)
+    return router_core.model_response(db_team, model, {'ETag': etag})
+
 
+@router.get('/{team_id}/events', response_model=list[Event])
+async def read_team_events(team_id: str, fields: Optional[str] = None, db: Session = Depends(core.get_db)) -> Response:
+    model = router_core.fields_model(Event, fields)
 
-@router.get('/{team_id}/events')
-async def read_team_events(team_id: str, db: Session = Depends(core.get_db)) -> list[Event]:
     try:
-        event_ids = associations.read_team_events_db(team_id, db)
-        db_events = event.read_by_ids_db(event_ids, db)
+        event_ids = await executor.run(associations.read_team_events_db, team_id, db)
+        events = await executor.run(event.read_models_by_ids_db, event_ids, db, model)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return [Event.model_validate(db_event) for db_event in db_events]
+    return router_core.model_response(events, list[model])
 
 
 @router.post('/{team_id}/events/{event_id}')
@@ -59,7 +86,9 @@ async def create_team_event(
         db: Session = Depends(core.get_db)
 ) -> JSONResponse:
     try:
-        association_id = associations.create_team_event_db(team_id, event_id, validate, validate_host_only, db)
+        association_id = await executor.run(
+            associations.create_team_event_db, team_id, event_id, validate, validate_host_only, db
+        )
 
     except DBValidationError as e:
         raise router_core.validation_error(e)
@@ -72,27 +101,30 @@ async def create_team_event(
 
 @router.delete('/{team_id}/events/{event_id}')
 async def delete_team_event(team_id: str, event_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.delete_team_event_db(team_id, event_id, db)
+    association_id = await executor.run(associations.delete_team_event_db, team_id, event_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
-@router.get('/{team_id}/users')
-async def read_team_users(team_id: str, db: Session = Depends(core.get_db)) -> list[User]:
+@router.get('/{team_id}/users', response_model=list[User])
+async def read_team_users(team_id: str, fields: Optional[str] = None, db: Session = Depends(core.get_db)) -> Response:
+    model = router_core.fields_model(User, fields)
+
     try:
-        user_ids = associations.read_team_users_db(team_id, db)
-        db_users = user.read_by_ids_db(user_ids, db)
+        user_ids = await executor.run(associations.read_team_users_db, team_id, db)
+        users = await executor.run(user.read_models_by_ids_db, user_ids, db, model)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return [User.model_validate(db_user) for db_user in db_users]
+    return router_core.model_response(users, list[model])
 
 
 @router.post('/{team_id}/users/{user_id}')
-async def create_team_user(team_id: str, user_id: str, validate: bool = True,
-                     db: Session = Depends(core.get_db)) -> JSONResponse:
+async def create_team_user(
+        team_id: str, user_id: str, validate: bool = True, db: Session = Depends(core.get_db)
+) -> JSONResponse:
     try:
-        association_id = associations.create_team_user_db(team_id, user_id, validate, db)
+        association_id = await executor.run(associations.create_team_user_db, team_id, user_id, validate, db)
 
     except DBValidationError as e:
         raise router_core.validation_error(e)
@@ -105,17 +137,17 @@ async def create_team_user(team_id: str, user_id: str, validate: bool = True,
 
 @router.delete('/{team_id}/users/{user_id}')
 async def delete_team_user(team_id: str, user_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    if team.read_db(team_id, db).host_id == user_id:
+    if (await executor.run(team.read_db, team_id, db)).host_id == user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Cannot delete host of team.')
 
-    association_id = associations.delete_team_user_db(team_id, user_id, db)
+    association_id = await executor.run(associations.delete_team_user_db, team_id, user_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
 @router.patch('/{team_id}')
-async def update_team(team_id: str, team_update: TeamUpdate, db: Session = Depends(core.get_db)) -> Team:
+async def update_team(team_id: str, team_update: TeamUpdate, db: AsyncSession = Depends(core.get_async_db)) -> Team:
     try:
-        db_team = team.update_db(team_id, team_update, db)
+        db_team = await team.update_db_async(team_id, team_update, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -124,9 +156,9 @@ async def update_team(team_id: str, team_update: TeamUpdate, db: Session = Depen
 
 
 @router.delete('/{team_id}')
-async def delete_team(team_id: str, db: Session = Depends(core.get_db)) -> Team:
+async def delete_team(team_id: str, db: AsyncSession = Depends(core.get_async_db)) -> Team:
     try:
-        db_team = team.delete_db(team_id, db)
+        db_team = await team.delete_db_async(team_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
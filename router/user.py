@@ -1,33 +1,51 @@
 """Route for all users at /user."""
-from typing import Sequence
+from typing import Optional, Sequence
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
 from starlette.exceptions import HTTPException
+from starlette.requests import Request
 from starlette.responses import JSONResponse, StreamingResponse, Response
 
 import router as router_core
-from db import core, event, user, pass_, team, associations
+from db import core, event, user, pass_, team, associations, executor, qr_code, ticket
 from db.core import DBNotFoundError, DBValidationError
 from db.event import Event
 from db.pass_ import Pass
+from db.qr_code import QRCodeSheetFormat
+from db.ticket import TicketSigningDisabledError
 from db.team import Team
-from db.user import UserCreate, User, UserUpdate
+from db.user import UserCreate, User, UserOverview, UserUpdate
 
 router = APIRouter(prefix='/user', tags=['user'])
 
 
+@router.get('/', response_model=router_core.Page[User])
+async def read_all_users(
+        request: Request, limit: int = Query(router_core.DEFAULT_PAGE_LIMIT, ge=1, le=router_core.MAX_PAGE_LIMIT),
+        cursor: Optional[str] = None, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(User, fields)
+
+    if router_core.ndjson_requested(request):
+        return router_core.ndjson_response(user.stream_all_db_async(db), model, db)
+
+    users, next_cursor = await user.read_models_page_db_async(limit, cursor, db, model)
+    return router_core.model_response({'items': users, 'next_cursor': next_cursor}, router_core.Page[model])
+
+
 @router.post('/')
-async def create_user(user_create: UserCreate, db: Session = Depends(core.get_db)) -> User:
-    db_user = user.create_db(user_create, db)
+async def create_user(user_create: UserCreate, db: AsyncSession = Depends(core.get_async_db)) -> User:
+    db_user = await user.create_db_async(user_create, db)
     return User.model_validate(db_user)
 
 
 @router.get('/id')
 async def read_user_id_from_email_address(email_address: str, db: Session = Depends(core.get_db)) -> str:
     try:
-        user_id = user.read_id_from_email_address_db(email_address, db)
+        user_id = await executor.run(user.read_id_from_email_address_db, email_address, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -37,7 +55,7 @@ async def read_user_id_from_email_address(email_address: str, db: Session = Depe
 
 @router.get('/id-phone-number')
 async def read_user_ids_from_phone_number(phone_number: str, db: Session = Depends(core.get_db)) -> Sequence[str]:
-    user_ids = user.read_ids_from_phone_number_db(phone_number, db)
+    user_ids = await executor.run(user.read_ids_from_phone_number_db, phone_number, db)
     return user_ids
 
 
@@ -46,7 +64,7 @@ async def read_user_id_from_mahe_registration_number(
         mahe_registration_number: int, db: Session = Depends(core.get_db)
 ) -> str:
     try:
-        user_id = user.read_id_from_mahe_registration_number_db(mahe_registration_number, db)
+        user_id = await executor.run(user.read_id_from_mahe_registration_number_db, mahe_registration_number, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -54,66 +72,145 @@ async def read_user_id_from_mahe_registration_number(
     return user_id
 
 
-@router.get('/{user_id}')
-async def read_user(user_id: str, db: Session = Depends(core.get_db)) -> User:
+@router.post('/qr_codes')
+async def read_users_qr_codes(
+        user_ids: list[str], sheet_format: QRCodeSheetFormat = Query(QRCodeSheetFormat.ZIP, alias='format'),
+        scale: int = Query(qr_code.DEFAULT_SCALE, ge=1, le=50),
+        border: int = Query(qr_code.DEFAULT_BORDER, ge=0, le=20),
+        db: AsyncSession = Depends(core.get_async_db)
+) -> StreamingResponse:
+    user_ids = list(dict.fromkeys(user_ids))
+
     try:
-        db_user = user.read_db(user_id, db)
+        await user.validate_ids_db_async(user_ids, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return User.model_validate(db_user)
+    return router_core.qr_code_sheet_response(user_ids, sheet_format, scale, border, 'users')
+
+
+@router.get('/{user_id}', response_model=User)
+async def read_user(
+        user_id: str, fields: Optional[str] = None, db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    model = router_core.fields_model(User, fields)
+
+    try:
+        db_user = await user.read_db_async(user_id, db)
+
+    except DBNotFoundError as e:
+        raise router_core.not_found_error(e)
+
+    return router_core.model_response(db_user, model)
+
+
+@router.get('/{user_id}/overview', response_model=UserOverview)
+async def read_user_overview(user_id: str, db: AsyncSession = Depends(core.get_async_db)) -> Response:
+    try:
+        return router_core.model_response(await user.read_overview_db_async(user_id, db), UserOverview)
+
+    except DBNotFoundError as e:
+        raise router_core.not_found_error(e)
 
 
 @router.get('/{user_id}/qr_code')
-async def read_user_qr_code(user_id: str, db: Session = Depends(core.get_db)) -> Response:
+async def read_user_qr_code(
+        user_id: str, request: Request, scale: int = Query(qr_code.DEFAULT_SCALE, ge=1, le=50),
+        border: int = Query(qr_code.DEFAULT_BORDER, ge=0, le=20), db: AsyncSession = Depends(core.get_async_db)
+) -> Response:
+    # The QR code only encodes the immutable user ID, so clients may keep it for as long as they like, and one that a
+    # client already has is confirmed without reading the user or rendering the code.
+    etag = qr_code.read_etag(user_id, scale, border)
+    headers = {'ETag': etag, 'Cache-Control': 'private, max-age=31536000, immutable'}
+
+    if router_core.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     try:
-        bytes_stream = user.create_qr_code(user_id, db)
+        png, _ = await user.create_qr_code_async(user_id, scale, border, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return StreamingResponse(bytes_stream, media_type='image/png')
+    return Response(png, media_type='image/png', headers=headers)
 
 
-@router.get('/{user_id}/pass')
-async def read_user_pass(user_id: str, db: Session = Depends(core.get_db)) -> Pass:
+@router.get('/{user_id}/qr_code/signed')
+async def read_user_signed_qr_code(
+        user_id: str, request: Request, scale: int = Query(qr_code.DEFAULT_SCALE, ge=1, le=50),
+        border: int = Query(qr_code.DEFAULT_BORDER, ge=0, le=20), db: Session = Depends(core.get_db)
+) -> Response:
     try:
-        pass_id = user.read_pass_db(user_id, db)
-        db_pass = pass_.read_db(pass_id, db)
+        payload = await executor.run(ticket.create_db, user_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return Pass.model_validate(db_pass)
+    except TicketSigningDisabledError as e:
+        raise router_core.not_implemented_error(e)
 
+    # The payload changes when it is reissued with a later expiry or a new access index version, so clients revalidate.
+    etag = qr_code.read_etag(payload, scale, border)
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
 
-@router.get('/{user_id}/events')
-async def read_user_events(user_id: str, db: Session = Depends(core.get_db)) -> list[Event]:
+    if router_core.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    png, _ = await qr_code.read_png_async(payload, scale, border)
+    return Response(png, media_type='image/png', headers=headers)
+
+
+@router.get('/{user_id}/pass', response_model=Pass)
+async def read_user_pass(user_id: str, db: Session = Depends(core.get_db)) -> Response:
     try:
-        event_ids = user.read_events_organizer_db(user_id, db)
-        db_events = event.read_by_ids_db(event_ids, db)
+        pass_id = await executor.run(user.read_pass_db, user_id, db)
+        db_pass = await executor.run(pass_.read_db, pass_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return [Event.model_validate(db_event) for db_event in db_events]
+    return router_core.model_response(db_pass, Pass)
 
 
-@router.get('/{user_id}/teams')
-async def read_user_teams(user_id: str, host: bool, db: Session = Depends(core.get_db)) -> list[Team]:
+@router.get('/{user_id}/events', response_model=list[Event])
+async def read_user_events(
+        user_id: str, organizer: bool = True, fields: Optional[str] = None, db: Session = Depends(core.get_db)
+) -> Response:
+    model = router_core.fields_model(Event, fields)
+
+    try:
+        if organizer:
+            event_ids = await executor.run(user.read_events_organizer_db, user_id, db)
+        else:
+            event_ids = await executor.run(associations.read_user_events_db, user_id, db)
+
+        events = await executor.run(event.read_models_by_ids_db, event_ids, db, model)
+
+    except DBNotFoundError as e:
+        raise router_core.not_found_error(e)
+
+    return router_core.model_response(events, list[model])
+
+
+@router.get('/{user_id}/teams', response_model=list[Team])
+async def read_user_teams(
+        user_id: str, host: bool, fields: Optional[str] = None, db: Session = Depends(core.get_db)
+) -> Response:
+    model = router_core.fields_model(Team, fields)
+
     try:
         if host:
-            team_ids = user.read_teams_host_db(user_id, db)
+            team_ids = await executor.run(user.read_teams_host_db, user_id, db)
         else:
-            team_ids = associations.read_user_teams_db(user_id, db)
+            team_ids = await executor.run(associations.read_user_teams_db, user_id, db)
 
-        db_teams = team.read_by_ids_db(team_ids, db)
+        teams = await executor.run(team.read_models_by_ids_db, team_ids, db, model)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
 
-    return [Team.model_validate(db_team) for db_team in db_teams]
+    return router_core.model_response(teams, list[model])
 
 
 @router.post('/{user_id}/teams/{team_id}')
@@ -121,7 +218,7 @@ async def create_user_team(
         user_id: str, team_id: str, validate: bool = True, db: Session = Depends(core.get_db)
 ) -> JSONResponse:
     try:
-        association_id = associations.create_team_user_db(team_id, user_id, validate, db)
+        association_id = await executor.run(associations.create_team_user_db, team_id, user_id, validate, db)
 
     except DBValidationError as e:
         raise router_core.validation_error(e)
@@ -134,31 +231,19 @@ async def create_user_team(
 
 @router.delete('/{user_id}/teams/{team_id}')
 async def delete_user_team(user_id: str, team_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    if team.read_db(team_id, db).host_id == user_id:
+    if (await executor.run(team.read_db, team_id, db)).host_id == user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Cannot delete host of team.')
 
-    association_id = associations.delete_team_user_db(team_id, user_id, db)
+    association_id = await executor.run(associations.delete_team_user_db, team_id, user_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
-@router.get('/{user_id}/events')
-async def read_user_events(user_id: str, db: Session = Depends(core.get_db)) -> list[Event]:
-    try:
-        event_ids = associations.read_user_events_db(user_id, db)
-        db_events = event.read_by_ids_db(event_ids, db)
-
-    except DBNotFoundError as e:
-        raise router_core.not_found_error(e)
-
-    return [Event.model_validate(db_event) for db_event in db_events]
-
-
 @router.post('/{user_id}/events/{event_id}')
 async def create_user_event(
         user_id: str, event_id: str, validate: bool = True, db: Session = Depends(core.get_db)
 ) -> JSONResponse:
     try:
-        association_id = associations.create_user_event_db(user_id, event_id, validate, db)
+        association_id = await executor.run(associations.create_user_event_db, user_id, event_id, validate, db)
 
     except DBValidationError as e:
         raise router_core.validation_error(e)
@@ -171,14 +256,14 @@ async def create_user_event(
 
 @router.delete('/{user_id}/events/{event_id}')
 async def delete_user_event(user_id: str, event_id: str, db: Session = Depends(core.get_db)) -> JSONResponse:
-    association_id = associations.delete_user_event_db(user_id, event_id, db)
+    association_id = await executor.run(associations.delete_user_event_db, user_id, event_id, db)
     return JSONResponse(content={'id': association_id}, status_code=status.HTTP_200_OK)
 
 
 @router.patch('/{user_id}')
-async def update_user(user_id: str, user_update: UserUpdate, db: Session = Depends(core.get_db)) -> User:
+async def update_user(user_id: str, user_update: UserUpdate, db: AsyncSession = Depends(core.get_async_db)) -> User:
     try:
-        db_user = user.update_db(user_id, user_update, db)
+        db_user = await user.update_db_async(user_id, user_update, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -187,9 +272,9 @@ async def update_user(user_id: str, user_update: UserUpdate, db: Session = Depen
 
 
 @router.delete('/{user_id}')
-async def delete_user(user_id: str, db: Session = Depends(core.get_db)) -> User:
+async def delete_user(user_id: str, db: AsyncSession = Depends(core.get_async_db)) -> User:
     try:
-        db_user = user.delete_db(user_id, db)
+        db_user = await user.delete_db_async(user_id, db)
 
     except DBNotFoundError as e:
         raise router_core.not_found_error(e)
@@ -1,8 +1,13 @@
 import unittest
 
+import sqlalchemy
 from starlette.testclient import TestClient
 
 import main
+from db import access_index, associations
+from db.core import (
+    DBEvent, DBNotFoundError, DBPass, DBPassEvent, DBTeam, DBTeamEvent, DBTeamUser, DBUser, EventType
+)
 from tests import core
 
 
@@ -36,6 +41,12 @@ class AssociationTest(unittest.TestCase):
         data = response.json()
         self.assertEqual(3, len(data))
 
+    def test_duplicate_pass_event(self):
+        response = self.client.post(
+            f'/pass/{self.ids["all-sports-pass"]}/events/{self.ids["track&field-event"]}', headers=self.headers
+        )
+        self.assertEqual(400, response.status_code)
+
     def test_team_events(self):
         response = self.client.get(f'/team/{self.ids["sports-champs-team"]}/events/', headers=self.headers)
         self.assertEqual(200, response.status_code)
@@ -54,6 +65,51 @@ class AssociationTest(unittest.TestCase):
         self.assertEqual(1, len(data))
         self.assertEqual(self.ids["sports-champs-team"], data[0]['id'])
 
+    def test_event_teams_users(self):
+        response = self.client.get(f'/event/{self.ids["track&field-event"]}/teams/users', headers=self.headers)
+        self.assertEqual(200, response.status_code)
+
+        data = response.json()
+        self.assertEqual([self.ids['sports-champs-team']], list(data.keys()))
+        self.assertEqual(2, len(data[self.ids['sports-champs-team']]))
+
+    def test_event_teams_users_query_count(self):
+        event_id = self.ids['e-sports-mania-event']
+        path = f'/event/{event_id}/teams/users'
+
+        with core.count_queries() as statements:
+            self.client.get(path, headers=self.headers)
+
+        query_count = len(statements)
+        team_ids = [f'query-count-team-{i}' for i in range(25)]
+
+        db = core._test_session_local()
+        db.execute(sqlalchemy.insert(DBTeam).values([
+            {'id': team_id, 'name': team_id, 'host_id': self.ids['john-smith-user']} for team_id in team_ids
+        ]))
+        db.execute(sqlalchemy.insert(DBTeamEvent).values([
+            {'team_id': team_id, 'event_id': event_id} for team_id in team_ids
+        ]))
+        db.execute(sqlalchemy.insert(DBTeamUser).values([
+            {'team_id': team_id, 'user_id': self.ids['john-smith-user']} for team_id in team_ids
+        ]))
+        db.commit()
+
+        try:
+            with core.count_queries() as statements:
+                response = self.client.get(path, headers=self.headers)
+
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(25, len(response.json()))
+            self.assertEqual(query_count, len(statements))
+
+        finally:
+            db.execute(sqlalchemy.delete(DBTeam).where(DBTeam.id.in_(team_ids)))
+            db.execute(sqlalchemy.delete(DBTeamEvent).where(DBTeamEvent.team_id.in_(team_ids)))
+            db.execute(sqlalchemy.delete(DBTeamUser).where(DBTeamUser.team_id.in_(team_ids)))
+            db.commit()
+            db.close()
+
     def test_team_users(self):
         response = self.client.get(f'/team/{self.ids["sports-champs-team"]}/users/', headers=self.headers)
         self.assertEqual(200, response.status_code)
@@ -83,3 +139,153 @@ class AssociationTest(unittest.TestCase):
 
         data = response.json()
         self.assertEqual(2, len(data))
+
+    def test_user_events_registered(self):
+        user_id, event_id = self.ids['john-smith-user'], self.ids['track&field-event']
+        self.client.post(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+
+        try:
+            response = self.client.get(f'/user/{user_id}/events?organizer=false', headers=self.headers)
+            self.assertEqual(200, response.status_code)
+            self.assertEqual([event_id], [event['id'] for event in response.json()])
+
+            response = self.client.get(f'/user/{user_id}/overview', headers=self.headers)
+            self.assertEqual([event_id], [event['id'] for event in response.json()['events']])
+
+        finally:
+            self.client.delete(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+
+    def test_event_team_validation(self):
+        response = self.client.post(
+            f'/event/{self.ids["e-sports-mania-event"]}/teams/{self.ids["sports-champs-team"]}', headers=self.headers
+        )
+        self.assertEqual(200, response.status_code)
+
+        self.client.delete(
+            f'/event/{self.ids["e-sports-mania-event"]}/teams/{self.ids["sports-champs-team"]}', headers=self.headers
+        )
+
+        response = self.client.post(
+            f'/event/{self.ids["dj-night-event"]}/teams/{self.ids["sports-champs-team"]}', headers=self.headers
+        )
+        self.assertEqual(400, response.status_code)
+
+    def test_event_team_validation_host_only(self):
+        response = self.client.post(
+            f'/event/{self.ids["dj-night-event"]}/teams/{self.ids["stardust-crusaders-team"]}?validate_host_only=true',
+            headers=self.headers
+        )
+        self.assertEqual(400, response.status_code)
+
+        response = self.client.post(
+            f'/event/{self.ids["dj-night-event"]}/teams/{self.ids["diamonds-are-forever-team"]}'
+            '?validate_host_only=true',
+            headers=self.headers
+        )
+        self.assertEqual(200, response.status_code)
+
+        self.client.delete(
+            f'/event/{self.ids["dj-night-event"]}/teams/{self.ids["diamonds-are-forever-team"]}', headers=self.headers
+        )
+
+    def test_event_team_validation_member_without_pass(self):
+        rows = [
+            (DBEvent, [{'id': 'order-event', 'name': 'Order', 'type': EventType.TECHNICAL, 'team_members': 3}]),
+            (DBPass, [
+                {'id': 'order-valid-pass', 'name': 'Valid', 'cost': 1},
+                {'id': 'order-other-pass', 'name': 'Other', 'cost': 1}
+            ]),
+            (DBPassEvent, [{'id': 'order-pass-event', 'pass_id': 'order-valid-pass', 'event_id': 'order-event'}]),
+            (DBUser, [
+                {'id': user_id, 'first_name': user_id, 'last_name': 'Order', 'email_address': f'{user_id}@example.com',
+                 'pass_id': pass_id}
+                for user_id, pass_id in (
+                    ('order-host', 'order-valid-pass'), ('order-a', 'order-other-pass'), ('order-b', None)
+                )
+            ]),
+            (DBTeam, [{'id': 'order-team', 'name': 'Order', 'host_id': 'order-host'}]),
+            # The member with a pass that is not valid for the event is read first without an explicit order.
+            (DBTeamUser, [
+                {'id': 'order-a', 'team_id': 'order-team', 'user_id': 'order-a'},
+                {'id': 'order-b', 'team_id': 'order-team', 'user_id': 'order-b'}
+            ]),
+        ]
+
+        with core._test_session_local() as db:
+            for db_class, values in rows:
+                db.execute(sqlalchemy.insert(db_class), values)
+
+            db.commit()
+            access_index.invalidate()
+
+            try:
+                with self.assertRaises(DBNotFoundError):
+                    associations._validate_team_users_for_event('order-team', 'order-event', False, db)
+
+            finally:
+                for db_class, values in reversed(rows):
+                    db.execute(sqlalchemy.delete(db_class).where(db_class.id.in_([value['id'] for value in values])))
+
+                db.commit()
+                access_index.invalidate()
+
+    def test_event_team_validation_missing_team(self):
+        response = self.client.post(f'/event/{self.ids["dj-night-event"]}/teams/missing-team', headers=self.headers)
+        self.assertEqual(404, response.status_code)
+
+    def test_team_user_validation(self):
+        team_id = self.ids['diamonds-are-forever-team']
+
+        self.client.post(
+            f'/team/{team_id}/events/{self.ids["e-sports-mania-event"]}?validate=false', headers=self.headers
+        )
+
+        try:
+            response = self.client.post(f'/team/{team_id}/users/{self.ids["john-smith-user"]}', headers=self.headers)
+            self.assertEqual(400, response.status_code)
+            self.assertIn(self.ids['codejam-event'], response.json()['detail'])
+
+            with core.count_queries() as statements:
+                self.client.post(f'/team/{team_id}/users/{self.ids["john-smith-user"]}', headers=self.headers)
+
+            self.assertEqual(1, len(statements))
+
+        finally:
+            self.client.delete(f'/team/{team_id}/events/{self.ids["e-sports-mania-event"]}', headers=self.headers)
+
+        response = self.client.post(
+            f'/team/{self.ids["stardust-crusaders-team"]}/users/{self.ids["jane-doe-user"]}', headers=self.headers
+        )
+        self.assertEqual(200, response.status_code)
+
+        self.client.delete(
+            f'/team/{self.ids["stardust-crusaders-team"]}/users/{self.ids["jane-doe-user"]}', headers=self.headers
+        )
+
+    def test_user_event_validation_access_index(self):
+        user_id = self.ids['john-smith-user']
+        event_id = self.ids['dj-night-event']
+        pass_id = self.ids['all-sports-pass']
+
+        response = self.client.post(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+        self.assertEqual(400, response.status_code)
+
+        # The event's passes come from the access index, so only the user's pass is read from the DB.
+        with core.count_queries() as statements:
+            response = self.client.post(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+            self.assertEqual(400, response.status_code)
+
+        self.assertEqual(1, len(statements))
+
+        self.client.post(f'/pass/{pass_id}/events/{event_id}', headers=self.headers)
+
+        try:
+            response = self.client.post(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+            self.assertEqual(200, response.status_code)
+            self.client.delete(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+
+        finally:
+            self.client.delete(f'/pass/{pass_id}/events/{event_id}', headers=self.headers)
+
+        response = self.client.post(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+        self.assertEqual(400, response.status_code)
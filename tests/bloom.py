@@ -0,0 +1,125 @@
+import concurrent.futures
+import time
+import unittest
+from unittest import mock
+
+import sqlalchemy
+from starlette.testclient import TestClient
+
+import main
+from db import bloom
+from db.core import DBUser
+from tests import core
+
+USER_JSON = {
+    'first_name': 'Bloom', 'last_name': 'Filter', 'email_address': 'bloom.filter@learner.manipal.edu',
+    'phone_number': None, 'mahe_registration_number': None, 'pass_id': None
+}
+
+
+class BloomTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def test_bloom_filter(self):
+        bloom_filter = bloom.BloomFilter(10_000, 0.01)
+        items = [f'item-{i}' for i in range(10_000)]
+
+        for item in items:
+            bloom_filter.add(item)
+
+        self.assertTrue(all(item in bloom_filter for item in items))
+
+        false_positives = sum(f'other-{i}' in bloom_filter for i in range(10_000))
+        self.assertLess(false_positives, 200)
+        self.assertAlmostEqual(0.01, bloom_filter.read_false_positive_rate(), delta=0.002)
+
+    def test_unknown_ids_rejected_without_db(self):
+        # Load the filters first, which is done at startup outside of tests.
+        self.assertEqual(200, self.client.get(f'/user/{self.ids["john-smith-user"]}', headers=self.headers).status_code)
+        self.assertEqual(200, self.client.get(f'/event/{self.ids["dj-night-event"]}', headers=self.headers).status_code)
+        self.assertEqual(
+            200, self.client.get(f'/team/{self.ids["sports-champs-team"]}', headers=self.headers).status_code
+        )
+
+        rejections = bloom.users.stats()['rejections']
+
+        with core.count_queries() as statements:
+            self.assertEqual(404, self.client.get('/user/missing-user', headers=self.headers).status_code)
+            self.assertEqual(404, self.client.get('/user/missing-user/qr_code', headers=self.headers).status_code)
+            self.assertEqual(404, self.client.get('/event/missing-event', headers=self.headers).status_code)
+            self.assertEqual(404, self.client.get('/team/missing-team', headers=self.headers).status_code)
+
+        self.assertEqual(0, len(statements))
+        self.assertEqual(rejections + 2, bloom.users.stats()['rejections'])
+
+    def test_ids_created_by_other_processes_found_after_reload(self):
+        self.client.get(f'/user/{self.ids["john-smith-user"]}', headers=self.headers)
+
+        # Insert the user without adding it to the filter, as another process would.
+        with core._test_session_local() as db:
+            db.execute(sqlalchemy.insert(DBUser).values(id='other-process-user', **USER_JSON))
+            db.commit()
+
+        try:
+            self.assertEqual(404, self.client.get('/user/other-process-user', headers=self.headers).status_code)
+
+            with mock.patch.object(bloom.users, '_expires_at', 0):
+                self.assertEqual(200, self.client.get('/user/other-process-user', headers=self.headers).status_code)
+
+        finally:
+            self.client.delete('/user/other-process-user', headers=self.headers)
+
+    def test_single_flight_load(self):
+        id_filter = bloom.IDFilter(DBUser)
+        loads = []
+
+        def load(session):
+            loads.append(session)
+            time.sleep(0.05)
+            bloom.IDFilter.load(id_filter, session)
+
+        with core._test_session_local() as db:
+            id_filter.load(db)
+
+        # Once expired, one thread reloads the filter while the others keep using the stale one.
+        id_filter._expires_at = 0
+
+        def might_exist():
+            with core._test_session_local() as session:
+                return id_filter.might_exist(self.ids['john-smith-user'], session)
+
+        with mock.patch.object(id_filter, 'load', side_effect=load):
+            with concurrent.futures.ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(lambda _: might_exist(), range(8)))
+
+        self.assertEqual([True] * 8, results)
+        self.assertEqual(1, len(loads))
+
+    def test_created_ids_added(self):
+        user_id = self.client.post('/user/', json=USER_JSON, headers=self.headers).json()['id']
+
+        try:
+            self.assertEqual(200, self.client.get(f'/user/{user_id}', headers=self.headers).status_code)
+
+        finally:
+            self.client.delete(f'/user/{user_id}', headers=self.headers)
+
+    def test_stats(self):
+        self.client.get(f'/user/{self.ids["john-smith-user"]}', headers=self.headers)
+        stats = self.client.get('/cache', headers=self.headers).json()['bloom']['user']
+
+        self.assertGreaterEqual(stats['count'], 2)
+        self.assertEqual(1024, stats['capacity'])
+        self.assertGreater(stats['bytes'], stats['bits'] // 8)
+        self.assertLess(stats['false_positive_rate'], bloom.FALSE_POSITIVE_RATE)
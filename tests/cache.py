@@ -0,0 +1,164 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from starlette.testclient import TestClient
+
+import main
+import router
+from db import cache
+from tests import core
+from tests.event import EVENT_JSON
+
+
+class CacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def setUp(self):
+        cache.catalog.clear()
+
+    def test_least_recently_used_eviction(self):
+        ttl_cache = cache.TTLCache(2, 60)
+        ttl_cache.set('a', 1)
+        ttl_cache.set('b', 2)
+
+        self.assertEqual(1, ttl_cache.get('a'))
+        ttl_cache.set('c', 3)
+
+        self.assertIsNone(ttl_cache.get('b'))
+        self.assertEqual(1, ttl_cache.get('a'))
+        self.assertEqual(3, ttl_cache.get('c'))
+        self.assertEqual({'size': 2, 'max_size': 2, 'hits': 3, 'misses': 1}, ttl_cache.stats())
+
+    def test_expiry(self):
+        ttl_cache = cache.TTLCache(2, 60)
+
+        with mock.patch('time.monotonic', return_value=0):
+            ttl_cache.set('a', 1)
+
+        with mock.patch('time.monotonic', return_value=59):
+            self.assertEqual(1, ttl_cache.get('a'))
+
+        with mock.patch('time.monotonic', return_value=60):
+            self.assertIsNone(ttl_cache.get('a'))
+
+    def test_load_during_clear_is_not_stored(self):
+        ttl_cache = cache.TTLCache(2, 60)
+
+        async def load() -> int:
+            ttl_cache.clear()
+            return 1
+
+        self.assertEqual(1, asyncio.run(ttl_cache.get_or_load_async('a', load)))
+        self.assertIsNone(ttl_cache.get('a'))
+
+    def test_catalog_hits_and_invalidation(self):
+        pass_id = self.ids['all-sports-pass']
+        event_id = self.ids['codejam-event']
+
+        with core.count_queries() as statements:
+            for _ in range(3):
+                response = self.client.get(f'/pass/{pass_id}/events', headers=self.headers)
+                self.assertEqual(200, response.status_code)
+                self.assertEqual(2, len(response.json()))
+
+        # Only the first read misses the cache: one query for the pass' event IDs and one for the events.
+        self.assertEqual(2, len(statements))
+        self.assertEqual(2, cache.catalog.hits)
+
+        response = self.client.post(f'/pass/{pass_id}/events/{event_id}', headers=self.headers)
+        self.assertEqual(200, response.status_code)
+
+        response = self.client.get(f'/pass/{pass_id}/events', headers=self.headers)
+        self.assertEqual(3, len(response.json()))
+
+        response = self.client.patch(f'/event/{event_id}', json={'venue': 'Library'}, headers=self.headers)
+        self.assertEqual(200, response.status_code)
+
+        response = self.client.get(f'/event/{event_id}', headers=self.headers)
+        self.assertEqual('Library', response.json()['venue'])
+
+        response = self.client.get('/cache', headers=self.headers)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(cache.catalog.stats(), response.json()['catalog'])
+
+    def test_conditional_reads(self):
+        response = self.client.get('/event/', headers=self.headers)
+        etag = response.headers['ETag']
+
+        with core.count_queries() as statements:
+            response = self.client.get('/event/', headers=self.headers | {'If-None-Match': etag})
+
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.content)
+        self.assertEqual(etag, response.headers['ETag'])
+        self.assertEqual(0, len(statements))
+
+        event_id = self.ids['codejam-event']
+        self.client.patch(f'/event/{event_id}', json={'venue': 'Auditorium'}, headers=self.headers)
+
+        response = self.client.get('/event/', headers=self.headers | {'If-None-Match': etag})
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response.headers['ETag'])
+
+        # Writes to other tables leave the tag alone, but the associations behind a pass' events change it.
+        pass_id = self.ids['all-sports-pass']
+        event_etag = self.client.get(f'/event/{event_id}', headers=self.headers).headers['ETag']
+        pass_events_etag = self.client.get(f'/pass/{pass_id}/events', headers=self.headers).headers['ETag']
+
+        self.client.delete(f'/pass/{pass_id}/events/{event_id}', headers=self.headers)
+
+        response = self.client.get(f'/event/{event_id}', headers=self.headers | {'If-None-Match': event_etag})
+        self.assertEqual(304, response.status_code)
+
+        headers = self.headers | {'If-None-Match': pass_events_etag}
+        response = self.client.get(f'/pass/{pass_id}/events', headers=headers)
+        self.assertEqual(200, response.status_code)
+
+    def test_conditional_reads_after_cascading_delete(self):
+        team_etag = self.client.get('/team/', headers=self.headers).headers['ETag']
+
+        # Deleting a user deletes the teams that they host.
+        self.client.delete(f'/user/{self.ids["john-smith-user"]}', headers=self.headers)
+
+        response = self.client.get('/team/', headers=self.headers | {'If-None-Match': team_etag})
+        self.assertEqual(200, response.status_code)
+
+    def test_encoded_list_responses(self):
+        response = self.client.get('/event/', headers=self.headers | {'Accept-Encoding': 'identity'})
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+        # Hits are served from the cached body, without reading the DB or encoding the page again.
+        with core.count_queries() as statements:
+            cached_response = self.client.get('/event/', headers=self.headers | {'Accept-Encoding': 'identity'})
+
+        self.assertEqual(0, len(statements))
+        self.assertEqual(response.content, cached_response.content)
+        self.assertEqual(response.headers['ETag'], cached_response.headers['ETag'])
+
+        # Pages of at least GZIP_MIN_SIZE bytes are also cached gzipped, under their own entity tag.
+        for _ in range(2):
+            self.client.post('/event/', json=EVENT_JSON, headers=self.headers)
+
+        response = self.client.get('/event/', headers=self.headers | {'Accept-Encoding': 'gzip'})
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertGreaterEqual(len(response.content), router.GZIP_MIN_SIZE)
+
+        headers = self.headers | {'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']}
+        self.assertEqual(304, self.client.get('/event/', headers=headers).status_code)
+
+        response = self.client.get('/event/', headers=self.headers | {'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertGreaterEqual(len(response.content), router.GZIP_MIN_SIZE)
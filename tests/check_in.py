@@ -0,0 +1,197 @@
+import concurrent.futures
+import time
+import unittest
+from unittest import mock
+
+import sqlalchemy
+from starlette.testclient import TestClient
+
+import main
+from db import admission, check_in
+from db.core import DBCheckIn
+from tests import core
+from tests.user import USER_JSON
+
+
+class CheckInTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def tearDown(self):
+        check_in.clear()
+
+        with core._test_session_local() as db:
+            db.execute(sqlalchemy.delete(DBCheckIn))
+            db.commit()
+
+    def check_in(self, event_id: str, user_id: str, client: TestClient = None):
+        return (client or self.client).post(f'/event/{event_id}/check-in/{user_id}', headers=self.headers)
+
+    def read_check_ins(self, user_id: str) -> list[tuple[str, bool]]:
+        with core._test_session_local() as db:
+            query = sqlalchemy.select(DBCheckIn.event_id, DBCheckIn.allowed).where(DBCheckIn.user_id == user_id)
+            return sorted(tuple(row) for row in db.execute(query))
+
+    def test_check_in(self):
+        user_id = self.ids['john-smith-user']
+
+        response = self.check_in(self.ids['track&field-event'], user_id)
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.json()['allowed'])
+
+        # Admission is decided in memory and the scan is only buffered, so the DB is not touched.
+        with core.count_queries() as statements:
+            response = self.check_in(self.ids['dj-night-event'], user_id)
+
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(response.json()['allowed'])
+        self.assertEqual(0, len(statements))
+        self.assertEqual([], self.read_check_ins(user_id))
+
+        with core._test_session_local() as db, core.count_queries() as statements:
+            self.assertEqual(2, check_in.flush(db))
+
+        self.assertEqual(1, len(statements))
+        self.assertEqual(
+            sorted([(self.ids['track&field-event'], True), (self.ids['dj-night-event'], False)]),
+            self.read_check_ins(user_id)
+        )
+
+    def test_check_in_deduplication(self):
+        user_id = self.ids['john-smith-user']
+        event_id = self.ids['dj-night-event']
+
+        for _ in range(3):
+            self.assertFalse(self.check_in(event_id, user_id).json()['allowed'])
+
+        self.client.patch(f'/user/{user_id}', json={'pass_id': '6kiwVr6USIyuIqWWWJJ_yg'}, headers=self.headers)
+
+        try:
+            # A different outcome is a new scan rather than a repeat of the last one.
+            self.assertTrue(self.check_in(event_id, user_id).json()['allowed'])
+
+        finally:
+            self.client.patch(f'/user/{user_id}', json={'pass_id': self.ids['all-sports-pass']}, headers=self.headers)
+
+        with core._test_session_local() as db:
+            self.assertEqual(2, check_in.flush(db))
+
+        self.assertEqual([(event_id, False), (event_id, True)], self.read_check_ins(user_id))
+
+    def test_check_in_flush_rows(self):
+        user_id = self.ids['john-smith-user']
+
+        with mock.patch.object(check_in, 'FLUSH_ROWS', 2):
+            self.check_in(self.ids['track&field-event'], user_id)
+            self.assertEqual([], self.read_check_ins(user_id))
+
+            self.check_in(self.ids['dj-night-event'], user_id)
+            self.assertEqual(2, len(self.read_check_ins(user_id)))
+
+    def test_check_in_flush_on_shutdown(self):
+        user_id = self.ids['john-smith-user']
+
+        with mock.patch.object(check_in, 'FLUSH_INTERVAL_SECONDS', 60), TestClient(main.app) as client:
+            self.assertEqual(200, self.check_in(self.ids['track&field-event'], user_id, client).status_code)
+            self.assertEqual([], self.read_check_ins(user_id))
+
+        self.assertEqual([(self.ids['track&field-event'], True)], self.read_check_ins(user_id))
+
+    def test_check_in_writer_errors_logged(self):
+        def session_factory():
+            raise sqlalchemy.exc.OperationalError('INSERT', {}, Exception('Connection lost.'))
+
+        self.check_in(self.ids['track&field-event'], self.ids['john-smith-user'])
+
+        with mock.patch.object(check_in, 'FLUSH_INTERVAL_SECONDS', 0.01), self.assertLogs(check_in._logger) as logs:
+            check_in.start(session_factory)
+            time.sleep(0.05)
+            check_in.stop()
+
+        self.assertIn('Failed to flush 1 check-ins; retrying in 0.01s.', logs.output[0])
+        self.assertIn('Failed to flush check-ins on shutdown; dropped 1 check-ins.', logs.output[-1])
+
+    def test_check_in_not_found(self):
+        self.assertEqual(404, self.check_in(self.ids['dj-night-event'], 'missing-user').status_code)
+        self.assertEqual(404, self.check_in('missing-event', self.ids['john-smith-user']).status_code)
+
+    def test_check_in_of_deleted_user(self):
+        user_id = self.ids['john-smith-user']
+        event_id = self.ids['track&field-event']
+        response = self.client.post('/user/', json=USER_JSON, headers=self.headers)
+        deleted_user_id = response.json()['id']
+
+        self.check_in(event_id, user_id)
+        self.check_in(event_id, deleted_user_id)
+        self.client.delete(f'/user/{deleted_user_id}', headers=self.headers)
+
+        # SQLite only enforces foreign keys when asked to, once per connection and outside of a transaction.
+        with core._test_session_local() as db:
+            db.execute(sqlalchemy.text('PRAGMA foreign_keys = ON'))
+
+            try:
+                self.assertEqual(1, check_in.flush(db))
+
+            finally:
+                db.execute(sqlalchemy.text('PRAGMA foreign_keys = OFF'))
+
+        self.assertEqual([(event_id, True)], self.read_check_ins(user_id))
+        self.assertEqual([], self.read_check_ins(deleted_user_id))
+
+        # The dropped scan no longer blocks the buffer.
+        self.check_in(self.ids['dj-night-event'], user_id)
+
+        with core._test_session_local() as db:
+            self.assertEqual(1, check_in.flush(db))
+
+    def test_check_in_flush_error(self):
+        user_id = self.ids['john-smith-user']
+        error = sqlalchemy.exc.OperationalError('INSERT', {}, Exception('Connection lost.'))
+
+        with mock.patch.object(check_in, 'FLUSH_ROWS', 1), mock.patch.object(check_in, 'MAX_BUFFER_ROWS', 1), \
+                mock.patch.object(sqlalchemy.orm.Session, 'commit', side_effect=error):
+            self.assertEqual(200, self.check_in(self.ids['track&field-event'], user_id).status_code)
+            self.assertEqual(200, self.check_in(self.ids['dj-night-event'], user_id).status_code)
+
+        # The rows stay buffered for a later flush, up to the limit, which drops the oldest.
+        with core._test_session_local() as db:
+            self.assertEqual(1, check_in.flush(db))
+
+        self.assertEqual([(self.ids['dj-night-event'], False)], self.read_check_ins(user_id))
+
+    def test_admission_single_flight_load(self):
+        user_id = self.ids['john-smith-user']
+        load = admission.load
+        loads = []
+
+        def slow_load(session):
+            loads.append(session)
+            time.sleep(0.05)
+            load(session)
+
+        def read_user_pass():
+            with core._test_session_local() as session:
+                return admission.read_user_pass(user_id, session)
+
+        with core._test_session_local() as db:
+            admission.load(db)
+            pass_id = admission.read_user_pass(user_id, db)
+
+        # Once the index outlives its TTL, one thread reloads it while the others keep using the stale one.
+        with mock.patch.object(admission, '_expires_at', time.monotonic() - 1), \
+                mock.patch.object(admission, 'load', side_effect=slow_load):
+            with concurrent.futures.ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(lambda _: read_user_pass(), range(8)))
+
+        self.assertEqual([pass_id] * 8, results)
+        self.assertEqual(1, len(loads))
@@ -1,19 +1,27 @@
 """Generate the DB schema and SQLAlchemy session for testing."""
+import contextlib
 import os
-from typing import Generator
+from typing import AsyncGenerator, Generator, Iterator
 
 import sqlalchemy
 from fastapi import FastAPI
-from sqlalchemy import StaticPool, orm
+from sqlalchemy import NullPool, StaticPool, orm
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session
 
-from db import core
+from db import access_index, admission, bloom, cache, check_in, core, versions
 from db.core import DBBase, DBPass, DBEvent, DBPassEvent, DBTeam, DBTeamEvent, DBTeamUser, DBUser
 
-_DATABASE_URL = 'sqlite:///:memory:'
+# Shared-cache in-memory DB so that the sync and async engines both see the same tables and rows.
+_DATABASE_URL = 'sqlite:///file:fest_test?mode=memory&cache=shared&uri=true'
+_ASYNC_DATABASE_URL = 'sqlite+aiosqlite:///file:fest_test?mode=memory&cache=shared&uri=true'
+
 _test_engine = sqlalchemy.create_engine(_DATABASE_URL, connect_args={'check_same_thread': False}, poolclass=StaticPool)
 _test_session_local = orm.sessionmaker(autocommit=False, autoflush=False, bind=_test_engine)
 
+_test_async_engine = create_async_engine(_ASYNC_DATABASE_URL, poolclass=NullPool)
+_test_async_session_local = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=_test_async_engine)
+
 
 def get_test_db() -> Generator[Session, None, None]:
     """
@@ -30,9 +38,29 @@ def get_test_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_test_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a current async test DB session as a generator. The session is automatically closed after it is used.
+
+    :return: The current async test DB session.
+    :rtype: AsyncGenerator[AsyncSession, None]
+    """
+    db = _test_async_session_local()
+
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
 # noinspection SpellCheckingInspection
-def create_default_test_db():
-    """Create some default test data; useful for testing associations between entities."""
+def create_default_test_db(session_local: orm.sessionmaker = _test_session_local):
+    """
+    Create some default test data; useful for testing associations between entities.
+
+    :param session_local: Session factory of the DB in which the data is created; the test DB by default.
+    :type session_local: orm.sessionmaker
+    """
     events = [
         {
             "name": "DJ Night",
@@ -249,7 +277,7 @@ def create_default_test_db():
         }
     ]
 
-    db = _test_session_local()
+    db = session_local()
 
     db.execute(sqlalchemy.insert(DBEvent).values(events))
     db.execute(sqlalchemy.insert(DBPass).values(passes))
@@ -273,12 +301,43 @@ def get_default_db_ids() -> dict[str, str]:
     # noinspection SpellCheckingInspection
     return {
         'track&field-event': 'BR2PlUXzRKO8FKwsq3oh5Q',
+        'codejam-event': 'qkjB9pe1QNqn-HeZyJHhtg',
+        'dj-night-event': 'TSK4dI3xTaCMBNqVCF_whg',
+        'e-sports-mania-event': 'lu943W-NRQC5TvVLQOBA1w',
         'all-sports-pass': 'v1rYrkgMQ92a96ri8Xmegg',
         'sports-champs-team': 'yNWqAe1qSOGKzUq6o1XkTw',
-        'john-smith-user': '5hYNA08sSUmQKV91kqTFvQ'
+        'stardust-crusaders-team': 'ETjnsxhqRsGNFqEV_ZuCuA',
+        'diamonds-are-forever-team': '5yZJrI-yTmqcKM6pR1BIbQ',
+        'john-smith-user': '5hYNA08sSUmQKV91kqTFvQ',
+        'jane-doe-user': 'tZcRIaIpTeuap8n7L8vqOw'
     }
 
 
+@contextlib.contextmanager
+def count_queries() -> Iterator[list[str]]:
+    """
+    Record every SQL statement executed against the sync and async test DBs while the context is active.
+
+    :return: Executed SQL statements; filled in as the statements run.
+    :rtype: Iterator[list[str]]
+    """
+    statements: list[str] = []
+
+    def record(_connection, _cursor, statement, *_):
+        statements.append(statement)
+
+    engines = (_test_engine, _test_async_engine.sync_engine)
+
+    for engine in engines:
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', record)
+
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            sqlalchemy.event.remove(engine, 'before_cursor_execute', record)
+
+
 def get_default_headers() -> dict[str, str]:
     return {
         'Authorization': f'Bearer {os.getenv("BEARER_TOKEN")}'
@@ -294,9 +353,17 @@ def setup_tests(app: FastAPI):
     """
     # noinspection PyUnresolvedReferences
     app.dependency_overrides[core.get_db] = get_test_db
+    # noinspection PyUnresolvedReferences
+    app.dependency_overrides[core.get_async_db] = get_test_async_db
     DBBase.metadata.create_all(bind=_test_engine)
 
 
 def teardown_tests():
-    """Drop all tables from the schema."""
+    """Drop all tables from the schema and clear the caches, indexes and buffers that were filled from them."""
     DBBase.metadata.drop_all(bind=_test_engine)
+    cache.catalog.clear()
+    access_index.invalidate()
+    admission.invalidate()
+    bloom.invalidate()
+    check_in.clear()
+    versions.reset()
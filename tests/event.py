@@ -78,7 +78,7 @@ class EventTest(unittest.TestCase):
         self.assertEqual(200, response.status_code)
         self.assertIsNotNone(response.text)
 
-        data = response.json()
+        data = response.json()['items']
         self.assertEqual(2, len(data))
 
         self.assert_event_is_equal(
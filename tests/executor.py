@@ -0,0 +1,34 @@
+import unittest
+from unittest import mock
+
+from starlette.testclient import TestClient
+
+import main
+from db import executor
+from tests import core
+
+
+class ExecutorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def test_saturated_executor(self):
+        with mock.patch.object(executor, '_mode', executor.THREAD_MODE), \
+                mock.patch.object(executor, '_max_workers', 0), mock.patch.object(executor, '_max_queue_depth', 0):
+            response = self.client.get(f'/event/{self.ids["track&field-event"]}/teams/users', headers=self.headers)
+
+        self.assertEqual(503, response.status_code)
+        self.assertEqual(str(executor.RETRY_AFTER_SECONDS), response.headers['Retry-After'])
+
+        response = self.client.get(f'/event/{self.ids["track&field-event"]}/teams/users', headers=self.headers)
+        self.assertEqual(200, response.status_code)
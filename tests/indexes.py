@@ -0,0 +1,159 @@
+import os
+import unittest
+from typing import Any, Callable
+
+import sqlalchemy
+from sqlalchemy import Engine, orm
+from sqlalchemy.orm import Session
+
+from db import access_index, associations, bloom, event, pass_, support_ticket, team, user
+from db.core import DBBase, SupportTicketCategory
+from tests import core
+
+_IDS = core.get_default_db_ids()
+
+# Every filtered db-layer lookup; full-table reads like `read_all_db` are deliberately left out.
+_QUERIES: dict[str, Callable[[Session], Any]] = {
+    'event.read_db': lambda db: event.read_db(_IDS['track&field-event'], db),
+    'event.read_by_ids_db': lambda db: event.read_by_ids_db([_IDS['track&field-event']], db),
+    'event.read_models_by_ids_db': lambda db: event.read_models_by_ids_db([_IDS['track&field-event']], db),
+    'pass_.read_by_ids_db': lambda db: pass_.read_by_ids_db([_IDS['all-sports-pass']], db),
+    'pass_.read_models_by_ids_db': lambda db: pass_.read_models_by_ids_db([_IDS['all-sports-pass']], db),
+    'team.read_by_ids_db': lambda db: team.read_by_ids_db([_IDS['sports-champs-team']], db),
+    'team.read_models_by_ids_db': lambda db: team.read_models_by_ids_db([_IDS['sports-champs-team']], db),
+    'user.read_by_ids_db': lambda db: user.read_by_ids_db([_IDS['john-smith-user']], db),
+    'user.read_models_by_ids_db': lambda db: user.read_models_by_ids_db([_IDS['john-smith-user']], db),
+    'user.read_id_from_email_address_db': lambda db: user.read_id_from_email_address_db(
+        'john.smith2025@learner.manipal.edu', db
+    ),
+    'user.read_ids_from_phone_number_db': lambda db: user.read_ids_from_phone_number_db('9876543210', db),
+    'user.read_id_from_mahe_registration_number_db': lambda db: user.read_id_from_mahe_registration_number_db(
+        225805000, db
+    ),
+    'user.read_pass_db': lambda db: user.read_pass_db(_IDS['john-smith-user'], db),
+    'user.read_events_organizer_db': lambda db: user.read_events_organizer_db(_IDS['john-smith-user'], db),
+    'user.read_teams_host_db': lambda db: user.read_teams_host_db(_IDS['john-smith-user'], db),
+    'support_ticket.read_all_by_email_address': lambda db: support_ticket.read_all_by_email_address(
+        'john.smith2025@learner.manipal.edu', db
+    ),
+    'support_ticket.read_all_by_category': lambda db: support_ticket.read_all_by_category(
+        SupportTicketCategory.PASSES, db
+    ),
+    'associations.read_pass_events_db': lambda db: associations.read_pass_events_db(_IDS['all-sports-pass'], db),
+    'associations.read_event_passes_db': lambda db: associations.read_event_passes_db(_IDS['track&field-event'], db),
+    'associations.read_team_users_db': lambda db: associations.read_team_users_db(_IDS['sports-champs-team'], db),
+    'associations.read_user_teams_db': lambda db: associations.read_user_teams_db(_IDS['john-smith-user'], db),
+    'associations.read_team_events_db': lambda db: associations.read_team_events_db(_IDS['sports-champs-team'], db),
+    'associations.read_event_teams_db': lambda db: associations.read_event_teams_db(_IDS['track&field-event'], db),
+    'associations.read_event_teams_users_db': lambda db: associations.read_event_teams_users_db(
+        _IDS['track&field-event'], db
+    ),
+    'associations.read_user_events_db': lambda db: associations.read_user_events_db(_IDS['john-smith-user'], db),
+    'associations.read_event_users_db': lambda db: associations.read_event_users_db(_IDS['dj-night-event'], db),
+    'associations._validate_user_for_event': lambda db: associations._validate_user_for_event(
+        _IDS['john-smith-user'], _IDS['track&field-event'], db
+    ),
+    'associations._validate_team_users_for_event': lambda db: associations._validate_team_users_for_event(
+        _IDS['sports-champs-team'], _IDS['track&field-event'], False, db
+    ),
+    'associations._read_ineligible_team_event': lambda db: associations._read_ineligible_team_event(
+        _IDS['jane-doe-user'], _IDS['sports-champs-team'], db
+    ),
+}
+
+
+def _capture_statements(engine: Engine, session_local: orm.sessionmaker, query: Callable[[Session], Any]):
+    """
+    Run a db-layer query and capture the SQL statements it executes along with their parameters.
+
+    :param engine: Engine that the session factory is bound to.
+    :type engine: Engine
+    :param session_local: Session factory for the DB.
+    :type session_local: orm.sessionmaker
+    :param query: db-layer query to run.
+    :type query: Callable[[Session], Any]
+
+    :return: Executed SQL statements and their parameters.
+    :rtype: list[tuple[str, Any]]
+    """
+    statements = []
+
+    def record(_connection, _cursor, statement, parameters, *_):
+        statements.append((statement, parameters))
+
+    sqlalchemy.event.listen(engine, 'before_cursor_execute', record)
+    db = session_local()
+
+    try:
+        query(db)
+    finally:
+        db.close()
+        sqlalchemy.event.remove(engine, 'before_cursor_execute', record)
+
+    return statements
+
+
+class SQLiteIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        DBBase.metadata.create_all(bind=core._test_engine)
+        core.create_default_test_db()
+
+        # Eligibility checks read pass-event associations from the access index, and reads reject unknown IDs with the
+        # ID filters, both of which are loaded by deliberate scans.
+        with core._test_session_local() as db:
+            access_index.load(db)
+            bloom.load(db)
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def test_no_full_table_scans(self):
+        for name, query in _QUERIES.items():
+            with self.subTest(query=name):
+                statements = _capture_statements(core._test_engine, core._test_session_local, query)
+                self.assertNotEqual(0, len(statements))
+
+                with core._test_engine.connect() as connection:
+                    for statement, parameters in statements:
+                        plan = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+                        details = [row[-1] for row in plan]
+
+                        self.assertFalse(any(detail.startswith('SCAN ') for detail in details), details)
+
+
+@unittest.skipUnless(os.getenv('TEST_POSTGRES_URL'), 'TEST_POSTGRES_URL is not set.')
+class PostgresIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = sqlalchemy.create_engine(os.getenv('TEST_POSTGRES_URL'))
+        cls.session_local = orm.sessionmaker(autocommit=False, autoflush=False, bind=cls.engine)
+
+        DBBase.metadata.create_all(bind=cls.engine)
+        core.create_default_test_db(cls.session_local)
+
+        with cls.session_local() as db:
+            access_index.load(db)
+            bloom.load(db)
+
+    @classmethod
+    def tearDownClass(cls):
+        DBBase.metadata.drop_all(bind=cls.engine)
+        cls.engine.dispose()
+        access_index.invalidate()
+        bloom.invalidate()
+
+    def test_no_full_table_scans(self):
+        for name, query in _QUERIES.items():
+            with self.subTest(query=name):
+                statements = _capture_statements(self.engine, self.session_local, query)
+                self.assertNotEqual(0, len(statements))
+
+                with self.engine.connect() as connection:
+                    # The test tables are tiny, so sequential scans must be discouraged to tell whether an index fits.
+                    connection.exec_driver_sql('SET enable_seqscan = off')
+
+                    for statement, parameters in statements:
+                        plan = connection.exec_driver_sql(f'EXPLAIN {statement}', parameters).scalars().all()
+                        self.assertFalse(any('Seq Scan' in line for line in plan), plan)
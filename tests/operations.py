@@ -0,0 +1,71 @@
+import unittest
+
+from starlette.testclient import TestClient
+
+import main
+from db import event, pass_, team, user
+from db.event import Event
+from db.pass_ import Pass
+from db.team import Team
+from db.user import User
+from tests import core
+
+
+class OperationsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def test_read_models_by_ids(self):
+        reads = {
+            event: (Event, [self.ids['track&field-event'], self.ids['codejam-event']]),
+            pass_: (Pass, [self.ids['all-sports-pass']]),
+            team: (Team, [self.ids['sports-champs-team']]),
+            user: (User, [self.ids['john-smith-user'], self.ids['jane-doe-user']])
+        }
+
+        with core._test_session_local() as db:
+            for module, (model, ids) in reads.items():
+                with self.subTest(module=module.__name__):
+                    models = sorted(module.read_models_by_ids_db([*ids, 'missing-id'], db), key=lambda item: item.id)
+                    db_items = sorted(module.read_by_ids_db(ids, db), key=lambda item: item.id)
+
+                    self.assertEqual(len(ids), len(models))
+                    self.assertEqual([model.model_validate(db_item) for db_item in db_items], models)
+
+    def test_sparse_fieldsets(self):
+        team_id = self.ids['sports-champs-team']
+
+        with core.count_queries() as statements:
+            response = self.client.get(f'/team/{team_id}/users?fields=last_name,id,first_name', headers=self.headers)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([['first_name', 'last_name', 'id']] * 2, [list(item) for item in response.json()])
+        # The users are read last, and only the requested columns are selected.
+        self.assertNotIn('email_address', statements[-1])
+
+        response = self.client.get('/user/?limit=1&fields=first_name', headers=self.headers)
+        page = response.json()
+        self.assertEqual([['first_name']], [list(item) for item in page['items']])
+
+        response = self.client.get(
+            f'/user/?limit=1&fields=first_name&cursor={page["next_cursor"]}', headers=self.headers
+        )
+        self.assertEqual(['first_name'], list(response.json()['items'][0]))
+
+        response = self.client.get(f'/event/{self.ids["codejam-event"]}?fields=name,venue', headers=self.headers)
+        self.assertEqual(['name', 'venue'], list(response.json()))
+
+        for fields in ('password', 'name,password', ''):
+            with self.subTest(fields=fields):
+                response = self.client.get(f'/team/{team_id}/users?fields={fields}', headers=self.headers)
+                self.assertEqual(400, response.status_code)
@@ -1,3 +1,4 @@
+import json
 import unittest
 from decimal import Decimal
 from typing import Any, Optional
@@ -64,8 +65,38 @@ class PassTest(unittest.TestCase):
         self.assertEqual(200, response.status_code)
         self.assertIsNotNone(response.text)
 
-        data = response.json()
+        data = response.json()['items']
+        self.assertEqual(2, len(data))
+
+        self.assert_pass_is_equal(data[0], PASS_JSON['name'], PASS_JSON['description'], '299.00')
+        self.assert_pass_is_equal(data[1], PASS_JSON['name'], PASS_JSON['description'], '299.00')
+
+    def test_3_read_all_passes_paginated(self):
+        response = self.client.get('/pass/?limit=1', headers=self.headers)
+        self.assertEqual(200, response.status_code)
+
+        first_page = response.json()
+        self.assertEqual(1, len(first_page['items']))
+        self.assertIsNotNone(first_page['next_cursor'])
+
+        response = self.client.get(f'/pass/?limit=1&cursor={first_page["next_cursor"]}', headers=self.headers)
+        self.assertEqual(200, response.status_code)
+
+        second_page = response.json()
+        self.assertEqual(1, len(second_page['items']))
+        self.assertIsNone(second_page['next_cursor'])
+        self.assertNotEqual(first_page['items'][0]['id'], second_page['items'][0]['id'])
+
+    def test_3_read_all_passes_ndjson(self):
+        headers = {**self.headers, 'Accept': 'application/x-ndjson'}
+
+        response = self.client.get('/pass/', headers=headers)
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.headers['content-type'].startswith('application/x-ndjson'))
+
+        data = [json.loads(line) for line in response.text.splitlines()]
         self.assertEqual(2, len(data))
+        self.assertLess(data[0]['id'], data[1]['id'])
 
         self.assert_pass_is_equal(data[0], PASS_JSON['name'], PASS_JSON['description'], '299.00')
         self.assert_pass_is_equal(data[1], PASS_JSON['name'], PASS_JSON['description'], '299.00')
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import unittest
+import zipfile
+from unittest import mock
+
+from starlette.testclient import TestClient
+
+import main
+from db import qr_code
+from tests import core
+
+
+class QRCodeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def test_event_users_qr_codes(self):
+        user_id = self.ids['jane-doe-user']
+        event_id = self.ids['dj-night-event']
+
+        self.client.post(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+
+        try:
+            response = self.client.get(f'/event/{event_id}/users/qr_codes', headers=self.headers)
+            self.assertEqual(200, response.status_code)
+            self.assertEqual('application/zip', response.headers['content-type'])
+
+            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+                self.assertEqual([f'{user_id}.png'], zip_file.namelist())
+                self.assertEqual(qr_code.render_png(user_id), zip_file.read(f'{user_id}.png'))
+
+        finally:
+            self.client.delete(f'/user/{user_id}/events/{event_id}', headers=self.headers)
+
+        # Team hosts and members are attendees too.
+        response = self.client.get(
+            f'/event/{self.ids["track&field-event"]}/users/qr_codes?format=svg', headers=self.headers
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/zip', response.headers['content-type'])
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+            self.assertEqual(['page-0001.svg'], zip_file.namelist())
+            self.assertEqual(2, zip_file.read('page-0001.svg').decode().count('class="segno"'))
+
+        response = self.client.get('/event/missing-event/users/qr_codes', headers=self.headers)
+        self.assertEqual(404, response.status_code)
+
+    def test_svg_pages(self):
+        async def read_pages(payloads: list[str]) -> list[str]:
+            content = b''.join([chunk async for chunk in qr_code.stream_svg_pages_async(payloads, 4)])
+
+            with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
+                return [zip_file.read(name).decode() for name in zip_file.namelist()]
+
+        per_page = qr_code.SHEET_COLUMNS * qr_code.SHEET_ROWS
+
+        cases = ((0, []), (1, [1]), (per_page, [per_page]), (2 * per_page + 1, [per_page, per_page, 1]))
+
+        with mock.patch.object(qr_code, '_workers', 0):
+            for codes, page_codes in cases:
+                with self.subTest(codes=codes):
+                    pages = asyncio.run(read_pages([f'user-{i}' for i in range(codes)]))
+
+                    self.assertEqual(page_codes, [page.count('class="segno"') for page in pages])
+                    self.assertTrue(all('width="210mm" height="297mm"' in page for page in pages))
+
+    def test_users_qr_codes(self):
+        user_ids = [self.ids['jane-doe-user'], self.ids['john-smith-user'], self.ids['jane-doe-user']]
+
+        response = self.client.post('/user/qr_codes?scale=2', json=user_ids, headers=self.headers)
+        self.assertEqual(200, response.status_code)
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+            self.assertEqual([f'{user_id}.png' for user_id in user_ids[:2]], zip_file.namelist())
+            self.assertEqual(qr_code.render_png(user_ids[1], 2), zip_file.read(f'{user_ids[1]}.png'))
+
+        response = self.client.post('/user/qr_codes', json=[*user_ids, 'missing-user'], headers=self.headers)
+        self.assertEqual(404, response.status_code)
+        self.assertIn('missing-user', response.json()['detail'])
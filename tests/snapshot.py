@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from starlette.testclient import TestClient
+
+import main
+from db import snapshot
+from db.snapshot_reader import Snapshot, SnapshotFormatError
+from tests import core
+
+ALL_ACCESS_PASS_ID = '6kiwVr6USIyuIqWWWJJ_yg'
+
+
+class SnapshotTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.patch = mock.patch.object(snapshot, 'SNAPSHOT_DIR', self.directory.name)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.directory.cleanup()
+
+    def read_snapshot(self, since: int = None):
+        params = {} if since is None else {'since': since}
+        return self.client.get('/gate/snapshot', params=params, headers=self.headers)
+
+    def write_snapshot(self, data: bytes) -> str:
+        path = os.path.join(self.directory.name, 'gate.snapshot')
+
+        with open(path, 'wb') as file:
+            file.write(data)
+
+        return path
+
+    def test_snapshot(self):
+        response = self.read_snapshot()
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/octet-stream', response.headers['content-type'])
+
+        with Snapshot(self.write_snapshot(response.content)) as gate_snapshot:
+            self.assertEqual(int(response.headers['x-snapshot-version']), gate_snapshot.version)
+
+            john_id = self.ids['john-smith-user']
+            self.assertEqual(self.ids['all-sports-pass'], gate_snapshot.read_user_pass(john_id))
+            self.assertTrue(gate_snapshot.can_access(john_id, self.ids['track&field-event']))
+            self.assertFalse(gate_snapshot.can_access(john_id, self.ids['dj-night-event']))
+            self.assertTrue(gate_snapshot.can_access(self.ids['jane-doe-user'], self.ids['dj-night-event']))
+
+            self.assertFalse(gate_snapshot.can_access('missing-user', self.ids['track&field-event']))
+            self.assertFalse(gate_snapshot.can_access(john_id, 'missing-event'))
+
+            with self.assertRaises(KeyError):
+                gate_snapshot.read_user_pass('missing-user')
+
+        # Exporting again without any change reuses the stored snapshot.
+        self.assertEqual(response.content, self.read_snapshot().content)
+
+    def test_snapshot_delta(self):
+        base = self.read_snapshot()
+        since = int(base.headers['x-snapshot-version'])
+        john_id = self.ids['john-smith-user']
+
+        self.client.patch(f'/user/{john_id}', json={'pass_id': ALL_ACCESS_PASS_ID}, headers=self.headers)
+
+        try:
+            response = self.read_snapshot(since)
+
+        finally:
+            self.client.patch(f'/user/{john_id}', json={'pass_id': self.ids['all-sports-pass']}, headers=self.headers)
+
+        self.assertEqual(200, response.status_code)
+        self.assertLess(len(response.content), len(base.content))
+
+        with Snapshot(self.write_snapshot(base.content)) as gate_snapshot:
+            self.assertFalse(gate_snapshot.can_access(john_id, self.ids['dj-night-event']))
+
+            gate_snapshot.apply(response.content)
+
+            self.assertEqual(int(response.headers['x-snapshot-version']), gate_snapshot.version)
+            self.assertTrue(gate_snapshot.can_access(john_id, self.ids['dj-night-event']))
+            self.assertEqual(ALL_ACCESS_PASS_ID, gate_snapshot.read_user_pass(self.ids['jane-doe-user']))
+
+            # The delta only applies to the version it was exported since.
+            with self.assertRaises(SnapshotFormatError):
+                gate_snapshot.apply(response.content)
+
+    def test_snapshot_delta_errors(self):
+        self.assertEqual(404, self.read_snapshot(1).status_code)
+
+        with mock.patch.object(snapshot, 'SNAPSHOT_DIR', None):
+            self.assertEqual(501, self.read_snapshot(1).status_code)
+
+        with self.assertRaises(SnapshotFormatError):
+            Snapshot(self.write_snapshot(b'not a snapshot'))
@@ -5,11 +5,20 @@ import unittest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from tests.associations import AssociationTest
+from tests.bloom import BloomTest
+from tests.cache import CacheTest
+from tests.check_in import CheckInTest
 from tests.event import EventTest
+from tests.executor import ExecutorTest
+from tests.indexes import PostgresIndexTest, SQLiteIndexTest
+from tests.operations import OperationsTest
 from tests.pass_ import PassTest
+from tests.qr_code import QRCodeTest
+from tests.snapshot import SnapshotTest
 from tests.support_ticket import SupportTicketTest
 from tests.team import TeamTest
-from tests.user import UserTest
+from tests.ticket import TicketTest
+from tests.user import UserOverviewTest, UserTest
 
 
 def create_suite() -> unittest.TestSuite:
@@ -21,7 +30,18 @@ def create_suite() -> unittest.TestSuite:
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(SupportTicketTest))
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TeamTest))
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(UserTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(UserOverviewTest))
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(AssociationTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(OperationsTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(QRCodeTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(ExecutorTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(CacheTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(BloomTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TicketTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(CheckInTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(SnapshotTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(SQLiteIndexTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(PostgresIndexTest))
 
     return suite
 
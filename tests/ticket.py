@@ -0,0 +1,143 @@
+import os
+import unittest
+from unittest import mock
+
+from starlette.testclient import TestClient
+
+import main
+from db import access_index, admission, ticket
+from db.ticket import Ticket, TicketInvalidError
+from tests import core
+
+KEY = 'test-signing-key'
+
+
+@mock.patch.dict(os.environ, {'QR_CODE_SIGNING_KEY': KEY})
+class TicketTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+        # Verification checks the event against the gate index, which is loaded once rather than counted per test.
+        with core._test_session_local() as db:
+            admission.validate_event(cls.ids['dj-night-event'], db)
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def create_payload(self, user_id: str) -> str:
+        with core._test_session_local() as db:
+            return ticket.create_db(user_id, db)
+
+    def test_sign_and_read(self):
+        signed_ticket = Ticket(user_id='user', pass_id=None, version='version', expires_at=2_000_000_000)
+        payload = ticket.sign(signed_ticket, KEY.encode())
+
+        self.assertEqual(signed_ticket, ticket.read(payload, KEY.encode(), now=1_999_999_999))
+
+        with self.assertRaises(TicketInvalidError):
+            ticket.read(payload, KEY.encode(), now=2_000_000_000)
+
+        with self.assertRaises(TicketInvalidError):
+            ticket.read(payload.replace('.user.', '.resu.'), KEY.encode(), now=0)
+
+        with self.assertRaises(TicketInvalidError):
+            ticket.read(payload, b'other-key', now=0)
+
+        with self.assertRaises(TicketInvalidError):
+            ticket.read(self.ids['john-smith-user'], KEY.encode(), now=0)
+
+    def test_verify_without_db(self):
+        payload = self.create_payload(self.ids['john-smith-user'])
+
+        with core.count_queries() as statements:
+            response = self.client.post(
+                f'/event/{self.ids["track&field-event"]}/verify', json={'payload': payload}, headers=self.headers
+            )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'user_id': self.ids['john-smith-user'], 'allowed': True}, response.json())
+        self.assertEqual(0, len(statements))
+
+        response = self.client.post(
+            f'/event/{self.ids["dj-night-event"]}/verify', json={'payload': payload}, headers=self.headers
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(response.json()['allowed'])
+
+        response = self.client.post(
+            f'/event/{self.ids["dj-night-event"]}/verify', json={'payload': f'{payload}x'}, headers=self.headers
+        )
+        self.assertEqual(400, response.status_code)
+
+    def test_verify_unknown_event(self):
+        payload = self.create_payload(self.ids['john-smith-user'])
+
+        response = self.client.post('/event/NOPE/verify', json={'payload': payload}, headers=self.headers)
+        self.assertEqual(404, response.status_code)
+
+    def test_verify_stale_version(self):
+        with core._test_session_local() as db:
+            version = access_index.read_version(db)
+
+        stale_ticket = Ticket(
+            user_id=self.ids['jane-doe-user'], pass_id=self.ids['all-sports-pass'], version=f'not-{version}',
+            expires_at=4_000_000_000
+        )
+        payload = ticket.sign(stale_ticket, KEY.encode())
+
+        # The stale payload claims the All Sports pass, but the user's current All Access pass is read from the index.
+        with core.count_queries() as statements:
+            response = self.client.post(
+                f'/event/{self.ids["dj-night-event"]}/verify', json={'payload': payload}, headers=self.headers
+            )
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.json()['allowed'])
+        self.assertEqual(0, len(statements))
+
+    def test_verify_revoked_pass(self):
+        user_id = self.ids['john-smith-user']
+        event_id = self.ids['track&field-event']
+        payload = self.create_payload(user_id)
+        pass_id = self.client.get(f'/user/{user_id}', headers=self.headers).json()['pass_id']
+
+        self.client.patch(f'/user/{user_id}', json={'pass_id': None}, headers=self.headers)
+
+        try:
+            response = self.client.post(f'/event/{event_id}/verify', json={'payload': payload}, headers=self.headers)
+
+            self.assertEqual(200, response.status_code)
+            self.assertFalse(response.json()['allowed'])
+
+        finally:
+            self.client.patch(f'/user/{user_id}', json={'pass_id': pass_id}, headers=self.headers)
+
+    def test_verify_non_ascii_payload(self):
+        payload = self.create_payload(self.ids['john-smith-user'])
+
+        response = self.client.post(
+            f'/event/{self.ids["track&field-event"]}/verify', json={'payload': f'{payload[:-1]}é'},
+            headers=self.headers
+        )
+        self.assertEqual(400, response.status_code)
+
+    def test_signed_qr_code(self):
+        response = self.client.get(f'/user/{self.ids["jane-doe-user"]}/qr_code/signed', headers=self.headers)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('image/png', response.headers['content-type'])
+
+        response = self.client.get('/user/missing-user/qr_code/signed', headers=self.headers)
+        self.assertEqual(404, response.status_code)
+
+        with mock.patch.dict(os.environ, {'QR_CODE_SIGNING_KEY': ''}):
+            response = self.client.get(f'/user/{self.ids["jane-doe-user"]}/qr_code/signed', headers=self.headers)
+
+        self.assertEqual(501, response.status_code)
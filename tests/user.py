@@ -1,11 +1,15 @@
 import datetime
+import os
+import tempfile
 import unittest
 from decimal import Decimal
 from typing import Any, Optional
+from unittest import mock
 
 from starlette.testclient import TestClient
 
 import main
+from db import qr_code
 from db.core import EventType
 from tests import core
 
@@ -92,6 +96,17 @@ class UserTest(unittest.TestCase):
             USER_JSON['phone_number'], USER_JSON['mahe_registration_number'], USER_JSON['pass_id']
         )
 
+    def test_02_read_all_users(self):
+        response = self.client.get('/user/', headers=self.headers)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/json', response.headers['Content-Type'])
+
+        data = response.json()
+
+        self.assertIsNone(data['next_cursor'])
+        self.assertEqual([self.client.get(f'/user/{USER_ID}', headers=self.headers).json()], data['items'])
+
     def test_03_read_user_id(self):
         response = self.client.get(
             '/user/id', params={'email_address': USER_JSON['email_address']}, headers=self.headers
@@ -219,6 +234,46 @@ class UserTest(unittest.TestCase):
             self.assertEqual(TEAM_1_JSON['name'], data[1]['name'])
             self.assertEqual(TEAM_1_JSON['host_id'], data[1]['host_id'])
 
+    def test_10_read_qr_code(self):
+        response = self.client.get(f'/user/{USER_ID}/qr_code', headers=self.headers)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('image/png', response.headers['content-type'])
+        self.assertIn('immutable', response.headers['cache-control'])
+        self.assertEqual(qr_code.render_png(USER_ID), response.content)
+
+        etag = response.headers['etag']
+        self.assertEqual(qr_code.read_etag(USER_ID), etag)
+
+        # A code the client already has is confirmed without reading the user or rendering it.
+        with core.count_queries() as statements, mock.patch.object(qr_code, 'render_png_async') as render_png_async:
+            response = self.client.get(f'/user/{USER_ID}/qr_code', headers={**self.headers, 'If-None-Match': etag})
+
+        self.assertEqual(0, len(statements))
+        render_png_async.assert_not_called()
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response.headers['etag'])
+        self.assertEqual(b'', response.content)
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(qr_code, '_CACHE_DIR', cache_dir):
+            response = self.client.get(f'/user/{USER_ID}/qr_code?scale=4&border=2', headers=self.headers)
+
+            self.assertEqual(200, response.status_code)
+            self.assertNotEqual(etag, response.headers['etag'])
+            self.assertEqual([response.content], [
+                open(os.path.join(cache_dir, file_name), 'rb').read() for file_name in os.listdir(cache_dir)
+            ])
+
+        response = self.client.get('/user/missing-user/qr_code', headers=self.headers)
+        self.assertEqual(404, response.status_code)
+
+    def test_10_read_qr_code_timeout(self):
+        with mock.patch.object(qr_code, 'RENDER_TIMEOUT_SECONDS', 0):
+            response = self.client.get(f'/user/{USER_ID}/qr_code?scale=7', headers=self.headers)
+
+        self.assertEqual(503, response.status_code)
+        self.assertIn('Retry-After', response.headers)
+
     def test_11_delete_user(self):
         response = self.client.delete(f'/user/{USER_ID}/', headers=self.headers)
 
@@ -232,3 +287,44 @@ class UserTest(unittest.TestCase):
 
         self.assertEqual(404, response.status_code)
         self.assertIsNotNone(response.text)
+
+
+class UserOverviewTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.ids = core.get_default_db_ids()
+        cls.headers = core.get_default_headers()
+
+        core.setup_tests(main.app)
+        core.create_default_test_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        core.teardown_tests()
+
+    def test_user_overview(self):
+        user_id = self.ids['john-smith-user']
+        self.client.get(f'/user/{user_id}', headers=self.headers)
+
+        with core.count_queries() as statements:
+            response = self.client.get(f'/user/{user_id}/overview', headers=self.headers)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, len(statements))
+
+        def read(path: str):
+            return self.client.get(f'/user/{user_id}{path}', headers=self.headers).json()
+
+        def ids(items: list[dict]) -> list[str]:
+            return sorted(item['id'] for item in items)
+
+        overview = response.json()
+        self.assertEqual(read(''), overview['user'])
+        self.assertEqual(read('/pass'), overview['pass'])
+        self.assertEqual(ids(read('/events')), ids(overview['organized_events']))
+        self.assertEqual([], overview['events'])
+        self.assertEqual(ids(read('/teams?host=false')), ids(overview['teams']))
+        self.assertEqual(ids(read('/teams?host=true')), ids(overview['hosted_teams']))
+
+        self.assertEqual(404, self.client.get('/user/missing-user/overview', headers=self.headers).status_code)